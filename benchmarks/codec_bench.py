@@ -0,0 +1,51 @@
+# Encode and decode rates of each installed JSON codec for a listing
+# response and an order submission body.
+#
+#   python benchmarks/codec_bench.py [loans] [orders]
+import sys
+import timeit
+
+from listing_data import make_listing
+from pylend.account import _orders_body
+from pylend.codec import available_codecs, get_codec
+from pylend.loans import LoanOrder
+
+
+def rate(func, seconds=1.0):
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * seconds / elapsed))
+    return number / timer.timeit(number)
+
+
+def main():
+    loan_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    order_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    listing = make_listing(loan_count)
+    orders = [LoanOrder(100000 + i, 25.0) for i in range(order_count)]
+    body = _orders_body(1, orders)
+    body_dict = dict(body)
+
+    print('{0:<8} {1:>16} {2:>16} {3:>16}'.format(
+        'codec',
+        'decode listing/s',
+        'encode listing/s',
+        'encode orders/s'))
+    for name in available_codecs():
+        codec = get_codec(name)
+        text = codec.dumps(listing)
+        if isinstance(text, str):
+            text = text.encode('utf-8')
+        print('{0:<8} {1:16.1f} {2:16.1f} {3:16.1f}'.format(
+            name,
+            rate(lambda: codec.loads(text)),
+            rate(lambda: codec.dumps(listing)),
+            rate(lambda: codec.dumps(body_dict))))
+    print('{0:<8} {1:>16} {2:>16} {3:16.1f}'.format(
+        'to_json', '-', '-',
+        rate(lambda: body.to_json())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Measures per-request latency of Connection against a local stub server,
+# with a pooled keep-alive session and with a new connection per request.
+#
+#   python benchmarks/connection_pool_bench.py [requests]
+import sys
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from pylend import Connection
+
+BODY = b'{"availableCash": 50.77, "investorId": 1788402}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def run(connection, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        connection.get('accounts/1/availablecash')
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies
+
+
+def report(name, latencies):
+    mean = sum(latencies) / len(latencies)
+    print('{0:<12} mean {1:8.1f}us  p50 {2:8.1f}us  p99 {3:8.1f}us'.format(
+        name,
+        mean * 1e6,
+        latencies[len(latencies) // 2] * 1e6,
+        latencies[int(len(latencies) * 0.99)] * 1e6))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_uri = 'http://127.0.0.1:{0}/api/investor/{{0}}/{{1}}'.format(
+        server.server_address[1])
+
+    for name, keep_alive in (('pooled', True), ('unpooled', False)):
+        with Connection('benchmark',
+                        request_delay=timedelta(seconds=0),
+                        keep_alive=keep_alive,
+                        base_uri=base_uri) as connection:
+            report(name, run(connection, count))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Cold import time of pylend, measured with -X importtime in fresh
+# interpreters, and the heavy dependencies each statement loads.
+#
+#   python benchmarks/import_bench.py [runs] [budget_ms]
+#
+# With budget_ms, exits non-zero if the median time of `import pylend`
+# exceeds it.
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+STATEMENTS = \
+    [
+        'import pylend',
+        'from pylend import Connection, Loans',
+        'from pylend import Account, LoanTable, create_orders',
+        'from pylend import AsyncConnection'
+    ]
+
+HEAVY_MODULES = ['arrow', 'requests', 'numpy', 'aiohttp']
+
+
+def import_time(statement):
+    # Returns the cumulative microseconds of the top-level imports the
+    # statement triggers, and the heavy modules it left loaded.
+    script = '{0}; import sys; print(",".join(m for m in {1!r} ' \
+             'if m in sys.modules))'.format(statement, HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             script],
+                            cwd=ROOT,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level entries have no indentation; site runs before the
+        # statement and is not counted.
+        if not name.startswith('  ') and name.strip() != 'site':
+            total += int(cumulative)
+    loaded = result.stdout.strip()
+    return total, loaded.split(',') if loaded else []
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    medians = {}
+    for statement in STATEMENTS:
+        times = []
+        for _ in range(runs):
+            total, loaded = import_time(statement)
+            times.append(total / 1000.0)
+        medians[statement] = statistics.median(times)
+        print('{0:<55} {1:8.1f}ms  loads {2}'
+              .format(statement,
+                      medians[statement],
+                      ', '.join(loaded) or 'nothing heavy'))
+    if budget is not None and medians['import pylend'] > budget:
+        print('import pylend took {0:.1f}ms, over the {1:.1f}ms budget'
+              .format(medians['import pylend'], budget))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Synthetic API payloads shaped like the LendingClub listing and notes
+# responses, shared by the benchmark scripts.
+import copy
+import json
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pylend.tests.loans_test import VALID_RESPONSE_TEXT  # noqa: E402
+
+LOAN_TEMPLATE = json.loads(VALID_RESPONSE_TEXT)['loans'][0]
+
+NOTE_TEMPLATE = {
+    'loanId': 11111,
+    'noteId': 22222,
+    'orderId': 33333,
+    'portfolioId': 44444,
+    'portfolioName': 'Portfolio1',
+    'interestRate': 13.57,
+    'loanLength': 36,
+    'loanStatus': 'Current',
+    'grade': 'C',
+    'loanAmount': 10800,
+    'noteAmount': 25,
+    'paymentsReceived': 5.88,
+    'principalPending': 20.12,
+    'interestPending': 0.0,
+    'principalReceived': 4.88,
+    'interestReceived': 1.0,
+    'issueDate': '2009-11-12T06:34:02.000-08:00',
+    'orderDate': '2009-11-05T09:33:50.000-08:00',
+    'loanStatusDate': '2013-05-20T13:13:53.000-07:00',
+    'nextPaymentDate': '2016-02-01T00:00:00.000-08:00'
+}
+
+GRADES = 'ABCDEFG'
+STATES = ['CA', 'NY', 'TX', 'FL', 'IL', 'WA', 'NJ', 'PA']
+PURPOSES = ['debt_consolidation', 'credit_card', 'home_improvement', 'other']
+STATUSES = ['Current', 'Fully Paid', 'Late (31-120 days)', 'Charged Off']
+
+
+def _timestamp(day, second):
+    return '2016-01-{0:02d}T{1:02d}:{2:02d}:{3:02d}.000-08:00'.format(
+        1 + day % 28, second // 3600 % 24, second // 60 % 60, second % 60)
+
+
+def make_loan(loan_id, rng=random):
+    loan = copy.deepcopy(LOAN_TEMPLATE)
+    grade = rng.choice(GRADES)
+    loan_amount = float(rng.randrange(1000, 35000, 25))
+    loan['id'] = loan_id
+    loan['memberId'] = loan_id + 1000000
+    loan['loanAmount'] = loan_amount
+    loan['fundedAmount'] = float(rng.randrange(0, int(loan_amount), 25))
+    loan['grade'] = grade
+    loan['subGrade'] = grade + str(rng.randint(1, 5))
+    loan['intRate'] = round(rng.uniform(5.0, 28.0), 2)
+    loan['dti'] = round(rng.uniform(0.0, 40.0), 2)
+    loan['ficoRangeLow'] = rng.randrange(660, 850, 5)
+    loan['ficoRangeHigh'] = loan['ficoRangeLow'] + 4
+    loan['term'] = rng.choice([36, 60])
+    loan['addrState'] = rng.choice(STATES)
+    loan['purpose'] = rng.choice(PURPOSES)
+    # Loans released in the same drop share their listing timestamps.
+    drop = loan_id % 4
+    loan['listD'] = _timestamp(drop, 21600 + drop * 14400)
+    loan['ilsExpD'] = _timestamp(drop, 22200 + drop * 14400)
+    loan['expD'] = _timestamp(drop + 14, 21600 + drop * 14400)
+    loan['acceptD'] = _timestamp(drop, rng.randrange(86400))
+    loan['creditPullD'] = _timestamp(drop, rng.randrange(86400))
+    loan['reviewStatusD'] = _timestamp(drop, rng.randrange(86400))
+    loan['earliestCrLine'] = '{0}-{1:02d}-01T00:00:00.000-08:00'.format(
+        rng.randint(1970, 2010), rng.randint(1, 12))
+    return loan
+
+
+def make_listing(count, seed=0):
+    rng = random.Random(seed)
+    return {'asOfDate': '2016-01-04T10:00:01.123-08:00',
+            'loans': [make_loan(100000 + i, rng) for i in range(count)]}
+
+
+def make_note(note_id, rng=random):
+    note = dict(NOTE_TEMPLATE)
+    note['noteId'] = note_id
+    note['loanId'] = note_id + 5000000
+    note['orderId'] = note_id // 10
+    note['portfolioId'] = 44444 + note_id % 5
+    note['grade'] = rng.choice(GRADES)
+    note['loanStatus'] = rng.choice(STATUSES)
+    note['paymentsReceived'] = round(rng.uniform(0, 25), 2)
+    note['loanStatusDate'] = _timestamp(note_id % 28, rng.randrange(86400))
+    note['nextPaymentDate'] = _timestamp(note_id % 28, 0)
+    return note
+
+
+def make_notes(count, seed=0):
+    rng = random.Random(seed)
+    return {'myNotes': [make_note(200000 + i, rng) for i in range(count)]}
+
+
+def make_listing_text(count, seed=0):
+    return json.dumps(make_listing(count, seed))
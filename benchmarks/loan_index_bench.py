@@ -0,0 +1,55 @@
+# Strategy-style queries against a LoanIndex versus scanning the listing,
+# and the cost of keeping the index current as listings change.
+#
+#   python benchmarks/loan_index_bench.py [loans] [queries]
+import random
+import sys
+import time
+
+from listing_data import GRADES, PURPOSES, STATES, make_listing
+from pylend import ListingDiff, LoanIndex
+
+
+def scan(loans, criteria):
+    return [loan for loan in loans
+            if all(loan[field] == value for field, value in criteria)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    loans = make_listing(count)['loans']
+    rng = random.Random(0)
+    workload = [(('subGrade', rng.choice(GRADES) + str(rng.randint(1, 5))),
+                 ('addrState', rng.choice(STATES)),
+                 ('purpose', rng.choice(PURPOSES)))[:rng.randint(1, 3)]
+                for _ in range(queries)]
+
+    start = time.perf_counter()
+    index = LoanIndex(loans)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [len(scan(loans, criteria)) for criteria in workload]
+    scanned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [len(index.find(**dict(criteria))) for criteria in workload]
+    indexed = time.perf_counter() - start
+    assert found == expected
+
+    changed = [dict(loan, fundedAmount=loan['fundedAmount'] + 25)
+               for loan in rng.sample(loans, count // 10)]
+    start = time.perf_counter()
+    index.apply_diff(ListingDiff(None, [], changed, []))
+    update = time.perf_counter() - start
+
+    print('{0} loans: build {1:.1f}ms, diff of {2} changes {3:.1f}ms'
+          .format(count, build * 1000, len(changed), update * 1000))
+    print('{0} queries: scan {1:.1f}ms, index {2:.1f}ms ({3:.0f}x)'
+          .format(queries, scanned * 1000, indexed * 1000,
+                  scanned / indexed))
+
+
+if __name__ == '__main__':
+    main()
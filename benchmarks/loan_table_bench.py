@@ -0,0 +1,50 @@
+# Memory held by a listing as normalized dicts versus as a LoanTable, and
+# the cost of a typical screen over each.
+#
+#   python benchmarks/loan_table_bench.py [loans]
+import json
+import sys
+import time
+import tracemalloc
+
+from listing_data import make_listing_text
+from pylend import LoanTable
+from pylend.loans import _normalize_loan_format
+
+
+def retained(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    text = make_listing_text(count)
+
+    loans, dict_bytes = retained(
+        lambda: _normalize_loan_format(json.loads(text), 'epoch')['loans'])
+    table, table_bytes = retained(
+        lambda: LoanTable.from_payload(json.loads(text)))
+    print('dicts      {0:8.1f}MB'.format(dict_bytes / 1e6))
+    print('LoanTable  {0:8.1f}MB ({1:.1f}x smaller)'.format(
+        table_bytes / 1e6, float(dict_bytes) / table_bytes))
+
+    start = time.perf_counter()
+    matches = [loan for loan in loans
+               if loan['intRate'] > 15 and loan['dti'] < 20]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    selected = table[(table['intRate'] > 15) & (table['dti'] < 20)]
+    table_time = time.perf_counter() - start
+    assert len(matches) == len(selected)
+
+    print('screen dicts      {0:8.3f}ms'.format(loop_time * 1000))
+    print('screen LoanTable  {0:8.3f}ms'.format(table_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# Normalization cost per listing in each datetime mode. The shared datetime
+# parse cache starts empty for every run.
+#
+#   python benchmarks/normalization_bench.py [loans]
+import json
+import sys
+import time
+
+from listing_data import make_listing_text
+from pylend.datetimes import datetime_cache
+from pylend.loans import _normalize_loan_format
+
+
+def measure(text, datetime_mode, touch=None, repeat=3):
+    best = None
+    for _ in range(repeat):
+        payload = json.loads(text)
+        datetime_cache().clear()
+        start = time.perf_counter()
+        result = _normalize_loan_format(payload, datetime_mode)
+        if touch is not None:
+            for loan in result['loans']:
+                loan[touch]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    text = make_listing_text(count)
+
+    for name, datetime_mode, touch in (
+            ('arrow', 'arrow', None),
+            ('epoch', 'epoch', None),
+            ('lazy', 'lazy', None),
+            ('lazy+listD', 'lazy', 'listD')):
+        elapsed = measure(text, datetime_mode, touch)
+        cache = datetime_cache()
+        print('{0:<12} {1:8.1f}ms per {2} loans  cache {3} hits, {4} misses'
+              .format(name, elapsed * 1000, count, cache.hits, cache.misses))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Compiled record normalizers against the generic per-field loop calling
+# arrow.get, on a listing and a notes payload. The datetime parse cache
+# starts empty for every run.
+#
+#   python benchmarks/normalizer_bench.py [loans] [notes]
+import json
+import sys
+import time
+
+import arrow
+
+from listing_data import make_listing, make_notes
+from pylend.account import NOTE_DATETIME_FIELDS, _NOTE_NORMALIZER
+from pylend.datetimes import datetime_cache
+from pylend.loans import LOAN_DATETIME_FIELDS, _LOAN_NORMALIZER
+
+
+def generic(records, fields, datetime_mode):
+    for record in records:
+        for field in fields:
+            if field not in record:
+                continue
+            value = record[field]
+            if value is None:
+                continue
+            value = arrow.get(value)
+            record[field] = int(value.datetime.timestamp()) \
+                if datetime_mode == 'epoch' else value
+    return records
+
+
+def compiled(normalizer):
+    def normalize(records, fields, datetime_mode):
+        return normalizer.normalize_many(records, datetime_mode)
+    return normalize
+
+
+def measure(text, key, fields, normalize, datetime_mode, repeat=3):
+    best = None
+    for _ in range(repeat):
+        records = json.loads(text)[key]
+        datetime_cache().clear()
+        start = time.perf_counter()
+        normalize(records, fields, datetime_mode)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    loans = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    notes = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+
+    for name, text, key, fields, normalizer, count in (
+            ('loans', json.dumps(make_listing(loans)), 'loans',
+             LOAN_DATETIME_FIELDS, _LOAN_NORMALIZER, loans),
+            ('notes', json.dumps(make_notes(notes)), 'myNotes',
+             NOTE_DATETIME_FIELDS, _NOTE_NORMALIZER, notes)):
+        for datetime_mode in ('arrow', 'epoch'):
+            before = measure(text, key, fields, generic, datetime_mode, 1)
+            after = measure(text, key, fields, compiled(normalizer),
+                            datetime_mode)
+            print('{0:>6} {1:<6} {2:<6} generic {3:8.1f}ms  compiled '
+                  '{4:7.1f}ms  {5:5.1f}x'
+                  .format(count, name, datetime_mode, before * 1000,
+                          after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# End-to-end throughput of listing polls, order building and submission, and
+# notes sync against replayed API responses; no network access is needed.
+#
+#   python benchmarks/offline_bench.py [sizes] [latency_ms] [recordings]
+#
+# sizes is a comma-separated list of loan counts (default 100,10000,100000).
+# latency_ms adds a lognormal response latency with that median (default 0).
+# recordings replays a file written by RecordingTransport instead of the
+# synthetic responses; sizes then only label the runs.
+import json
+import random
+import sys
+import time
+
+from listing_data import make_listing, make_notes
+from pylend import Account, Connection, Loans, NullRateLimiter
+from pylend.note_store import NoteStore, NoteSync
+from pylend.orders import create_orders
+from pylend.poller import ListingPoller
+from pylend.transport import ReplayTransport, lognormal_latency
+
+BASE_URI = 'https://api.lendingclub.com/api/investor/v1/'
+ACCOUNT_ID = 1
+POLLS = 5
+LISTING_PARAMS = {'showAll': 'True'}
+
+
+def _exchange(method, resource, payload, params=None):
+    return {'method': method,
+            'uri': BASE_URI + resource,
+            'params': params or {},
+            'status': 200,
+            'headers': {'Content-Type': 'application/json'},
+            'elapsed': 0.0,
+            'body': json.dumps(payload)}
+
+
+def _changed_listing(listing, seed):
+    # Each poll after the first sees some loans funded further and some
+    # loans replaced, as between two real polls.
+    rng = random.Random(seed)
+    changed = json.loads(json.dumps(listing))
+    for loan in changed['loans']:
+        if rng.random() < 0.1:
+            loan['fundedAmount'] = min(loan['loanAmount'],
+                                       loan['fundedAmount'] + 25)
+    for index in rng.sample(range(len(changed['loans'])),
+                            len(changed['loans']) // 20):
+        changed['loans'][index]['id'] += 10000000
+    return changed
+
+
+def synthetic_recordings(count):
+    listing = make_listing(count)
+    recordings = [_exchange('GET', 'loans/listing', listing, LISTING_PARAMS)]
+    for poll in range(1, POLLS):
+        recordings.append(_exchange('GET',
+                                    'loans/listing',
+                                    _changed_listing(listing, poll),
+                                    LISTING_PARAMS))
+    recordings.append(
+        _exchange('POST',
+                  'accounts/{0}/orders'.format(ACCOUNT_ID),
+                  {'orderInstructId': 1, 'orderConfirmations': []}))
+    recordings.append(
+        _exchange('GET',
+                  'accounts/{0}/detailednotes'.format(ACCOUNT_ID),
+                  make_notes(count)))
+    return recordings
+
+
+def measure(name, items, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print('  {0:<12} {1:8d} items {2:10.1f}ms {3:12.0f} items/s'
+          .format(name, items, elapsed * 1000, items / elapsed))
+
+
+def run(count, recordings, latency):
+    transport = ReplayTransport(
+        recordings,
+        latency=None if latency == 0 else lognormal_latency(latency / 1000.0))
+    connection = Connection('offline',
+                            rate_limiter=NullRateLimiter(),
+                            transport=transport)
+    loans = Loans(connection, datetime_mode='epoch')
+    account = Account(connection, ACCOUNT_ID, datetime_mode='epoch')
+    print('{0} loans'.format(count))
+
+    poller = ListingPoller(loans, get_all_loans=True)
+
+    def poll():
+        for _ in range(POLLS):
+            poller.poll()
+
+    def build_and_submit():
+        listed = loans.listed_loan_table(get_all_loans=True)
+        orders = create_orders(listed, 25, budget=25 * count)
+        report = account.submit_orders_in_chunks(orders)
+        if not report.succeeded:
+            raise RuntimeError('Order submission failed: {0}'.format(report))
+
+    sync = NoteSync(account, NoteStore(datetime_mode='epoch'))
+
+    def sync_notes():
+        # The first sync inserts every note, the second finds no changes.
+        sync.sync()
+        sync.sync()
+
+    measure('poll', count * POLLS, poll)
+    measure('orders', count, build_and_submit)
+    measure('notes sync', count * 2, sync_notes)
+    connection.close()
+
+
+def main():
+    sizes = [int(size) for size in
+             (sys.argv[1] if len(sys.argv) > 1 else '100,10000,100000')
+             .split(',')]
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    recordings = sys.argv[3] if len(sys.argv) > 3 else None
+    for count in sizes:
+        run(count, recordings or synthetic_recordings(count), latency)
+
+
+if __name__ == '__main__':
+    main()
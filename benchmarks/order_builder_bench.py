@@ -0,0 +1,41 @@
+# Time to allocate and build orders for a listing, one create_order call
+# per loan versus the batch allocator.
+#
+#   python benchmarks/order_builder_bench.py [loans]
+import json
+import sys
+import time
+
+from listing_data import make_listing_text
+from pylend import LoanTable, allocate_amounts, create_orders
+from pylend.loans import create_order
+
+
+def timed(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    loans = json.loads(make_listing_text(count))['loans']
+    table = LoanTable.from_loans(loans)
+
+    for name, func in (
+            ('create_order loop', lambda: [create_order(loan, 25)
+                                           for loan in loans]),
+            ('allocate_amounts', lambda: allocate_amounts(table, 25,
+                                                          budget=10000)),
+            ('create_orders', lambda: create_orders(table, 25,
+                                                    budget=10000))):
+        print('{0:<18} {1:10.1f}us for {2} loans'.format(
+            name, timed(func) * 1e6, count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Memory and serialization throughput of slotted orders and typed records
+# against the dict-based forms. Records take about half the memory of dicts
+# but serialize field by field in Python, so json.dumps of a dict (which runs
+# in C) is roughly twice as fast as NoteRecord.to_json.
+#
+#   python benchmarks/records_bench.py [count]
+import json
+import sys
+import time
+import tracemalloc
+
+from listing_data import make_notes
+from pylend import NoteRecord
+from pylend.account import _orders_body
+from pylend.loans import LoanOrder
+
+
+class DictLoanOrder:
+    def __init__(self, loan_id, amount, portfolio_id=None):
+        self.loan_id = loan_id
+        self.amount = amount
+        self.portfolio_id = portfolio_id
+
+    def get_dict(self):
+        result = {'loanId': self.loan_id, 'requestedAmount': self.amount}
+        if self.portfolio_id is not None:
+            result['portfolioId'] = self.portfolio_id
+        return result
+
+
+def retained(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def report(name, size, elapsed, count):
+    print('{0:<24} {1:8.1f}MB  {2:10.0f}/s'.format(
+        name, size / 1e6, count / elapsed))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print('{0} orders: retained memory, serialization rate'.format(count))
+    old_orders, old_size = retained(
+        lambda: [DictLoanOrder(i, 25.0) for i in range(count)])
+    new_orders, new_size = retained(
+        lambda: [LoanOrder(i, 25.0) for i in range(count)])
+    report('dict LoanOrder', old_size, timed(lambda: json.dumps(
+        {'aid': 1, 'orders': [o.get_dict() for o in old_orders]})), count)
+    report('slotted LoanOrder', new_size,
+           timed(lambda: _orders_body(1, new_orders).to_json()), count)
+
+    print('{0} notes: retained memory, serialization rate'.format(count))
+    raw_notes = make_notes(count)['myNotes']
+    dicts, dict_size = retained(lambda: [dict(note) for note in raw_notes])
+    records, record_size = retained(
+        lambda: [NoteRecord.from_dict(note) for note in raw_notes])
+    report('dict notes', dict_size,
+           timed(lambda: [json.dumps(note) for note in dicts]), count)
+    report('NoteRecord', record_size,
+           timed(lambda: [record.to_json() for record in records]), count)
+
+
+if __name__ == '__main__':
+    main()
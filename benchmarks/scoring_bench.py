@@ -0,0 +1,56 @@
+# Scoring throughput of a CPU-bound model as the process pool grows, with
+# the time from a normalized listing to the first orders.
+#
+#   python benchmarks/scoring_bench.py [loans] [max_processes]
+import math
+import os
+import sys
+import time
+
+from listing_data import make_listing
+from pylend import LoanScorer, LoanTable
+from pylend.loans import _normalize_loan_format
+
+FEATURES = ['intRate', 'dti', 'ficoRangeLow', 'loanAmount', 'fundedAmount']
+ROUNDS = 200
+
+
+def score(table):
+    # A stand-in for a model evaluated loan by loan in Python.
+    columns = [table[field].tolist() for field in FEATURES]
+    scores = []
+    for features in zip(*columns):
+        value = 0.0
+        for round_ in range(ROUNDS):
+            for weight, feature in enumerate(features, round_ % 3 + 1):
+                value += math.sin(weight * feature) / weight
+        scores.append(value)
+    return scores
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    max_processes = int(sys.argv[2]) if len(sys.argv) > 2 \
+        else os.cpu_count() or 1
+    table = LoanTable.from_payload(
+        _normalize_loan_format(make_listing(count), 'epoch'))
+
+    baseline = None
+    processes = 1
+    while processes <= max_processes:
+        with LoanScorer(score, processes=processes) as scorer:
+            scorer.prewarm()
+            start = time.perf_counter()
+            scored = scorer.score(table)
+            orders = scored.create_orders(25, budget=2500)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print('{0:3d} processes {1:9.1f}ms {2:10.0f} loans/s  speedup '
+              '{3:4.2f}x  {4} orders'
+              .format(processes, elapsed * 1000, count / elapsed,
+                      baseline / elapsed, len(orders)))
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main()
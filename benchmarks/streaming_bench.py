@@ -0,0 +1,61 @@
+# Peak memory and time to the first loan when a large listing is parsed
+# whole versus streamed in 64KB chunks.
+#
+#   python benchmarks/streaming_bench.py [count]
+import json
+import sys
+import time
+import tracemalloc
+
+from listing_data import make_listing_text
+from pylend.connection import DEFAULT_STREAM_CHUNK_SIZE
+from pylend.loans import _normalize_loan, _normalize_loan_format
+from pylend.streaming import iter_json_array
+
+
+def chunked(body):
+    for start in range(0, len(body), DEFAULT_STREAM_CHUNK_SIZE):
+        yield body[start:start + DEFAULT_STREAM_CHUNK_SIZE]
+
+
+def buffered(body):
+    payload = _normalize_loan_format(json.loads(body.decode('utf-8')),
+                                     'epoch')
+    for loan in payload['loans']:
+        yield loan
+
+
+def streamed(body):
+    for loan in iter_json_array(chunked(body), 'loans'):
+        yield _normalize_loan(loan, 'epoch')
+
+
+def measure(name, parse, body):
+    start = time.perf_counter()
+    loans = parse(body)
+    next(loans)
+    first = time.perf_counter() - start
+    count = 1 + sum(1 for _ in loans)
+    total = time.perf_counter() - start
+
+    # Memory is traced in a separate pass; tracing slows parsing down.
+    tracemalloc.start()
+    for _ in parse(body):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('{0:<10} {1:6d} loans  first {2:8.2f}ms  total {3:8.1f}ms  '
+          'peak {4:6.1f}MB'.format(name, count, first * 1000, total * 1000,
+                                   peak / 1e6))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    body = make_listing_text(count).encode('utf-8')
+    print('{0} loans, {1:.1f}MB body'.format(count, len(body) / 1e6))
+    measure('buffered', buffered, body)
+    measure('streamed', streamed, body)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,90 @@
-import arrow
-from .connection import Connection
+import importlib
 from .exceptions import (AuthorizationException,
                          ResourceNotFoundException,
                          ExecutionFailureException,
+                         RequestRejectedException,
                          UnexpectedStatusCodeException)
-from .loans import Loans
-from .account import Account
+from .datetimes import (DATETIME_ARROW,
+                        DATETIME_LAZY,
+                        DATETIME_EPOCH,
+                        DatetimeCache,
+                        convert_datetime,
+                        datetime_cache)
 
+# Everything else is imported from its submodule on first access, so that
+# `import pylend` does not load requests, arrow, numpy or aiohttp until the
+# names that need them are used.
+_LAZY_EXPORTS = \
+    {
+        'Connection': 'connection',
+        'SessionTransport': 'transport',
+        'RecordingTransport': 'transport',
+        'ReplayTransport': 'transport',
+        'RateLimiter': 'rate_limiter',
+        'NullRateLimiter': 'rate_limiter',
+        'TokenBucketRateLimiter': 'rate_limiter',
+        'shared_rate_limiter': 'rate_limiter',
+        'RetryPolicy': 'retry',
+        'HedgePolicy': 'retry',
+        'DEFAULT_RETRY_POLICIES': 'retry',
+        'set_payload_logging': 'payload_log',
+        'MetricsRegistry': 'metrics',
+        'LazyRecord': 'records',
+        'LoanRecord': 'records',
+        'NoteRecord': 'records',
+        'TransferRecord': 'records',
+        'Loans': 'loans',
+        'ResponseCache': 'cache',
+        'Account': 'account',
+        'OrderSubmissionReport': 'submission',
+        'LoanTable': 'table',
+        'Field': 'filters',
+        'evaluate_many': 'filters',
+        'filter_many': 'filters',
+        'allocate_amounts': 'orders',
+        'create_orders': 'orders',
+        'LoanScorer': 'scoring',
+        'ScoredLoans': 'scoring',
+        'ListingPoller': 'poller',
+        'ListingDiff': 'poller',
+        'LoanIndex': 'index',
+        'ListingPublisher': 'listing_feed',
+        'ListingReader': 'listing_feed',
+        'ListingSnapshot': 'listing_feed',
+        'NoteStore': 'note_store',
+        'NoteSync': 'note_store',
+        'SyncResult': 'note_store',
+        'MultiAccount': 'multi_account',
+        'FanOutResult': 'multi_account',
+        'AsyncConnection': 'async_connection',
+        'AsyncLoans': 'async_loans',
+        'AsyncAccount': 'async_account'
+    }
 
-def _convert_datetimes(convertable_object, convertable_fields):
-    for field in convertable_fields:
-        if field not in convertable_object:
-            continue
+__all__ = ['AuthorizationException',
+           'ResourceNotFoundException',
+           'ExecutionFailureException',
+           'RequestRejectedException',
+           'UnexpectedStatusCodeException',
+           'DATETIME_ARROW',
+           'DATETIME_LAZY',
+           'DATETIME_EPOCH',
+           'DatetimeCache',
+           'convert_datetime',
+           'datetime_cache'] + list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError("module 'pylend' has no attribute '{0}'"
+                             .format(name))
+    value = getattr(importlib.import_module('.' + module_name, __name__),
+                    name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_LAZY_EXPORTS))
 
-        convertable_object[field] = arrow.get(
-            convertable_object[field]
-            ) if convertable_object[field] is not None else None
-    return convertable_object
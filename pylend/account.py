@@ -1,6 +1,19 @@
 import logging
 import pylend
-from .exceptions import ExecutionFailureException
+from collections.abc import Mapping
+from .datetimes import (DATETIME_ARROW,
+                        _check_datetime_mode,
+                        _record_datetime_mode)
+from .cache import WRITE_INVALIDATIONS
+from .exceptions import RequestRejectedException
+from .loans import _json_number
+from .metrics import PHASE_NORMALIZE, timed
+from .normalizers import RecordNormalizer
+from .payload_log import log_payload
+from .streaming import iter_json_array
+from .submission import (DEFAULT_CHUNK_SIZE,
+                         DEFAULT_MAX_WORKERS,
+                         submit_in_chunks)
 
 TRANSFER_DATETIME_FIELDS = \
     [
@@ -26,34 +39,127 @@ TRANSFER_FREQUENCY_MAPPING = \
     }
 
 
-def _normalize_transfer(transfer):
-    transfer = pylend._convert_datetimes(
-        transfer,
-        TRANSFER_DATETIME_FIELDS)
-    transfer['frequency'] = TRANSFER_FREQUENCY_MAPPING[
-        transfer['frequency']]
-    return transfer
+_TRANSFER_NORMALIZER = RecordNormalizer(
+    TRANSFER_DATETIME_FIELDS,
+    {'frequency': TRANSFER_FREQUENCY_MAPPING})
 
+_NOTE_NORMALIZER = RecordNormalizer(NOTE_DATETIME_FIELDS)
 
-def _normalize_notes(note):
-    return pylend._convert_datetimes(
-        note,
-        NOTE_DATETIME_FIELDS)
 
+def _normalize_transfer(transfer, datetime_mode=DATETIME_ARROW):
+    return _TRANSFER_NORMALIZER(transfer, datetime_mode)
 
-def _normalize_received_json(json_payload, dictionary_key, normalizer):
-    json_payload[dictionary_key] = [
-        normalizer(transfer) for transfer in json_payload[dictionary_key]]
+
+def _normalize_notes(note, datetime_mode=DATETIME_ARROW):
+    return _NOTE_NORMALIZER(note, datetime_mode)
+
+
+def _normalize_received_json(json_payload,
+                             dictionary_key,
+                             normalizer,
+                             datetime_mode=DATETIME_ARROW):
+    json_payload[dictionary_key] = normalizer.normalize_many(
+        json_payload[dictionary_key],
+        datetime_mode)
     return json_payload
 
 
+def _transfers_from(json_payload, datetime_mode=DATETIME_ARROW):
+    return _normalize_received_json(
+        json_payload,
+        'transfers',
+        _TRANSFER_NORMALIZER,
+        datetime_mode)['transfers'] \
+        if 'transfers' in json_payload else []
+
+
+def _notes_resource(detailed_info):
+    return 'detailednotes' if detailed_info else 'notes'
+
+
+def _notes_from(json_payload, datetime_mode=DATETIME_ARROW):
+    return _normalize_received_json(
+        json_payload,
+        'myNotes',
+        _NOTE_NORMALIZER,
+        datetime_mode)['myNotes'] if 'myNotes' in json_payload else []
+
+
+def _portfolios_from(json_payload):
+    return json_payload['myPortfolios'] \
+        if 'myPortfolios' in json_payload else []
+
+
+def _portfolio_body(account_id, name, description):
+    if name is None or name == '':
+        raise ValueError('name must be a non-None, non-empty string')
+    body = {'aid': account_id, 'portfolioName': name}
+    if description is not None:
+        body['portfolioDescription'] = description
+    return body
+
+
+class _OrdersBody(Mapping):
+    # Reads like the {'aid': ..., 'orders': [...]} dict, but Connection sends
+    # to_json, which writes each LoanOrder straight to the wire form. The
+    # per-order dicts are only built if something reads 'orders'.
+    __slots__ = ('_account_id', '_orders')
+    _KEYS = ('aid', 'orders')
+
+    def __init__(self, account_id, orders):
+        self._account_id = account_id
+        self._orders = list(orders)
+
+    def __getitem__(self, key):
+        if key == 'aid':
+            return self._account_id
+        if key == 'orders':
+            return [order.get_dict() for order in self._orders]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def to_json(self):
+        return '{"aid":%s,"orders":[%s]}' % (
+            _json_number(self._account_id),
+            ','.join([order.to_json() for order in self._orders]))
+
+
+def _orders_body(account_id, orders):
+    if orders is None or len(orders) == 0:
+        raise ValueError(
+            'orders must be non-None and contain at least one LoanOrder')
+    return _OrdersBody(account_id, orders)
+
+
+def _check_for_errors(json_payload, logger):
+    if 'errors' in json_payload:
+        logger.error('Account resource request has errors: {0}'
+                     .format(json_payload['errors']))
+        raise RequestRejectedException(json_payload['errors'])
+
+
 class Account:
     __connection = None
     __account_id = None
+    __datetime_mode = None
+    __cache = None
+    __metrics = None
     __logger = None
     __ACCOUNT_API_ROOT = 'accounts/{0}/{1}'
 
-    def __init__(self, connection, account_id):
+    def __init__(self,
+                 connection,
+                 account_id,
+                 datetime_mode=DATETIME_ARROW,
+                 cache=None):
         if connection is None:
             raise ValueError('connection must be a non-None Connection object')
         if account_id is None:
@@ -62,66 +168,93 @@ class Account:
 
         self.__connection = connection
         self.__account_id = account_id
+        self.__datetime_mode = _check_datetime_mode(datetime_mode)
+        self.__cache = cache
+        self.__metrics = getattr(connection, 'metrics', None)
         self.__logger = logging.getLogger('pylend')
 
+    @property
+    def datetime_mode(self):
+        return self.__datetime_mode
+
+    @property
+    def cache(self):
+        return self.__cache
+
     def account_summary(self):
-        return self._account_resource_get('summary')
+        return self._cached_get('summary', lambda payload: payload)
 
     def available_cash(self):
-        return self._account_resource_get('availablecash')
+        return self._cached_get('availablecash', lambda payload: payload)
 
     def pending_transfers(self):
-        json_payload = self._account_resource_get('funds/pending')
-        return _normalize_received_json(
-            json_payload,
-            'transfers',
-            _normalize_transfer)['transfers'] \
-            if 'transfers' in json_payload else []
-
-    def owned_notes(self, detailed_info=False):
-        resource = 'notes'
-        if detailed_info:
-            resource = 'detailednotes'
-
-        json_payload = self._account_resource_get(resource)
-        return _normalize_received_json(
-            json_payload,
-            'myNotes',
-            _normalize_notes)['myNotes'] if 'myNotes' in json_payload else []
+        return self._cached_get(
+            'funds/pending',
+            lambda payload: _transfers_from(payload, self.__datetime_mode))
+
+    def owned_notes(self, detailed_info=False, stream=False):
+        if stream:
+            return self._stream_owned_notes(detailed_info)
+        return self._cached_get(
+            _notes_resource(detailed_info),
+            lambda payload: _notes_from(payload, self.__datetime_mode))
+
+    def pending_transfer_records(self):
+        def convert(payload):
+            transfers = _transfers_from(
+                payload,
+                _record_datetime_mode(self.__datetime_mode))
+            return [pylend.TransferRecord.from_dict(transfer)
+                    for transfer in transfers]
+
+        return self._cached_get('funds/pending', convert, 'records')
+
+    def owned_note_records(self, detailed_info=False):
+        def convert(payload):
+            notes = _notes_from(payload,
+                                _record_datetime_mode(self.__datetime_mode))
+            return [pylend.NoteRecord.from_dict(note) for note in notes]
+
+        return self._cached_get(_notes_resource(detailed_info),
+                                convert,
+                                'records')
+
+    def owned_notes_payload(self, detailed_info=False):
+        # The notes exactly as the API returned them: neither normalized nor
+        # cached, for consumers such as NoteSync that diff raw payloads.
+        return self._account_resource_get(_notes_resource(detailed_info))
 
     def portfolios(self):
-        json_payload = self._account_resource_get('portfolios')
-        return json_payload['myPortfolios'] \
-            if 'myPortfolios' in json_payload else []
+        return self._cached_get('portfolios', _portfolios_from)
 
     def create_portfolio(self, name, description=None):
-        if name is None or name == '':
-            raise ValueError('name must be a non-None, non-empty string')
-        body = {'aid': self.__account_id, 'portfolioName': name}
-        if description is not None:
-            body['portfolioDescription'] = description
+        body = _portfolio_body(self.__account_id, name, description)
         response = self._account_resource_post('portfolios', body)
         return response
 
     def submit_orders(self, orders):
-        if orders is None or len(orders) == 0:
-            raise ValueError(
-                'orders must be non-None and contain at least one LoanOrder')
+        body = _orders_body(self.__account_id, orders)
         self.__logger.info('Investing in {0} notes'.format(len(orders)))
-        body = {'aid': self.__account_id}
-        body['orders'] = [order.get_dict() for order in orders]
         return self._account_resource_post('orders', body)
 
+    def submit_orders_in_chunks(self,
+                                orders,
+                                chunk_size=DEFAULT_CHUNK_SIZE,
+                                max_workers=DEFAULT_MAX_WORKERS,
+                                retries=1):
+        return submit_in_chunks(self.submit_orders,
+                                orders,
+                                chunk_size,
+                                max_workers,
+                                retries)
+
     def _check_for_errors(self, json_payload):
-        if 'errors' in json_payload:
-            self.__logger.error('Account resource request has errors: {0}'
-                                .format(json_payload['errors']))
-            raise ExecutionFailureException(json_payload['errors'])
+        _check_for_errors(json_payload, self.__logger)
 
     def _account_resource_request(self, resource, request_func, body=None):
         api_path = self.__ACCOUNT_API_ROOT.format(self.__account_id, resource)
         json_payload = request_func(api_path, body)
-        self.__logger.debug('Response: {0}'.format(json_payload))
+        log_payload(self.__logger, 'Response', json_payload, api_path)
         self._check_for_errors(json_payload)
         return json_payload
 
@@ -135,4 +268,45 @@ class Account:
         def request_func(path, body):
             return self.__connection.post(path, body)
 
-        return self._account_resource_request(resource, request_func, body)
+        try:
+            return self._account_resource_request(resource,
+                                                  request_func,
+                                                  body)
+        finally:
+            # Even a failed write may have partially applied server-side.
+            if self.__cache is not None and resource in WRITE_INVALIDATIONS:
+                self.__cache.invalidate(self.__account_id,
+                                        WRITE_INVALIDATIONS[resource])
+
+    def _stream_owned_notes(self, detailed_info):
+        # Streamed notes bypass the cache; each one is normalized as soon as
+        # it has been read.
+        api_path = self.__ACCOUNT_API_ROOT.format(
+            self.__account_id,
+            _notes_resource(detailed_info))
+        chunks = self.__connection.get_stream(api_path)
+        normalize = _NOTE_NORMALIZER.compile(self.__datetime_mode)
+        fields = {}
+        for note in iter_json_array(chunks, 'myNotes', fields):
+            yield normalize(note)
+        self._check_for_errors(fields)
+
+    def _cached_get(self, resource, convert, variant=None):
+        # Converted results are cached (rather than raw payloads) because
+        # normalization rewrites payloads in place. Cached values are shared
+        # between callers and must be treated as read-only.
+        def load():
+            json_payload = self._account_resource_get(resource)
+            return timed(self.__metrics,
+                         self.__ACCOUNT_API_ROOT.format(self.__account_id,
+                                                        resource),
+                         PHASE_NORMALIZE,
+                         convert,
+                         json_payload)
+
+        if self.__cache is None:
+            return load()
+        return self.__cache.get_or_load(
+            (self.__account_id, resource, variant),
+            resource,
+            load)
@@ -0,0 +1,83 @@
+import logging
+from .datetimes import DATETIME_ARROW, _check_datetime_mode
+from .account import (_check_for_errors,
+                      _notes_from,
+                      _notes_resource,
+                      _orders_body,
+                      _portfolio_body,
+                      _portfolios_from,
+                      _transfers_from)
+from .payload_log import log_payload
+
+
+class AsyncAccount:
+    __connection = None
+    __account_id = None
+    __datetime_mode = None
+    __logger = None
+    __ACCOUNT_API_ROOT = 'accounts/{0}/{1}'
+
+    def __init__(self, connection, account_id, datetime_mode=DATETIME_ARROW):
+        if connection is None:
+            raise ValueError(
+                'connection must be a non-None AsyncConnection object')
+        if account_id is None:
+            raise ValueError(
+                'account_id must be a non-None integer account ID')
+
+        self.__connection = connection
+        self.__account_id = account_id
+        self.__datetime_mode = _check_datetime_mode(datetime_mode)
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def datetime_mode(self):
+        return self.__datetime_mode
+
+    async def account_summary(self):
+        return await self._account_resource_get('summary')
+
+    async def available_cash(self):
+        return await self._account_resource_get('availablecash')
+
+    async def pending_transfers(self):
+        return _transfers_from(
+            await self._account_resource_get('funds/pending'),
+            self.__datetime_mode)
+
+    async def owned_notes(self, detailed_info=False):
+        return _notes_from(
+            await self._account_resource_get(_notes_resource(detailed_info)),
+            self.__datetime_mode)
+
+    async def portfolios(self):
+        return _portfolios_from(await self._account_resource_get('portfolios'))
+
+    async def create_portfolio(self, name, description=None):
+        body = _portfolio_body(self.__account_id, name, description)
+        return await self._account_resource_post('portfolios', body)
+
+    async def submit_orders(self, orders):
+        body = _orders_body(self.__account_id, orders)
+        self.__logger.info('Investing in {0} notes'.format(len(orders)))
+        return await self._account_resource_post('orders', body)
+
+    def _check_response(self, api_path, json_payload):
+        log_payload(self.__logger, 'Response', json_payload, api_path)
+        _check_for_errors(json_payload, self.__logger)
+        return json_payload
+
+    def _api_path(self, resource):
+        return self.__ACCOUNT_API_ROOT.format(self.__account_id, resource)
+
+    async def _account_resource_get(self, resource):
+        api_path = self._api_path(resource)
+        return self._check_response(
+            api_path,
+            await self.__connection.get(api_path))
+
+    async def _account_resource_post(self, resource, body):
+        api_path = self._api_path(resource)
+        return self._check_response(
+            api_path,
+            await self.__connection.post(api_path, body))
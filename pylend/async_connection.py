@@ -0,0 +1,167 @@
+import logging
+import time
+from datetime import timedelta
+from .codec import get_codec
+from .connection import (DEFAULT_POOL_SIZE,
+                         _check_status,
+                         _decode,
+                         _encode_body,
+                         _record_exchange)
+from .payload_log import log_payload
+from .rate_limiter import rate_limiter_for_delay
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _encode_query_params(query_params):
+    # aiohttp refuses non-string query values; mirror what requests sends.
+    if query_params is None:
+        return None
+    return dict((key, str(value)) for key, value in query_params.items())
+
+
+class AsyncConnection:
+    __api_key = None
+    __base_uri = None
+    __logger = None
+    __rate_limiter = None
+    __pool_size = None
+    __keep_alive = None
+    __session = None
+    __codec = None
+    __metrics = None
+    __JSON_CONTENT_TYPE = 'application/json'
+    __PYLEND_USER_AGENT = 'pylend v0.1.0'
+    __LENDINGCLUB_BASE_URI = 'https://api.lendingclub.com/api/investor/{0}/{1}'
+
+    def __init__(self,
+                 api_key,
+                 request_delay=timedelta(seconds=1.0),
+                 pool_size=DEFAULT_POOL_SIZE,
+                 keep_alive=True,
+                 base_uri=None,
+                 rate_limiter=None,
+                 codec=None,
+                 metrics=None):
+        if api_key is None:
+            raise ValueError('api_key must be provided and not None.')
+        if pool_size is None or pool_size < 1:
+            raise ValueError('pool_size must be a positive integer')
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncConnection requires aiohttp; '
+                'install it with "pip install pylend[async]"')
+        self.__api_key = api_key
+        self.__codec = get_codec(codec)
+        self.__metrics = metrics
+        self.__base_uri = base_uri or self.__LENDINGCLUB_BASE_URI
+        self.__rate_limiter = rate_limiter or \
+            rate_limiter_for_delay(request_delay)
+        self.__pool_size = pool_size
+        self.__keep_alive = keep_alive
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def rate_limiter(self):
+        return self.__rate_limiter
+
+    @property
+    def codec(self):
+        return self.__codec
+
+    @property
+    def metrics(self):
+        return self.__metrics
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def get(self, resource, api_version='v1', query_params=None):
+        self.__logger.info('Issuing GET request')
+        return await self._request('GET', resource, api_version, query_params)
+
+    async def post(self, resource, body, api_version='v1', query_params=None):
+        self.__logger.info('Issuing POST request')
+        return await self._request(
+            'POST',
+            resource,
+            api_version,
+            query_params,
+            body)
+
+    def _headers(self):
+        headers = {
+            'Accept': self.__JSON_CONTENT_TYPE,
+            'Authorization': self.__api_key,
+            'User-Agent': self.__PYLEND_USER_AGENT
+        }
+        if not self.__keep_alive:
+            headers['Connection'] = 'close'
+        return headers
+
+    def _get_session(self):
+        if self.__session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.__pool_size,
+                force_close=not self.__keep_alive)
+            self.__session = aiohttp.ClientSession(connector=connector)
+        return self.__session
+
+    async def _request(self,
+                       method,
+                       resource,
+                       api_version,
+                       query_params,
+                       data=None):
+        headers = self._headers()
+        body = None
+        if data is not None:
+            headers['Content-type'] = self.__JSON_CONTENT_TYPE
+            body = _encode_body(data, self.__codec)
+
+        request_uri = self.__base_uri.format(api_version, resource)
+        start = time.perf_counter()
+        await self._delay_if_necessary()
+        sent = time.perf_counter()
+
+        session = self._get_session()
+        async with session.request(method,
+                                   request_uri,
+                                   headers=headers,
+                                   params=_encode_query_params(query_params),
+                                   data=body) as response:
+            headers_received = time.perf_counter()
+            text = await response.text()
+        if self.__metrics is not None:
+            _record_exchange(self.__metrics,
+                             resource,
+                             body,
+                             response.status,
+                             sent - start,
+                             time.perf_counter() - sent,
+                             headers_received - sent)
+
+        self.__logger.info('URI for request: {0}'.format(response.url))
+        log_payload(self.__logger, 'Body of request', body, resource)
+        _check_status(self.__logger,
+                      response.status,
+                      response.url,
+                      lambda: text)
+        return _decode(self.__codec, text, self.__metrics, resource)
+
+    async def _delay_if_necessary(self):
+        waited = await self.__rate_limiter.acquire_async()
+        if waited > 0:
+            self.__logger.debug('Slept for {0} before sending request'
+                                .format(waited))
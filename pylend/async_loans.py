@@ -0,0 +1,34 @@
+import logging
+from .datetimes import DATETIME_ARROW, _check_datetime_mode
+from .loans import _check_for_errors, _normalize_loan_format
+from .payload_log import log_payload
+
+
+class AsyncLoans:
+    __connection = None
+    __datetime_mode = None
+    __logger = None
+
+    def __init__(self, connection, datetime_mode=DATETIME_ARROW):
+        if connection is None:
+            raise ValueError(
+                'connection must be a non-None AsyncConnection object')
+        self.__connection = connection
+        self.__datetime_mode = _check_datetime_mode(datetime_mode)
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def datetime_mode(self):
+        return self.__datetime_mode
+
+    async def listed_loans(self, get_all_loans=False):
+        url_path = 'loans/listing'
+        query_params = {'showAll': get_all_loans}
+        self.__logger.debug('Retrieving path {0} with query_params {1}'
+                            .format(url_path, query_params))
+
+        json_payload = await self.__connection.get(url_path,
+                                                   query_params=query_params)
+        log_payload(self.__logger, 'JSON Payload', json_payload, url_path)
+        _check_for_errors(json_payload, self.__logger)
+        return _normalize_loan_format(json_payload, self.__datetime_mode)
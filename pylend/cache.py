@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTLS = \
+    {
+        'summary': 5.0,
+        'availablecash': 1.0,
+        'portfolios': 60.0,
+        'funds/pending': 30.0,
+        'notes': 30.0,
+        'detailednotes': 30.0
+    }
+
+# Account resources whose cached values are stale after a write.
+WRITE_INVALIDATIONS = \
+    {
+        'orders': ['availablecash', 'summary', 'notes', 'detailednotes'],
+        'portfolios': ['portfolios', 'summary']
+    }
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.exception = None
+
+
+class ResponseCache:
+    __ttls = None
+    __max_entries = None
+    __clock = None
+    __entries = None
+    __in_flight = None
+    __lock = None
+
+    def __init__(self, ttls=None, max_entries=128, clock=time.monotonic):
+        if max_entries is None or max_entries < 1:
+            raise ValueError('max_entries must be a positive integer')
+        self.__ttls = dict(DEFAULT_TTLS)
+        if ttls is not None:
+            self.__ttls.update(ttls)
+        self.__max_entries = max_entries
+        self.__clock = clock
+        self.__entries = OrderedDict()
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def ttl(self, resource):
+        return self.__ttls.get(resource)
+
+    def get_or_load(self, key, resource, loader):
+        ttl = self.ttl(resource)
+        if not ttl:
+            return loader()
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.__clock():
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.__entries[key]
+
+            in_flight = self.__in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = _InFlight()
+                self.__in_flight[key] = in_flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # An identical request is already on the wire; share its result.
+            in_flight.done.wait()
+            if in_flight.exception is not None:
+                raise in_flight.exception
+            return in_flight.value
+
+        try:
+            in_flight.value = loader()
+        except Exception as e:
+            in_flight.exception = e
+            raise
+        finally:
+            self._finish(key, ttl, in_flight)
+            in_flight.done.set()
+        return in_flight.value
+
+    def invalidate(self, account_id, resources):
+        # Loads already in flight for these resources are detached, so that
+        # reads from now on wait for a fresh load instead of joining one that
+        # began before the write, and their results are not cached.
+        resources = set(resources)
+        with self.__lock:
+            for keys in (self.__entries, self.__in_flight):
+                for key in list(keys):
+                    if key[0] == account_id and key[1] in resources:
+                        del keys[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__in_flight.clear()
+
+    def _finish(self, key, ttl, in_flight):
+        with self.__lock:
+            if self.__in_flight.get(key) is not in_flight:
+                # A write invalidated this key while the value was loading.
+                return
+            del self.__in_flight[key]
+            if in_flight.exception is not None:
+                return
+            self.__entries[key] = (self.__clock() + ttl, in_flight.value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
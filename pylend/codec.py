@@ -0,0 +1,88 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+CODEC_JSON = 'json'
+CODEC_ORJSON = 'orjson'
+CODEC_UJSON = 'ujson'
+
+
+class JsonCodec:
+    name = CODEC_JSON
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = CODEC_ORJSON
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson; '
+                              'install it with "pip install pylend[fast]"')
+
+    def dumps(self, obj):
+        # orjson encodes straight to UTF-8 bytes, which are sent as they are.
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec:
+    name = CODEC_UJSON
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError('UjsonCodec requires ujson; '
+                              'install it with "pip install ujson"')
+
+    def dumps(self, obj):
+        return ujson.dumps(obj)
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+_CODECS = \
+    {
+        CODEC_JSON: JsonCodec,
+        CODEC_ORJSON: OrjsonCodec,
+        CODEC_UJSON: UjsonCodec
+    }
+
+
+def available_codecs():
+    available = [CODEC_JSON]
+    if orjson is not None:
+        available.insert(0, CODEC_ORJSON)
+    if ujson is not None:
+        available.insert(len(available) - 1, CODEC_UJSON)
+    return available
+
+
+def get_codec(codec=None):
+    # Accepts a codec name, a codec object (anything with dumps and loads),
+    # or None for the fastest installed codec.
+    if codec is None:
+        return _CODECS[available_codecs()[0]]()
+    if isinstance(codec, str):
+        if codec not in _CODECS:
+            raise ValueError('codec must be one of {0}'
+                             .format(', '.join(sorted(_CODECS))))
+        return _CODECS[codec]()
+    return codec
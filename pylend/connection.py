@@ -1,111 +1,475 @@
-import time
 import requests
 import logging
-import json
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
 from .exceptions import (AuthorizationException,
                          ResourceNotFoundException,
                          ExecutionFailureException,
                          UnexpectedStatusCodeException)
+from .codec import get_codec
+from .metrics import (PHASE_DECODE,
+                      PHASE_DOWNLOAD,
+                      PHASE_RATE_LIMIT,
+                      PHASE_RESPONSE)
+from .payload_log import log_payload
+from .rate_limiter import rate_limiter_for_delay
+from .retry import parse_retry_after
+from .transport import SessionTransport
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _encode_body(body, codec):
+    if body is None or isinstance(body, (str, bytes)):
+        return body
+    # Bodies that write their own wire form, such as order submissions,
+    # skip the codec.
+    to_json = getattr(body, 'to_json', None)
+    if to_json is not None:
+        return to_json()
+    return codec.dumps(body)
+
+
+def _iter_response(response, chunk_size, metrics=None, resource=None):
+    received = 0
+    try:
+        for chunk in response.iter_content(chunk_size):
+            received += len(chunk)
+            yield chunk
+    finally:
+        response.close()
+        if metrics is not None:
+            metrics.add_bytes(resource, 'received', received)
+
+
+def _record_exchange(metrics, resource, body, status_code, waited, elapsed,
+                     response_time=None):
+    # response_time is the time to the response headers, when the HTTP
+    # client reports it; the rest of elapsed was spent reading the body.
+    metrics.observe(resource, PHASE_RATE_LIMIT, waited)
+    if response_time is None:
+        metrics.observe(resource, PHASE_RESPONSE, elapsed)
+    else:
+        response_time = min(response_time, elapsed)
+        metrics.observe(resource, PHASE_RESPONSE, response_time)
+        metrics.observe(resource, PHASE_DOWNLOAD, elapsed - response_time)
+    metrics.count_status(resource, status_code)
+    if body is not None:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        metrics.add_bytes(resource, 'sent', len(body))
+
+
+def _decode(codec, content, metrics, resource):
+    if metrics is None:
+        return codec.loads(content)
+    metrics.add_bytes(resource, 'received', len(content))
+    start = time.perf_counter()
+    payload = codec.loads(content)
+    metrics.observe(resource, PHASE_DECODE, time.perf_counter() - start)
+    return payload
+
+
+def _is_error_status(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def _check_status(logger, status_code, url, get_text):
+    logger.info('Status code: {0}'.format(status_code))
+
+    if status_code == 200:
+        return
+    elif status_code == 400:
+        # We will let the caller handle this, as it is often call-specific
+        return
+    elif status_code == 401 or status_code == 403:
+        logger.error('Encountered Authorization error code {0}: {1}'
+                     .format(status_code, get_text()))
+        raise AuthorizationException()
+    elif status_code == 404:
+        logger.error('Resource {0} not found.'.format(url))
+        raise ResourceNotFoundException()
+    elif status_code == 500:
+        logger.error('Request failed with 500 error: {0}'
+                     .format(get_text()))
+        raise ExecutionFailureException()
+    else:
+        logger.error(
+            'Unexpected status code returned: {0}. Response text:{1}'
+            .format(status_code, get_text()))
+        raise UnexpectedStatusCodeException()
 
 
 class Connection:
     __api_key = None
-    __last_request = None
+    __base_uri = None
     __logger = None
-    __request_delay = None
+    __rate_limiter = None
+    __transport = None
+    __keep_alive = None
+    __pool_size = None
+    __codec = None
+    __metrics = None
+    __retry_policies = None
+    __hedge = None
+    __hedge_executor = None
+    __hedge_lock = None
     __JSON_CONTENT_TYPE = 'application/json'
     __PYLEND_USER_AGENT = 'pylend v0.1.0'
     __LENDINGCLUB_BASE_URI = 'https://api.lendingclub.com/api/investor/{0}/{1}'
 
-    def __init__(self, api_key, request_delay=timedelta(seconds=1.0)):
+    def __init__(self,
+                 api_key,
+                 request_delay=timedelta(seconds=1.0),
+                 pool_size=DEFAULT_POOL_SIZE,
+                 keep_alive=True,
+                 prewarm=False,
+                 base_uri=None,
+                 rate_limiter=None,
+                 codec=None,
+                 metrics=None,
+                 retry_policies=None,
+                 hedge=None,
+                 transport=None):
         if api_key is None:
             raise ValueError('api_key must be provided and not None.')
+        if pool_size is None or pool_size < 1:
+            raise ValueError('pool_size must be a positive integer')
         self.__api_key = api_key
-        self.__last_request = datetime.min
-        self.__request_delay = request_delay
+        self.__codec = get_codec(codec)
+        self.__metrics = metrics
+        self.__retry_policies = dict(retry_policies or {})
+        self.__hedge = hedge
+        self.__hedge_lock = threading.Lock()
+        self.__base_uri = base_uri or self.__LENDINGCLUB_BASE_URI
+        self.__rate_limiter = rate_limiter or \
+            rate_limiter_for_delay(request_delay)
+        self.__keep_alive = keep_alive
+        self.__pool_size = pool_size
         self.__logger = logging.getLogger('pylend')
+        self.__transport = transport or SessionTransport(pool_size)
+
+        if prewarm:
+            self.prewarm()
+
+    @property
+    def rate_limiter(self):
+        return self.__rate_limiter
+
+    @property
+    def codec(self):
+        return self.__codec
+
+    @property
+    def metrics(self):
+        return self.__metrics
+
+    @property
+    def transport(self):
+        return self.__transport
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.__hedge_executor is not None:
+            self.__hedge_executor.shutdown(wait=False)
+        self.__transport.close()
+
+    def prewarm(self, connections=1):
+        # Opens (and returns to the pool) TCP+TLS connections ahead of the
+        # first real request, so that it does not pay for the handshake.
+        # Each request takes a rate-limiter token like any other, and they
+        # are sent together once all have one: a request sent after another
+        # has finished would just reuse its socket.
+        connections = min(connections, self.__pool_size)
+        if connections < 1:
+            return
+        request_uri = self.__base_uri.format('v1', '')
+        ready = threading.Barrier(connections)
+
+        def prewarm_one():
+            try:
+                self._delay_if_necessary()
+            except BaseException:
+                # Otherwise the other requests would wait for this one
+                # forever.
+                ready.abort()
+                raise
+            ready.wait()
+            self.__transport.prewarm(request_uri, self._headers())
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(prewarm_one)
+                       for _ in range(connections)]
+        for future in futures:
+            e = future.exception()
+            if isinstance(e, (requests.RequestException,
+                              threading.BrokenBarrierError)):
+                self.__logger.warning('Unable to prewarm connection: {0}'
+                                      .format(e))
+            elif e is not None:
+                raise e
 
     def get(self, resource, api_version='v1', query_params=None):
+        transport = self.__transport
+
         def request_func(request_uri, headers, params, data, logger):
             logger.info('Issuing GET request')
-            return requests.get(request_uri, headers=headers, params=params)
+            return transport.request('GET', request_uri, headers, params)
 
-        return self._request(request_func, resource, api_version, query_params)
+        return self._request(request_func,
+                             resource,
+                             api_version,
+                             query_params,
+                             method='GET')
 
-    def _request(self,
-                 request_func,
-                 resource,
-                 api_version,
-                 query_params,
-                 data=None):
+    def get_stream(self,
+                   resource,
+                   api_version='v1',
+                   query_params=None,
+                   chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+        # The request is sent (and its status checked) now; the body is read
+        # from the socket only as the returned chunks are consumed.
+        transport = self.__transport
+
+        def request_func(request_uri, headers, params, data, logger):
+            logger.info('Issuing streaming GET request')
+            return transport.request('GET',
+                                     request_uri,
+                                     headers,
+                                     params,
+                                     stream=True)
+
+        response = self._send(request_func,
+                              resource,
+                              api_version,
+                              query_params,
+                              method='GET',
+                              hedge=False)
+        return _iter_response(response,
+                              chunk_size,
+                              self.__metrics,
+                              resource)
+
+    def _headers(self):
         headers = {
             'Accept': self.__JSON_CONTENT_TYPE,
             'Authorization': self.__api_key,
             'User-Agent': self.__PYLEND_USER_AGENT
         }
+        if not self.__keep_alive:
+            headers['Connection'] = 'close'
+        return headers
+
+    def _request(self,
+                 request_func,
+                 resource,
+                 api_version,
+                 query_params,
+                 data=None,
+                 method=None):
+        response = self._send(request_func,
+                              resource,
+                              api_version,
+                              query_params,
+                              data,
+                              method)
+        return _decode(self.__codec,
+                       response.content,
+                       self.__metrics,
+                       resource)
+
+    def _send(self,
+              request_func,
+              resource,
+              api_version,
+              query_params,
+              data=None,
+              method=None,
+              hedge=True):
+        policy = self._retry_policy(method, resource)
+        hedge = hedge and self.__hedge is not None and \
+            self.__hedge.applies_to(method, resource)
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    response = self._hedged_attempt(request_func,
+                                                    resource,
+                                                    api_version,
+                                                    query_params,
+                                                    data)
+                else:
+                    response = self._attempt(request_func,
+                                             resource,
+                                             api_version,
+                                             query_params,
+                                             data)
+            except Exception as e:
+                if policy is None or attempt >= policy.max_retries or \
+                        not policy.retries_exception(e):
+                    raise
+                delay = policy.delay(attempt)
+                reason = repr(e)
+            else:
+                delay = None
+                if policy is not None and attempt < policy.max_retries and \
+                        policy.retries_status(response.status_code):
+                    headers = getattr(response, 'headers', None) or {}
+                    delay = policy.delay(
+                        attempt,
+                        parse_retry_after(headers.get('Retry-After')))
+                if delay is None:
+                    self._check_for_errors(response)
+                    return response
+                reason = 'status code {0}'.format(response.status_code)
+                response.close()
 
-        request_uri = self.__LENDINGCLUB_BASE_URI.format(api_version, resource)
+            attempt += 1
+            self.__logger.warning('Retrying {0} after {1} in {2:.3f}s '
+                                  '(retry {3} of {4})'
+                                  .format(resource,
+                                          reason,
+                                          delay,
+                                          attempt,
+                                          policy.max_retries))
+            if self.__metrics is not None:
+                self.__metrics.count_retry(resource)
+            policy.sleep(delay)
+
+    def _retry_policy(self, method, resource):
+        policy = self.__retry_policies.get(method)
+        if policy is not None and method == 'POST' and \
+                resource.endswith('orders'):
+            # An order that may have reached the server is never resent.
+            return policy.safe()
+        return policy
+
+    def _attempt(self,
+                 request_func,
+                 resource,
+                 api_version,
+                 query_params,
+                 data):
+        headers = self._headers()
+
+        request_uri = self.__base_uri.format(api_version, resource)
+        start = time.perf_counter()
         self._delay_if_necessary()
+        sent = time.perf_counter()
 
         response = request_func(request_uri,
                                 headers,
                                 query_params,
                                 data,
                                 self.__logger)
+        if self.__metrics is not None:
+            response_time = getattr(response, 'elapsed', None)
+            _record_exchange(self.__metrics,
+                             resource,
+                             data,
+                             response.status_code,
+                             sent - start,
+                             time.perf_counter() - sent,
+                             None if response_time is None
+                             else response_time.total_seconds())
 
-        self.__last_request = datetime.now()
         self.__logger.info('URI for request: {0}'.format(response.url))
-        self.__logger.debug('Body of request: {0}'.format(json.dumps(data)))
-        self._check_for_errors(response)
-        return response.json()
+        log_payload(self.__logger, 'Body of request', data, resource)
+        return response
+
+    def _hedged_attempt(self,
+                        request_func,
+                        resource,
+                        api_version,
+                        query_params,
+                        data):
+        # A duplicate request is sent if the first has not completed within
+        # the hedge delay; it takes its own rate-limiter token, and the first
+        # response to arrive without an error is used. If every attempt
+        # fails, the last error response (or exception) is returned for the
+        # retry policy to handle. Other responses are closed, so that their
+        # connections go back to the pool.
+        executor = self._get_hedge_executor()
+        args = (request_func, resource, api_version, query_params, data)
+        pending = {executor.submit(self._attempt, *args)}
+        done, pending = wait(pending, timeout=self.__hedge.delay)
+        if not done:
+            self.__logger.info('Hedging slow request for {0}'
+                               .format(resource))
+            pending.add(executor.submit(self._attempt, *args))
+
+        failed = None
+        error = None
+        while True:
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                response = future.result()
+                if not _is_error_status(response.status_code):
+                    if failed is not None:
+                        failed.close()
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return response
+                if failed is not None:
+                    failed.close()
+                failed = response
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if failed is not None:
+            return failed
+        raise error
+
+    def _get_hedge_executor(self):
+        with self.__hedge_lock:
+            if self.__hedge_executor is None:
+                self.__hedge_executor = ThreadPoolExecutor(max_workers=4)
+            return self.__hedge_executor
 
     def post(self, resource, body, api_version='v1', query_params=None):
+        transport = self.__transport
+
         def request_func(request_uri, headers, params, data, logger):
             logger.info('Issuing POST request')
             headers['Content-type'] = 'application/json'
-            return requests.post(
-                request_uri,
-                data=json.dumps(data),
-                headers=headers,
-                params=params)
+            return transport.request('POST',
+                                     request_uri,
+                                     headers,
+                                     params,
+                                     data)
 
+        # Encoded once; the same bytes are sent and, at debug level, logged.
         return self._request(
             request_func,
             resource,
             api_version,
             query_params,
-            body)
+            _encode_body(body, self.__codec),
+            'POST')
 
     def _delay_if_necessary(self):
-        delta = datetime.now() - self.__last_request
-
-        if delta < self.__request_delay:
-            self.__logger.debug('Sleeping for {0} before sending request'
-                                .format(delta.total_seconds()))
-            time.sleep(delta.total_seconds())
+        waited = self.__rate_limiter.acquire()
+        if waited > 0:
+            self.__logger.debug('Slept for {0} before sending request'
+                                .format(waited))
 
     def _check_for_errors(self, response):
-        self.__logger.info('Status code: {0}'.format(response.status_code))
-
-        if response.status_code == 200:
-            return
-        elif response.status_code == 400:
-            # We will let the caller handle this, as it is often call-specific
-            return
-        elif response.status_code == 401 or response.status_code == 403:
-            self.__logger.error('Encountered Authorization error code {0}: {1}'
-                                .format(response.status_code, response.text))
-            raise AuthorizationException()
-        elif response.status_code == 404:
-            self.__logger.error('Resource {0} not found.'.format(response.url))
-            raise ResourceNotFoundException()
-        elif response.status_code == 500:
-            self.__logger.error('Request failed with 500 error: {0}'
-                                .format(response.text))
-            raise ExecutionFailureException()
-        else:
-            self.__logger.error(
-                'Unexpected status code returned: {0}. Response text:{1}'
-                .format(response.status_code, response.text))
-            raise UnexpectedStatusCodeException()
+        _check_status(self.__logger,
+                      response.status_code,
+                      response.url,
+                      lambda: response.text)
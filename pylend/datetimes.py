@@ -0,0 +1,147 @@
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+arrow = None
+
+DATETIME_ARROW = 'arrow'
+DATETIME_LAZY = 'lazy'
+DATETIME_EPOCH = 'epoch'
+DATETIME_MODES = (DATETIME_ARROW, DATETIME_LAZY, DATETIME_EPOCH)
+DEFAULT_DATETIME_CACHE_SIZE = 4096
+
+# The API sends every timestamp as 2014-08-25T10:56:29.000-07:00, though
+# some offsets arrive without the colon (-0800). These are parsed with
+# datetime.fromisoformat; anything else goes to arrow.
+_API_TIMESTAMP = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d'
+                            r'(?:\.\d{3}(?:\d{3})?)?[+-]\d\d(:?)\d\d$',
+                            re.ASCII)
+
+
+def _check_datetime_mode(datetime_mode):
+    if datetime_mode not in DATETIME_MODES:
+        raise ValueError('datetime_mode must be one of {0}'
+                         .format(', '.join(DATETIME_MODES)))
+    return datetime_mode
+
+
+def _record_datetime_mode(datetime_mode):
+    # Slotted records cannot defer parsing, so lazy mode parses eagerly.
+    return DATETIME_ARROW if datetime_mode == DATETIME_LAZY else datetime_mode
+
+
+def _arrow():
+    # arrow is a large share of the package's import time, so it is loaded
+    # when the first datetime is parsed.
+    global arrow
+    if arrow is None:
+        import arrow as arrow_module
+        arrow = arrow_module
+    return arrow
+
+
+def _parse_api_timestamp(value):
+    # Returns an aware datetime, or None if value is not in the API's format.
+    match = _API_TIMESTAMP.match(value)
+    if match is None:
+        return None
+    if not match.group(1):
+        value = value[:-2] + ':' + value[-2:]
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _fast_parse(value):
+    parsed = _parse_api_timestamp(value)
+    if parsed is None:
+        return (arrow or _arrow()).get(value)
+    return (arrow or _arrow()).Arrow.fromdatetime(parsed)
+
+
+class DatetimeCache:
+    __max_entries = None
+    __entries = None
+    __lock = None
+
+    def __init__(self, max_entries=DEFAULT_DATETIME_CACHE_SIZE):
+        if max_entries is None or max_entries < 0:
+            raise ValueError('max_entries must be a non-negative integer')
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self):
+        return self.__max_entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __repr__(self):
+        fmt = "DatetimeCache: {0} entries, {1} hits, {2} misses"
+        return fmt.format(len(self.__entries), self.hits, self.misses)
+
+    def parse(self, value):
+        # Arrow objects are immutable, so one parsed value is safely shared
+        # by every record carrying the same timestamp string.
+        if not isinstance(value, str):
+            return (arrow or _arrow()).get(value)
+        with self.__lock:
+            parsed = self.__entries.get(value)
+            if parsed is not None:
+                self.__entries.move_to_end(value)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        parsed = _fast_parse(value)
+        if self.__max_entries > 0:
+            with self.__lock:
+                self.__entries[value] = parsed
+                if len(self.__entries) > self.__max_entries:
+                    self.__entries.popitem(last=False)
+        return parsed
+
+    def resize(self, max_entries):
+        if max_entries is None or max_entries < 0:
+            raise ValueError('max_entries must be a non-negative integer')
+        with self.__lock:
+            self.__max_entries = max_entries
+            while len(self.__entries) > max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every normalizer: loans released in the same drop share their
+# listing timestamps, and notes share their issue and payment dates.
+_DATETIME_CACHE = DatetimeCache()
+
+
+def datetime_cache():
+    return _DATETIME_CACHE
+
+
+def parse_datetime(value):
+    return _DATETIME_CACHE.parse(value) if value is not None else None
+
+
+def to_epoch(value):
+    if value is None:
+        return None
+    return int(_DATETIME_CACHE.parse(value).datetime.timestamp())
+
+
+def convert_datetime(value, datetime_mode):
+    if datetime_mode == DATETIME_EPOCH:
+        return to_epoch(value)
+    return parse_datetime(value)
@@ -13,5 +13,9 @@ class ExecutionFailureException(Exception):
         self.errors = errors
 
 
+class RequestRejectedException(ExecutionFailureException):
+    pass
+
+
 class UnexpectedStatusCodeException(Exception):
     pass
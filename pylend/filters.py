@@ -0,0 +1,233 @@
+import operator
+from .datetimes import to_epoch
+from .loans import LOAN_DATETIME_FIELDS
+from .table import (MISSING_EPOCH,
+                    LoanTable,
+                    _build_column,
+                    _require_numpy,
+                    np)
+
+_COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+
+def _present(field, column):
+    # Missing values are NaN in float columns and MISSING_EPOCH in date
+    # columns; like None in object columns, they match no comparison.
+    if column.dtype == np.float64:
+        return ~np.isnan(column)
+    if field in LOAN_DATETIME_FIELDS and column.dtype == np.int64:
+        return column != MISSING_EPOCH
+    return None
+
+
+def _where_present(field, column, result):
+    present = _present(field, column)
+    return result if present is None else result & present
+
+
+class _Columns:
+    # Resolves listing fields to arrays once per evaluation, so that every
+    # expression (and every strategy) reading a field shares one column.
+    def __init__(self, loans):
+        _require_numpy()
+        self.loans = loans
+        self.__columns = {}
+        self.__results = {}
+
+    def column(self, field):
+        if field not in self.__columns:
+            if isinstance(self.loans, LoanTable):
+                column = self.loans[field] if field in self.loans \
+                    else np.full(len(self.loans), None, dtype=object)
+            else:
+                column = _build_column(
+                    field,
+                    [loan.get(field) for loan in self.loans])
+            self.__columns[field] = column
+        return self.__columns[field]
+
+    def evaluate(self, expression):
+        key = expression.key
+        if key not in self.__results:
+            self.__results[key] = expression._evaluate(self)
+        return self.__results[key]
+
+
+class Expression:
+    key = None
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def mask(self, loans):
+        return _Columns(loans).evaluate(self)
+
+    def filter(self, loans):
+        return _select(loans, self.mask(loans))
+
+    def _evaluate(self, columns):
+        raise NotImplementedError()
+
+
+class Comparison(Expression):
+    def __init__(self, field, op, value):
+        if op not in _COMPARISONS:
+            raise ValueError('op must be one of {0}'
+                             .format(', '.join(sorted(_COMPARISONS))))
+        if field in LOAN_DATETIME_FIELDS and value is not None and \
+                not isinstance(value, (int, float)):
+            # Date columns are compared as epoch seconds.
+            value = to_epoch(value)
+        self.field = field
+        self.op = op
+        self.value = value
+        self.key = ('cmp', field, op, value)
+
+    def _evaluate(self, columns):
+        column = columns.column(self.field)
+        if column.dtype == object:
+            compare = _COMPARISONS[self.op]
+            return np.fromiter(
+                (value is not None and compare(value, self.value)
+                 for value in column),
+                dtype=bool,
+                count=len(column))
+        return _where_present(self.field,
+                              column,
+                              _COMPARISONS[self.op](column, self.value))
+
+    def __repr__(self):
+        return '{0} {1} {2!r}'.format(self.field, self.op, self.value)
+
+
+class Membership(Expression):
+    def __init__(self, field, values):
+        self.field = field
+        self.values = frozenset(values)
+        self.key = ('in', field, self.values)
+
+    def _evaluate(self, columns):
+        column = columns.column(self.field)
+        if column.dtype == object:
+            values = self.values
+            return np.fromiter((value in values for value in column),
+                               dtype=bool,
+                               count=len(column))
+        return _where_present(self.field,
+                              column,
+                              np.isin(column, list(self.values)))
+
+    def __repr__(self):
+        return '{0} in {1!r}'.format(self.field, sorted(self.values))
+
+
+class And(Expression):
+    def __init__(self, *operands):
+        self.operands = operands
+        self.key = ('and',) + tuple(operand.key for operand in operands)
+
+    def _evaluate(self, columns):
+        result = columns.evaluate(self.operands[0])
+        for operand in self.operands[1:]:
+            result = result & columns.evaluate(operand)
+        return result
+
+    def __repr__(self):
+        return '(' + ' & '.join(repr(operand)
+                                for operand in self.operands) + ')'
+
+
+class Or(Expression):
+    def __init__(self, *operands):
+        self.operands = operands
+        self.key = ('or',) + tuple(operand.key for operand in operands)
+
+    def _evaluate(self, columns):
+        result = columns.evaluate(self.operands[0])
+        for operand in self.operands[1:]:
+            result = result | columns.evaluate(operand)
+        return result
+
+    def __repr__(self):
+        return '(' + ' | '.join(repr(operand)
+                                for operand in self.operands) + ')'
+
+
+class Not(Expression):
+    def __init__(self, operand):
+        self.operand = operand
+        self.key = ('not', operand.key)
+
+    def _evaluate(self, columns):
+        return ~columns.evaluate(self.operand)
+
+    def __repr__(self):
+        return '~{0!r}'.format(self.operand)
+
+
+class Field:
+    def __init__(self, name):
+        if name is None or name == '':
+            raise ValueError('name must be a non-None, non-empty string')
+        self.name = name
+
+    def __lt__(self, value):
+        return Comparison(self.name, '<', value)
+
+    def __le__(self, value):
+        return Comparison(self.name, '<=', value)
+
+    def __gt__(self, value):
+        return Comparison(self.name, '>', value)
+
+    def __ge__(self, value):
+        return Comparison(self.name, '>=', value)
+
+    def __eq__(self, value):
+        return Comparison(self.name, '==', value)
+
+    def __ne__(self, value):
+        return Comparison(self.name, '!=', value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        return Membership(self.name, values)
+
+    def between(self, low, high):
+        return And(self >= low, self <= high)
+
+
+def evaluate_many(expressions, loans):
+    columns = _Columns(loans)
+    if isinstance(expressions, dict):
+        return dict((name, columns.evaluate(expression))
+                    for name, expression in expressions.items())
+    return [columns.evaluate(expression) for expression in expressions]
+
+
+def filter_many(expressions, loans):
+    masks = evaluate_many(expressions, loans)
+    if isinstance(masks, dict):
+        return dict((name, _select(loans, mask))
+                    for name, mask in masks.items())
+    return [_select(loans, mask) for mask in masks]
+
+
+def _select(loans, mask):
+    if isinstance(loans, LoanTable):
+        return loans[mask]
+    return [loan for loan, selected in zip(loans, mask) if selected]
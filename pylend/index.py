@@ -0,0 +1,162 @@
+import threading
+
+DEFAULT_INDEXED_FIELDS = \
+    [
+        'grade',
+        'subGrade',
+        'addrState',
+        'purpose',
+        'term'
+    ]
+
+
+class LoanIndex:
+    # Loans by id, plus one secondary index per categorical field mapping
+    # each value to the loans holding it. Buckets are dicts keyed by loan id,
+    # so loans move between buckets in O(1) and keep their listing order.
+    __loans = None
+    __fields = None
+    __indexes = None
+    __poller = None
+    __lock = None
+
+    def __init__(self, loans=None, fields=DEFAULT_INDEXED_FIELDS):
+        self.__fields = tuple(fields)
+        self.__loans = {}
+        self.__indexes = dict((field, {}) for field in self.__fields)
+        self.__lock = threading.Lock()
+        if loans is not None:
+            for loan in loans:
+                self._insert(loan)
+
+    @property
+    def fields(self):
+        return self.__fields
+
+    def __len__(self):
+        return len(self.__loans)
+
+    def __contains__(self, loan_id):
+        return loan_id in self.__loans
+
+    def __getitem__(self, loan_id):
+        return self.__loans[loan_id]
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(list(self.__loans.values()))
+
+    def __repr__(self):
+        fmt = "LoanIndex: {0} loans indexed on {1}"
+        return fmt.format(len(self.__loans), ', '.join(self.__fields))
+
+    def get(self, loan_id, default=None):
+        return self.__loans.get(loan_id, default)
+
+    def insert(self, loan):
+        # Inserting a loan whose id is already indexed updates it.
+        with self.__lock:
+            self._insert(loan)
+
+    def update(self, loan):
+        with self.__lock:
+            if loan['id'] not in self.__loans:
+                raise KeyError(loan['id'])
+            self._insert(loan)
+
+    def remove(self, loan_id):
+        with self.__lock:
+            return self._remove(loan_id)
+
+    def apply_diff(self, diff):
+        with self.__lock:
+            for loan in diff.new:
+                self._insert(loan)
+            for loan in diff.changed:
+                self._insert(loan)
+            for loan in diff.removed:
+                if loan['id'] in self.__loans:
+                    self._remove(loan['id'])
+
+    def attach(self, poller):
+        # Seeds the index from the poller's snapshot and keeps it current
+        # with every diff the poller reports.
+        self.detach()
+        with self.__lock:
+            for loan in poller.snapshot.values():
+                self._insert(loan)
+        self.__poller = poller
+        poller.subscribe(self.apply_diff)
+
+    def detach(self):
+        if self.__poller is not None:
+            self.__poller.unsubscribe(self.apply_diff)
+            self.__poller = None
+
+    def find(self, **criteria):
+        # Each criterion is a field and a value, or a list, tuple or set of
+        # values any of which may match. All criteria must match.
+        with self.__lock:
+            buckets = sorted((self._bucket(field, value)
+                              for field, value in criteria.items()),
+                             key=len)
+            if not buckets:
+                return list(self.__loans.values())
+            smallest = buckets[0]
+            others = buckets[1:]
+            return [loan for loan_id, loan in smallest.items()
+                    if all(loan_id in bucket for bucket in others)]
+
+    def count(self, **criteria):
+        if len(criteria) == 1:
+            field, value = next(iter(criteria.items()))
+            with self.__lock:
+                return len(self._bucket(field, value))
+        return len(self.find(**criteria))
+
+    def values(self, field):
+        # The indexed values of field, with the number of loans holding each.
+        with self.__lock:
+            return dict((value, len(bucket))
+                        for value, bucket in self._index(field).items())
+
+    def _index(self, field):
+        index = self.__indexes.get(field)
+        if index is None:
+            raise ValueError('{0} is not an indexed field; indexed fields '
+                             'are {1}'.format(field,
+                                              ', '.join(self.__fields)))
+        return index
+
+    def _bucket(self, field, value):
+        index = self._index(field)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            bucket = {}
+            for item in value:
+                bucket.update(index.get(item, {}))
+            return bucket
+        return index.get(value, {})
+
+    def _insert(self, loan):
+        loan_id = loan['id']
+        previous = self.__loans.get(loan_id)
+        self.__loans[loan_id] = loan
+        for field, index in self.__indexes.items():
+            value = loan.get(field)
+            if previous is not None:
+                previous_value = previous.get(field)
+                if previous_value != value:
+                    self._discard(index, previous_value, loan_id)
+            index.setdefault(value, {})[loan_id] = loan
+
+    def _remove(self, loan_id):
+        loan = self.__loans.pop(loan_id)
+        for field, index in self.__indexes.items():
+            self._discard(index, loan.get(field), loan_id)
+        return loan
+
+    def _discard(self, index, value, loan_id):
+        bucket = index[value]
+        del bucket[loan_id]
+        if not bucket:
+            del index[value]
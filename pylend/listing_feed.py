@@ -0,0 +1,257 @@
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+# The feed file starts with a fixed header followed by the pickled snapshot.
+# The sequence number works as a seqlock: it is odd while the publisher is
+# rewriting the snapshot and even once the snapshot is complete, so readers
+# copy the snapshot and accept it only if the sequence did not move. Each
+# publisher writes a random epoch next to it, so that readers can tell a
+# restarted publisher's version 1 from the one they have already read.
+#
+# Snapshots are pickled, so that loans keep their normalized values, and
+# reading one can run arbitrary code from whoever wrote the file. The file
+# must therefore be private: publishers create it readable and writable by
+# their own user only, and readers refuse files that other users own or can
+# write.
+_MAGIC = b'PYLF'
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct('<4sIQQQ')
+_SEQUENCE = struct.Struct('<Q')
+_SEQUENCE_OFFSET = 8
+_EPOCH = struct.Struct('<Q')
+_EPOCH_OFFSET = 24
+HEADER_SIZE = 32
+DEFAULT_CAPACITY = 1024 * 1024
+
+
+def _new_epoch():
+    return struct.unpack('<Q', os.urandom(8))[0] or 1
+
+
+def _open_private(path):
+    # The file is reused rather than truncated: readers may still have it
+    # mapped, and shrinking a mapped file makes their reads fault.
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o600)
+    return os.fdopen(fd, 'r+b')
+
+
+def _check_private(path, file):
+    if not hasattr(os, 'getuid'):
+        return
+    status = os.fstat(file.fileno())
+    if status.st_uid != os.getuid() or status.st_mode & 0o022:
+        raise ValueError('{0} must be owned by this user and not writable '
+                         'by others'.format(path))
+
+
+class ListingSnapshot:
+    def __init__(self, version, as_of_date, loans):
+        self.version = version
+        self.as_of_date = as_of_date
+        self.loans = loans
+
+    def __len__(self):
+        return len(self.loans)
+
+    def __repr__(self):
+        fmt = "ListingSnapshot version {0} as of {1}: {2} loans"
+        return fmt.format(self.version, self.as_of_date, len(self.loans))
+
+
+class ListingPublisher:
+    __path = None
+    __file = None
+    __map = None
+    __poller = None
+    __sequence = None
+    __epoch = None
+    __lock = None
+
+    def __init__(self, path, poller=None, capacity=DEFAULT_CAPACITY):
+        if path is None:
+            raise ValueError('path must be a non-None file path')
+        if capacity < HEADER_SIZE:
+            raise ValueError('capacity must be at least {0} bytes'
+                             .format(HEADER_SIZE))
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__sequence = 0
+        self.__epoch = _new_epoch()
+        self.__file = _open_private(path)
+        size = os.fstat(self.__file.fileno()).st_size
+        if size < capacity:
+            self.__file.truncate(capacity)
+        self.__map = mmap.mmap(self.__file.fileno(), max(size, capacity))
+        # The sequence is reset before the epoch changes, so that a reader
+        # copying the previous publisher's snapshot sees it move.
+        self._write_sequence(0)
+        _HEADER.pack_into(self.__map,
+                          0,
+                          _MAGIC,
+                          _FORMAT_VERSION,
+                          0,
+                          0,
+                          self.__epoch)
+        if poller is not None:
+            self.attach(poller)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def version(self):
+        return self.__sequence // 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def attach(self, poller):
+        # Every poll that changes the listing republishes the poller's
+        # snapshot, so consumers never issue listing requests themselves.
+        self.detach()
+        self.__poller = poller
+        poller.subscribe(self._on_diff)
+
+    def detach(self):
+        if self.__poller is not None:
+            self.__poller.unsubscribe(self._on_diff)
+            self.__poller = None
+
+    def close(self):
+        self.detach()
+        self.__map.close()
+        self.__file.close()
+
+    def publish(self, loans, as_of_date=None):
+        data = pickle.dumps((as_of_date, list(loans)),
+                            pickle.HIGHEST_PROTOCOL)
+        with self.__lock:
+            self._ensure_capacity(HEADER_SIZE + len(data))
+            self._write_sequence(self.__sequence + 1)
+            self.__map[HEADER_SIZE:HEADER_SIZE + len(data)] = data
+            _HEADER.pack_into(self.__map,
+                              0,
+                              _MAGIC,
+                              _FORMAT_VERSION,
+                              self.__sequence,
+                              len(data),
+                              self.__epoch)
+            self._write_sequence(self.__sequence + 1)
+            return self.version
+
+    def _on_diff(self, diff):
+        self.publish(self.__poller.snapshot.values(), diff.as_of_date)
+
+    def _write_sequence(self, sequence):
+        self.__sequence = sequence
+        _SEQUENCE.pack_into(self.__map, _SEQUENCE_OFFSET, sequence)
+
+    def _ensure_capacity(self, size):
+        if size <= len(self.__map):
+            return
+        capacity = max(size, 2 * len(self.__map))
+        self.__file.truncate(capacity)
+        self.__map.close()
+        self.__map = mmap.mmap(self.__file.fileno(), capacity)
+
+
+class ListingReader:
+    __path = None
+    __file = None
+    __map = None
+    __snapshot = None
+    __snapshot_epoch = None
+
+    def __init__(self, path):
+        self.__path = path
+        self.__file = open(path, 'rb')
+        try:
+            _check_private(path, self.__file)
+        except ValueError:
+            self.__file.close()
+            raise
+        self._remap()
+        magic, format_version = _HEADER.unpack_from(self.__map, 0)[:2]
+        if magic != _MAGIC or format_version != _FORMAT_VERSION:
+            self.close()
+            raise ValueError('{0} is not a listing feed file'.format(path))
+
+    @property
+    def version(self):
+        return _SEQUENCE.unpack_from(self.__map, _SEQUENCE_OFFSET)[0] // 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.__map is not None:
+            self.__map.close()
+        self.__file.close()
+
+    def read(self, timeout=1.0):
+        # Returns the latest complete snapshot, or None if nothing has been
+        # published yet. An unchanged version from the same publisher is
+        # served from the last read without unpickling again.
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence, epoch = self._position()
+            if sequence == 0:
+                return None
+            if self.__snapshot is not None and \
+                    self.__snapshot_epoch == epoch and \
+                    self.__snapshot.version == sequence // 2:
+                return self.__snapshot
+            if sequence % 2 == 0:
+                length = _HEADER.unpack_from(self.__map, 0)[3]
+                if HEADER_SIZE + length > len(self.__map):
+                    self._remap()
+                    continue
+                data = self.__map[HEADER_SIZE:HEADER_SIZE + length]
+                if self._position() == (sequence, epoch):
+                    as_of_date, loans = pickle.loads(data)
+                    self.__snapshot = ListingSnapshot(sequence // 2,
+                                                      as_of_date,
+                                                      loans)
+                    self.__snapshot_epoch = epoch
+                    return self.__snapshot
+            if time.monotonic() > deadline:
+                raise TimeoutError('Listing feed {0} is being rewritten'
+                                   .format(self.__path))
+            time.sleep(0)
+
+    def wait_for_update(self, version, timeout=None, interval=0.01):
+        # A restarted publisher counts versions from 1 again, so any
+        # version it publishes is an update.
+        epoch = self.__snapshot_epoch if self.__snapshot is not None \
+            else self._position()[1]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.version <= version and self._position()[1] == epoch:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+        return self.read()
+
+    def _position(self):
+        return (_SEQUENCE.unpack_from(self.__map, _SEQUENCE_OFFSET)[0],
+                _EPOCH.unpack_from(self.__map, _EPOCH_OFFSET)[0])
+
+    def _remap(self):
+        if self.__map is not None:
+            self.__map.close()
+        size = os.fstat(self.__file.fileno()).st_size
+        self.__map = mmap.mmap(self.__file.fileno(),
+                               size,
+                               access=mmap.ACCESS_READ)
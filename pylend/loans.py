@@ -1,7 +1,17 @@
+import json
 import logging
-import arrow
+import numbers
 import pylend
+from .datetimes import (DATETIME_ARROW,
+                        DATETIME_LAZY,
+                        _check_datetime_mode,
+                        _record_datetime_mode,
+                        convert_datetime)
 from .exceptions import ExecutionFailureException
+from .metrics import PHASE_NORMALIZE, timed
+from .normalizers import RecordNormalizer
+from .payload_log import log_payload
+from .streaming import iter_json_array
 
 LOAN_DATETIME_FIELDS = \
     [
@@ -15,6 +25,9 @@ LOAN_DATETIME_FIELDS = \
     ]
 
 
+_LOAN_NORMALIZER = RecordNormalizer(LOAN_DATETIME_FIELDS)
+
+
 def create_order(loan, amount, portfolio_id=None):
     if loan is None:
         raise ValueError('loan must not be None')
@@ -25,15 +38,44 @@ def create_order(loan, amount, portfolio_id=None):
     return LoanOrder(loan['id'], amount_to_fund, portfolio_id)
 
 
-def _normalize_loan_format(json_payload):
-        json_payload['asOfDate'] = arrow.get(json_payload['asOfDate'])
-        json_payload['loans'] = [pylend._convert_datetimes(
-            loan,
-            LOAN_DATETIME_FIELDS) for loan in json_payload['loans']]
+def _normalize_loan(loan, datetime_mode=DATETIME_ARROW):
+    return _LOAN_NORMALIZER(loan, datetime_mode)
+
+
+def _normalize_loan_format(json_payload, datetime_mode=DATETIME_ARROW):
+        # asOfDate is a single value per payload, so lazy mode parses it now.
+        json_payload['asOfDate'] = convert_datetime(
+            json_payload['asOfDate'],
+            DATETIME_ARROW if datetime_mode == DATETIME_LAZY
+            else datetime_mode)
+        json_payload['loans'] = _LOAN_NORMALIZER.normalize_many(
+            json_payload['loans'],
+            datetime_mode)
         return json_payload
 
 
+def _check_for_errors(json_payload, logger):
+    if 'errors' in json_payload:
+        logger.error('Listed loan has errors: {0}'
+                     .format(json_payload['errors']))
+        raise ExecutionFailureException()
+
+
+def _json_number(value):
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        return repr(value)
+    # numpy scalars (as read from a LoanTable) are not JSON serializable.
+    if value_type is not bool and isinstance(value, numbers.Integral):
+        return repr(int(value))
+    if isinstance(value, numbers.Real):
+        return json.dumps(float(value))
+    return json.dumps(value)
+
+
 class LoanOrder:
+    __slots__ = ('loan_id', 'amount', 'portfolio_id')
+
     def __init__(self, loan_id, amount, portfolio_id=None):
         self.loan_id = loan_id
         self.amount = amount
@@ -53,32 +95,97 @@ class LoanOrder:
             result['portfolioId'] = self.portfolio_id
         return result
 
+    def to_json(self):
+        if self.portfolio_id is None:
+            return '{"loanId":%s,"requestedAmount":%s}' % (
+                _json_number(self.loan_id),
+                _json_number(self.amount))
+        return '{"loanId":%s,"requestedAmount":%s,"portfolioId":%s}' % (
+            _json_number(self.loan_id),
+            _json_number(self.amount),
+            _json_number(self.portfolio_id))
+
 
 class Loans:
     __connection = None
+    __datetime_mode = None
+    __metrics = None
     __logger = None
+    __LISTING_PATH = 'loans/listing'
 
-    def __init__(self, connection):
+    def __init__(self, connection, datetime_mode=DATETIME_ARROW):
         if connection is None:
             raise ValueError('connection must be a non-None Connection object')
         self.__connection = connection
+        self.__datetime_mode = _check_datetime_mode(datetime_mode)
+        self.__metrics = getattr(connection, 'metrics', None)
         self.__logger = logging.getLogger('pylend')
 
-    def listed_loans(self, get_all_loans=False):
-        url_path = 'loans/listing'
+    @property
+    def datetime_mode(self):
+        return self.__datetime_mode
+
+    def listed_loans(self, get_all_loans=False, stream=False):
+        if stream:
+            return self._stream_listed_loans(get_all_loans)
+        json_payload = self.listed_loans_payload(get_all_loans)
+        return self._timed_normalize(_normalize_loan_format,
+                                     json_payload,
+                                     self.__datetime_mode)
+
+    def listed_loan_records(self, get_all_loans=False):
+        datetime_mode = _record_datetime_mode(self.__datetime_mode)
+
+        def convert(loans):
+            return [pylend.LoanRecord.from_dict(loan, datetime_mode)
+                    for loan in loans]
+
+        return self._timed_normalize(
+            convert,
+            self.listed_loans_payload(get_all_loans).get('loans', []))
+
+    def listed_loan_table(self, get_all_loans=False):
+        return self._timed_normalize(
+            pylend.LoanTable.from_payload,
+            self.listed_loans_payload(get_all_loans))
+
+    def listed_loans_payload(self, get_all_loans=False):
+        # The listing exactly as the API returned it, not normalized, for
+        # consumers such as ListingPoller that diff raw payloads.
+        url_path = self.__LISTING_PATH
         query_params = {'showAll': get_all_loans}
         self.__logger.debug('Retrieving path {0} with query_params {1}'
                             .format(url_path, query_params))
 
         json_payload = self.__connection.get(url_path,
                                              query_params=query_params)
-        self.__logger.debug("JSON Payload:\n{0}".format(json_payload))
+        log_payload(self.__logger, 'JSON Payload', json_payload, url_path)
         self._check_for_errors(json_payload)
-        json_payload = _normalize_loan_format(json_payload)
         return json_payload
 
+    def _timed_normalize(self, normalize, *args):
+        return timed(self.__metrics,
+                     self.__LISTING_PATH,
+                     PHASE_NORMALIZE,
+                     normalize,
+                     *args)
+
+    def _stream_listed_loans(self, get_all_loans):
+        # Loans are normalized and yielded one at a time while the rest of
+        # the listing is still being read. A payload carrying errors has no
+        # loans, so checking once the body is exhausted is enough.
+        url_path = self.__LISTING_PATH
+        query_params = {'showAll': get_all_loans}
+        self.__logger.debug('Streaming path {0} with query_params {1}'
+                            .format(url_path, query_params))
+
+        chunks = self.__connection.get_stream(url_path,
+                                              query_params=query_params)
+        normalize = _LOAN_NORMALIZER.compile(self.__datetime_mode)
+        fields = {}
+        for loan in iter_json_array(chunks, 'loans', fields):
+            yield normalize(loan)
+        self._check_for_errors(fields)
+
     def _check_for_errors(self, json_payload):
-        if 'errors' in json_payload:
-            self.__logger.error('Listed loan has errors: {0}'
-                                .format(json_payload['errors']))
-            raise ExecutionFailureException()
+        _check_for_errors(json_payload, self.__logger)
@@ -0,0 +1,177 @@
+import bisect
+import re
+import threading
+import time
+
+DEFAULT_BUCKETS = \
+    [
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0
+    ]
+
+PHASE_RATE_LIMIT = 'rate_limit'
+PHASE_RESPONSE = 'response'
+PHASE_DOWNLOAD = 'download'
+PHASE_DECODE = 'decode'
+PHASE_NORMALIZE = 'normalize'
+
+# Account and loan IDs in resource paths are collapsed so that every account
+# shares one series per endpoint.
+_ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def endpoint_name(resource):
+    return _ID_SEGMENT.sub('{id}', resource)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def to_dict(self):
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {'count': self.count,
+                'sum': self.sum,
+                'buckets': dict(zip(bounds, self.cumulative_counts()))}
+
+
+class MetricsRegistry:
+    __buckets = None
+    __latencies = None
+    __bytes = None
+    __statuses = None
+    __retries = None
+    __lock = None
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        if not buckets or list(buckets) != sorted(buckets):
+            raise ValueError('buckets must be a non-empty, sorted sequence')
+        self.__buckets = list(buckets)
+        self.__latencies = {}
+        self.__bytes = {}
+        self.__statuses = {}
+        self.__retries = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, resource, phase, seconds):
+        key = (endpoint_name(resource), phase)
+        with self.__lock:
+            histogram = self.__latencies.get(key)
+            if histogram is None:
+                histogram = self.__latencies[key] = Histogram(self.__buckets)
+            histogram.observe(seconds)
+
+    def add_bytes(self, resource, direction, count):
+        key = (endpoint_name(resource), direction)
+        with self.__lock:
+            self.__bytes[key] = self.__bytes.get(key, 0) + count
+
+    def count_status(self, resource, status_code):
+        key = (endpoint_name(resource), status_code)
+        with self.__lock:
+            self.__statuses[key] = self.__statuses.get(key, 0) + 1
+
+    def count_retry(self, resource):
+        key = endpoint_name(resource)
+        with self.__lock:
+            self.__retries[key] = self.__retries.get(key, 0) + 1
+
+    def histogram(self, resource, phase):
+        return self.__latencies.get((endpoint_name(resource), phase))
+
+    def reset(self):
+        with self.__lock:
+            self.__latencies.clear()
+            self.__bytes.clear()
+            self.__statuses.clear()
+            self.__retries.clear()
+
+    def to_dict(self):
+        result = {'latency': {}, 'bytes': {}, 'statuses': {}, 'retries': {}}
+        with self.__lock:
+            for (endpoint, phase), histogram in self.__latencies.items():
+                result['latency'].setdefault(endpoint, {})[phase] = \
+                    histogram.to_dict()
+            for (endpoint, direction), count in self.__bytes.items():
+                result['bytes'].setdefault(endpoint, {})[direction] = count
+            for (endpoint, status_code), count in self.__statuses.items():
+                result['statuses'].setdefault(endpoint, {})[status_code] = \
+                    count
+            result['retries'].update(self.__retries)
+        return result
+
+    def to_prometheus(self, prefix='pylend'):
+        lines = []
+        with self.__lock:
+            name = prefix + '_request_phase_seconds'
+            lines.append('# TYPE {0} histogram'.format(name))
+            for (endpoint, phase), histogram in \
+                    sorted(self.__latencies.items()):
+                labels = 'endpoint="{0}",phase="{1}"'.format(endpoint, phase)
+                bounds = [repr(bound) for bound in histogram.buckets] + \
+                    ['+Inf']
+                for bound, count in zip(bounds,
+                                        histogram.cumulative_counts()):
+                    lines.append('{0}_bucket{{{1},le="{2}"}} {3}'
+                                 .format(name, labels, bound, count))
+                lines.append('{0}_sum{{{1}}} {2!r}'
+                             .format(name, labels, histogram.sum))
+                lines.append('{0}_count{{{1}}} {2}'
+                             .format(name, labels, histogram.count))
+
+            name = prefix + '_bytes_total'
+            lines.append('# TYPE {0} counter'.format(name))
+            for (endpoint, direction), count in sorted(self.__bytes.items()):
+                lines.append('{0}{{endpoint="{1}",direction="{2}"}} {3}'
+                             .format(name, endpoint, direction, count))
+
+            name = prefix + '_responses_total'
+            lines.append('# TYPE {0} counter'.format(name))
+            for (endpoint, status_code), count in \
+                    sorted(self.__statuses.items()):
+                lines.append('{0}{{endpoint="{1}",status="{2}"}} {3}'
+                             .format(name, endpoint, status_code, count))
+
+            name = prefix + '_retries_total'
+            lines.append('# TYPE {0} counter'.format(name))
+            for endpoint, count in sorted(self.__retries.items()):
+                lines.append('{0}{{endpoint="{1}"}} {2}'
+                             .format(name, endpoint, count))
+        return '\n'.join(lines) + '\n'
+
+
+def timed(metrics, resource, phase, func, *args):
+    if metrics is None:
+        return func(*args)
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        metrics.observe(resource, phase, time.perf_counter() - start)
@@ -0,0 +1,141 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .account import Account
+from .connection import Connection
+from .datetimes import DATETIME_ARROW
+from .rate_limiter import shared_rate_limiter
+
+
+class FanOutResult:
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def succeeded(self):
+        return len(self.errors) == 0
+
+    def __getitem__(self, account_id):
+        if account_id in self.errors:
+            raise self.errors[account_id]
+        return self.results[account_id]
+
+    def __len__(self):
+        return len(self.results) + len(self.errors)
+
+    def __repr__(self):
+        fmt = "FanOutResult: {0} accounts succeeded, {1} failed"
+        return fmt.format(len(self.results), len(self.errors))
+
+
+def _default_connection(api_key):
+    # Each API key gets its own connection pool and its own share of the
+    # API's per-key rate limit.
+    return Connection(api_key, rate_limiter=shared_rate_limiter(api_key))
+
+
+class MultiAccount:
+    __accounts = None
+    __connections = None
+    __max_workers = None
+    __logger = None
+
+    def __init__(self,
+                 credentials,
+                 datetime_mode=DATETIME_ARROW,
+                 max_workers=None,
+                 cache=None,
+                 connection_factory=_default_connection):
+        credentials = list(credentials or [])
+        if len(credentials) == 0:
+            raise ValueError('credentials must contain at least one '
+                             '(api_key, account_id) pair')
+        if max_workers is not None and max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+
+        self.__connections = {}
+        self.__accounts = {}
+        for api_key, account_id in credentials:
+            if account_id in self.__accounts:
+                raise ValueError('account {0} is listed more than once'
+                                 .format(account_id))
+            connection = self.__connections.get(api_key)
+            if connection is None:
+                connection = connection_factory(api_key)
+                self.__connections[api_key] = connection
+            self.__accounts[account_id] = Account(connection,
+                                                  account_id,
+                                                  datetime_mode,
+                                                  cache)
+        # The workers spend their time waiting on the network, so by default
+        # every account gets one and a fan-out takes as long as the slowest
+        # account.
+        self.__max_workers = max_workers or len(self.__accounts)
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def accounts(self):
+        return dict(self.__accounts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for connection in self.__connections.values():
+            close = getattr(connection, 'close', None)
+            if close is not None:
+                close()
+
+    def available_cash(self):
+        return self._fan_out(
+            lambda account_id, account: account.available_cash())
+
+    def account_summary(self):
+        return self._fan_out(
+            lambda account_id, account: account.account_summary())
+
+    def owned_notes(self, detailed_info=False):
+        return self._fan_out(
+            lambda account_id, account: account.owned_notes(detailed_info))
+
+    def submit_orders(self, orders_by_account):
+        unknown = [account_id for account_id in orders_by_account
+                   if account_id not in self.__accounts]
+        if unknown:
+            raise ValueError('Unknown account IDs: {0}'.format(unknown))
+        return self._fan_out(
+            lambda account_id, account: account.submit_orders(
+                orders_by_account[account_id]),
+            list(orders_by_account))
+
+    def _fan_out(self, call, account_ids=None):
+        # Accounts run concurrently; accounts sharing an API key are still
+        # paced by that key's rate limiter. One account failing does not
+        # stop the others.
+        if account_ids is None:
+            account_ids = list(self.__accounts)
+        result = FanOutResult()
+        if len(account_ids) == 0:
+            return result
+
+        def run(account_id):
+            try:
+                value = call(account_id, self.__accounts[account_id])
+                return account_id, value, None
+            except Exception as e:
+                return account_id, None, e
+
+        max_workers = min(self.__max_workers, len(account_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for account_id, value, exception in executor.map(run,
+                                                             account_ids):
+                if exception is None:
+                    result.results[account_id] = value
+                else:
+                    self.__logger.warning('Account {0} failed: {1!r}'
+                                          .format(account_id, exception))
+                    result.errors[account_id] = exception
+        return result
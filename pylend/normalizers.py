@@ -0,0 +1,66 @@
+from .datetimes import (DATETIME_ARROW,
+                        DATETIME_EPOCH,
+                        DATETIME_LAZY,
+                        parse_datetime,
+                        to_epoch)
+
+
+class RecordNormalizer:
+    # Converts a record type's datetime fields and remaps its enumerated
+    # fields in one pass over the record. The pass is built once per datetime
+    # mode and reused for every record of the type.
+    __datetime_fields = None
+    __mappings = None
+    __compiled = None
+
+    def __init__(self, datetime_fields, mappings=None):
+        self.__datetime_fields = tuple(datetime_fields)
+        self.__mappings = tuple((mappings or {}).items())
+        self.__compiled = {}
+
+    @property
+    def datetime_fields(self):
+        return self.__datetime_fields
+
+    def __call__(self, record, datetime_mode=DATETIME_ARROW):
+        return self.compile(datetime_mode)(record)
+
+    def normalize_many(self, records, datetime_mode=DATETIME_ARROW):
+        normalize = self.compile(datetime_mode)
+        return [normalize(record) for record in records]
+
+    def compile(self, datetime_mode):
+        normalize = self.__compiled.get(datetime_mode)
+        if normalize is None:
+            normalize = self._compile(datetime_mode)
+            self.__compiled[datetime_mode] = normalize
+        return normalize
+
+    def _compile(self, datetime_mode):
+        datetime_fields = self.__datetime_fields
+        mappings = self.__mappings
+
+        if datetime_mode == DATETIME_LAZY:
+            from .records import LazyRecord
+
+            def normalize_lazy(record):
+                for field, mapping in mappings:
+                    record[field] = mapping[record[field]]
+                return LazyRecord(record, datetime_fields)
+
+            return normalize_lazy
+
+        convert = to_epoch if datetime_mode == DATETIME_EPOCH \
+            else parse_datetime
+
+        def normalize(record):
+            get = record.get
+            for field in datetime_fields:
+                value = get(field)
+                if value is not None:
+                    record[field] = convert(value)
+            for field, mapping in mappings:
+                record[field] = mapping[record[field]]
+            return record
+
+        return normalize
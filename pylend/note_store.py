@@ -0,0 +1,201 @@
+import json
+import logging
+import sqlite3
+import threading
+from .account import _NOTE_NORMALIZER
+from .datetimes import DATETIME_ARROW, _check_datetime_mode, to_epoch
+
+# A note is rewritten in the store only when one of these fields changes.
+NOTE_CHANGE_FIELDS = \
+    [
+        'loanStatus',
+        'loanStatusDate',
+        'nextPaymentDate',
+        'currentPaymentStatus',
+        'paymentsReceived',
+        'principalPending',
+        'interestPending',
+        'principalReceived',
+        'interestReceived',
+        'accruedInterest',
+        'portfolioId'
+    ]
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS notes (
+        note_id INTEGER PRIMARY KEY,
+        loan_id INTEGER,
+        portfolio_id INTEGER,
+        loan_status TEXT,
+        loan_status_date INTEGER,
+        next_payment_date INTEGER,
+        fingerprint TEXT NOT NULL,
+        data TEXT NOT NULL)''',
+    'CREATE INDEX IF NOT EXISTS notes_loan_status ON notes (loan_status)',
+    'CREATE INDEX IF NOT EXISTS notes_next_payment_date '
+    'ON notes (next_payment_date)',
+    'CREATE INDEX IF NOT EXISTS notes_portfolio_id ON notes (portfolio_id)',
+    'CREATE INDEX IF NOT EXISTS notes_loan_id ON notes (loan_id)'
+]
+
+_UPSERT = '''INSERT OR REPLACE INTO notes
+    (note_id, loan_id, portfolio_id, loan_status, loan_status_date,
+     next_payment_date, fingerprint, data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+
+
+def _fingerprint(note):
+    return json.dumps([note.get(field) for field in NOTE_CHANGE_FIELDS])
+
+
+def _row(note, fingerprint):
+    return (note['noteId'],
+            note.get('loanId'),
+            note.get('portfolioId'),
+            note.get('loanStatus'),
+            to_epoch(note.get('loanStatusDate')),
+            to_epoch(note.get('nextPaymentDate')),
+            fingerprint,
+            json.dumps(note))
+
+
+class SyncResult:
+    def __init__(self, inserted, updated, removed, unchanged):
+        self.inserted = inserted
+        self.updated = updated
+        self.removed = removed
+        self.unchanged = unchanged
+
+    def __repr__(self):
+        fmt = "SyncResult: {0} inserted, {1} updated, {2} removed, " \
+              "{3} unchanged"
+        return fmt.format(self.inserted,
+                          self.updated,
+                          self.removed,
+                          self.unchanged)
+
+
+class NoteStore:
+    __connection = None
+    __datetime_mode = None
+    __lock = None
+
+    def __init__(self, path=':memory:', datetime_mode=DATETIME_ARROW):
+        self.__datetime_mode = _check_datetime_mode(datetime_mode)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            for statement in _SCHEMA:
+                self.__connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._query_scalar('SELECT COUNT(*) FROM notes')
+
+    def close(self):
+        self.__connection.close()
+
+    def apply(self, notes):
+        # Diffs raw API notes against the stored fingerprints and writes only
+        # notes that are new or changed; notes no longer reported (sold or
+        # settled) are removed. A note listed twice is counted once, and its
+        # last entry is kept.
+        latest = {}
+        for note in notes:
+            latest[note['noteId']] = note
+
+        with self.__lock:
+            stored = dict(self.__connection.execute(
+                'SELECT note_id, fingerprint FROM notes'))
+            rows = []
+            inserted = 0
+            for note_id, note in latest.items():
+                fingerprint = _fingerprint(note)
+                previous = stored.get(note_id)
+                if previous == fingerprint:
+                    continue
+                if previous is None:
+                    inserted += 1
+                rows.append(_row(note, fingerprint))
+            removed = [(note_id,) for note_id in stored
+                       if note_id not in latest]
+
+            with self.__connection:
+                self.__connection.executemany(_UPSERT, rows)
+                self.__connection.executemany(
+                    'DELETE FROM notes WHERE note_id = ?', removed)
+
+        return SyncResult(inserted,
+                          len(rows) - inserted,
+                          len(removed),
+                          len(latest) - len(rows))
+
+    def get(self, note_id):
+        notes = self._query('WHERE note_id = ?', (note_id,))
+        return notes[0] if notes else None
+
+    def all(self):
+        return self._query('ORDER BY note_id')
+
+    def by_status(self, loan_status):
+        return self._query('WHERE loan_status = ? ORDER BY note_id',
+                           (loan_status,))
+
+    def by_portfolio(self, portfolio_id):
+        return self._query('WHERE portfolio_id = ? ORDER BY note_id',
+                           (portfolio_id,))
+
+    def by_loan(self, loan_id):
+        return self._query('WHERE loan_id = ? ORDER BY note_id', (loan_id,))
+
+    def due_between(self, start, end):
+        return self._query(
+            'WHERE next_payment_date BETWEEN ? AND ? '
+            'ORDER BY next_payment_date, note_id',
+            (_epoch(start), _epoch(end)))
+
+    def _query(self, clause, parameters=()):
+        with self.__lock:
+            rows = self.__connection.execute(
+                'SELECT data FROM notes ' + clause, parameters).fetchall()
+        return _NOTE_NORMALIZER.normalize_many(
+            [json.loads(row[0]) for row in rows],
+            self.__datetime_mode)
+
+    def _query_scalar(self, statement):
+        with self.__lock:
+            return self.__connection.execute(statement).fetchone()[0]
+
+
+def _epoch(value):
+    return value if isinstance(value, int) else to_epoch(value)
+
+
+class NoteSync:
+    __account = None
+    __store = None
+    __logger = None
+
+    def __init__(self, account, store):
+        if account is None:
+            raise ValueError('account must be a non-None Account object')
+        if store is None:
+            raise ValueError('store must be a non-None NoteStore object')
+        self.__account = account
+        self.__store = store
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def store(self):
+        return self.__store
+
+    def sync(self):
+        json_payload = self.__account.owned_notes_payload(detailed_info=True)
+        result = self.__store.apply(json_payload.get('myNotes', []))
+        self.__logger.info('Synced owned notes: {0}'.format(result))
+        return result
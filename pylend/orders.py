@@ -0,0 +1,61 @@
+from .loans import LoanOrder
+from .table import LoanTable, _require_numpy, np
+
+NOTE_INCREMENT = 25
+
+
+def _loan_columns(loans):
+    if isinstance(loans, LoanTable):
+        return (loans['id'],
+                loans['loanAmount'].astype(np.float64),
+                loans['fundedAmount'].astype(np.float64))
+    count = len(loans)
+    return (np.fromiter((loan['id'] for loan in loans),
+                        dtype=np.int64, count=count),
+            np.fromiter((loan['loanAmount'] for loan in loans),
+                        dtype=np.float64, count=count),
+            np.fromiter((loan['fundedAmount'] for loan in loans),
+                        dtype=np.float64, count=count))
+
+
+def allocate_amounts(loans, amount, budget=None, available_cash=None):
+    _require_numpy()
+    if loans is None:
+        raise ValueError('loans must not be None')
+    if amount is None or amount < NOTE_INCREMENT:
+        raise ValueError('amount must be at least {0}'
+                         .format(NOTE_INCREMENT))
+
+    loan_ids, loan_amounts, funded_amounts = _loan_columns(loans)
+
+    # Each note is capped by what the loan still needs, then rounded down
+    # to the note increment.
+    per_note = np.minimum(loan_amounts - funded_amounts, amount)
+    per_note = np.floor(per_note / NOTE_INCREMENT) * NOTE_INCREMENT
+    np.maximum(per_note, 0, out=per_note)
+
+    limits = [limit for limit in (budget, available_cash)
+              if limit is not None]
+    if limits:
+        # Loans are funded in order; the one that crosses the limit gets
+        # whatever whole increments are left and later loans get nothing.
+        remaining = min(limits) - (np.cumsum(per_note) - per_note)
+        per_note = np.minimum(per_note, np.maximum(remaining, 0))
+        per_note = np.floor(per_note / NOTE_INCREMENT) * NOTE_INCREMENT
+
+    funded = per_note > 0
+    return loan_ids[funded], per_note[funded]
+
+
+def create_orders(loans,
+                  amount,
+                  budget=None,
+                  available_cash=None,
+                  portfolio_id=None):
+    loan_ids, amounts = allocate_amounts(loans,
+                                         amount,
+                                         budget,
+                                         available_cash)
+    return [LoanOrder(loan_id, note_amount, portfolio_id)
+            for loan_id, note_amount in zip(loan_ids.tolist(),
+                                            amounts.tolist())]
@@ -0,0 +1,103 @@
+import json
+import logging
+
+PAYLOAD_LOG_SUMMARY = 'summary'
+PAYLOAD_LOG_TRUNCATED = 'truncated'
+PAYLOAD_LOG_FULL = 'full'
+PAYLOAD_LOG_MODES = \
+    [
+        PAYLOAD_LOG_SUMMARY,
+        PAYLOAD_LOG_TRUNCATED,
+        PAYLOAD_LOG_FULL
+    ]
+
+DEFAULT_PAYLOAD_LOG_LIMIT = 1000
+SUMMARY_ID_COUNT = 5
+
+# Keys identifying an element of a listed collection, in order of preference.
+ID_FIELDS = ['id', 'noteId', 'loanId', 'portfolioId', 'transferId']
+
+_settings = {'mode': PAYLOAD_LOG_SUMMARY, 'limit': DEFAULT_PAYLOAD_LOG_LIMIT}
+
+
+def set_payload_logging(mode=PAYLOAD_LOG_SUMMARY,
+                        limit=DEFAULT_PAYLOAD_LOG_LIMIT):
+    if mode not in PAYLOAD_LOG_MODES:
+        raise ValueError('mode must be one of {0}'
+                         .format(', '.join(PAYLOAD_LOG_MODES)))
+    if limit is None or limit < 1:
+        raise ValueError('limit must be a positive integer')
+    _settings['mode'] = mode
+    _settings['limit'] = limit
+
+
+def _element_id(element):
+    if isinstance(element, dict):
+        for field in ID_FIELDS:
+            if field in element:
+                return element[field]
+    return None
+
+
+def summarize_payload(payload):
+    # Collections are reduced to their size and first few IDs; other
+    # top-level values are kept as they are.
+    if isinstance(payload, (str, bytes)):
+        return {'length': len(payload)}
+    if isinstance(payload, list):
+        ids = [_element_id(element) for element in payload[:SUMMARY_ID_COUNT]]
+        summary = {'count': len(payload)}
+        if any(element_id is not None for element_id in ids):
+            summary['ids'] = ids
+        return summary
+    if isinstance(payload, dict):
+        return dict((key, summarize_payload(value)
+                     if isinstance(value, list) else value)
+                    for key, value in payload.items())
+    return payload
+
+
+def _truncate(text, limit):
+    if len(text) <= limit:
+        return text
+    return '{0}... ({1} characters)'.format(text[:limit], len(text))
+
+
+class _LazyPayload:
+    # Rendered by the logging machinery only when a handler emits the
+    # record, so a disabled or filtered debug message costs nothing.
+    __slots__ = ('payload', 'mode', 'limit')
+
+    def __init__(self, payload, mode, limit):
+        self.payload = payload
+        self.mode = mode
+        self.limit = limit
+
+    def __str__(self):
+        payload = self.payload
+        if self.mode == PAYLOAD_LOG_SUMMARY and \
+                not isinstance(payload, (str, bytes)):
+            return str(summarize_payload(payload))
+        if isinstance(payload, bytes):
+            text = payload.decode('utf-8', 'replace')
+        elif isinstance(payload, str):
+            text = payload
+        else:
+            text = json.dumps(payload, default=str)
+        if self.mode == PAYLOAD_LOG_FULL:
+            return text
+        return _truncate(text, self.limit)
+
+
+def log_payload(logger, label, payload, resource=None):
+    # Structured handlers can read record.pylend_resource,
+    # record.pylend_summary and record.pylend_payload instead of parsing the
+    # message.
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug('%s: %s',
+                 label,
+                 _LazyPayload(payload, _settings['mode'], _settings['limit']),
+                 extra={'pylend_resource': resource,
+                        'pylend_summary': summarize_payload(payload),
+                        'pylend_payload': payload})
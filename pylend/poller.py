@@ -0,0 +1,175 @@
+import logging
+import threading
+from datetime import timedelta
+from .datetimes import _arrow, parse_datetime
+from .loans import _LOAN_NORMALIZER
+
+# LendingClub adds new loans to the platform four times a day.
+LISTING_RELEASE_TIMES = ['06:00', '10:00', '14:00', '18:00']
+LISTING_RELEASE_TIMEZONE = 'US/Pacific'
+
+
+class ListingDiff:
+    def __init__(self, as_of_date, new, changed, removed):
+        self.as_of_date = as_of_date
+        self.new = new
+        self.changed = changed
+        self.removed = removed
+
+    def __len__(self):
+        return len(self.new) + len(self.changed) + len(self.removed)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        fmt = "ListingDiff as of {0}: {1} new, {2} changed, {3} removed"
+        return fmt.format(self.as_of_date,
+                          len(self.new),
+                          len(self.changed),
+                          len(self.removed))
+
+
+class ListingPoller:
+    __loans = None
+    __get_all_loans = None
+    __interval = None
+    __fast_interval = None
+    __release_times = None
+    __release_window = None
+    __timezone = None
+    __subscribers = None
+    __snapshot = None
+    __funded_amounts = None
+    __stopped = None
+    __logger = None
+
+    def __init__(self,
+                 loans,
+                 interval=timedelta(seconds=60),
+                 fast_interval=timedelta(seconds=1),
+                 release_times=LISTING_RELEASE_TIMES,
+                 release_window=timedelta(minutes=2),
+                 timezone=LISTING_RELEASE_TIMEZONE,
+                 get_all_loans=False):
+        if loans is None:
+            raise ValueError('loans must be a non-None Loans object')
+        if fast_interval > interval:
+            raise ValueError('fast_interval must not exceed interval')
+        self.__loans = loans
+        self.__get_all_loans = get_all_loans
+        self.__interval = interval
+        self.__fast_interval = fast_interval
+        self.__release_times = [_parse_release_time(release_time)
+                                for release_time in release_times]
+        self.__release_window = release_window
+        self.__timezone = timezone
+        self.__subscribers = []
+        self.__snapshot = {}
+        self.__funded_amounts = {}
+        self.__stopped = threading.Event()
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def snapshot(self):
+        return self.__snapshot
+
+    def subscribe(self, callback):
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.__subscribers.remove(callback)
+
+    def poll(self):
+        json_payload = self.__loans.listed_loans_payload(
+            self.__get_all_loans)
+        diff = self._apply(json_payload)
+        self.__logger.info('Polled listing: {0}'.format(diff))
+        if diff:
+            for callback in list(self.__subscribers):
+                callback(diff)
+        return diff
+
+    def next_interval(self, now=None):
+        # Release times are wall-clock times in the poller's timezone; the
+        # day before and after are checked too, for windows that cross
+        # midnight.
+        arrow = _arrow()
+        now = arrow.now(self.__timezone) if now is None \
+            else arrow.get(now).to(self.__timezone)
+        for days in (-1, 0, 1):
+            day = now.shift(days=days)
+            for hour, minute in self.__release_times:
+                release = day.replace(hour=hour,
+                                      minute=minute,
+                                      second=0,
+                                      microsecond=0)
+                if abs(now - release) <= self.__release_window:
+                    return self.__fast_interval
+        return self.__interval
+
+    def run(self, max_polls=None):
+        self.__stopped.clear()
+        polls = 0
+        while not self.__stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                self.__logger.exception('Listing poll failed')
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                return
+            self.__stopped.wait(self.next_interval().total_seconds())
+
+    def stop(self):
+        self.__stopped.set()
+
+    def __iter__(self):
+        self.__stopped.clear()
+        while not self.__stopped.is_set():
+            diff = self.poll()
+            if diff:
+                yield diff
+            self.__stopped.wait(self.next_interval().total_seconds())
+
+    def _apply(self, json_payload):
+        # Only loans that are new or whose fundedAmount moved are
+        # normalized; the rest of the listing is compared by id alone.
+        previous = self.__funded_amounts
+        current = {}
+        new = []
+        changed = []
+
+        for loan in json_payload.get('loans', []):
+            loan_id = loan['id']
+            funded_amount = loan['fundedAmount']
+            current[loan_id] = funded_amount
+            if loan_id not in previous:
+                new.append(loan)
+            elif previous[loan_id] != funded_amount:
+                changed.append(loan)
+
+        removed = [self.__snapshot.pop(loan_id)
+                   for loan_id in previous if loan_id not in current]
+        new = self._normalize_into_snapshot(new)
+        changed = self._normalize_into_snapshot(changed)
+        self.__funded_amounts = current
+
+        as_of_date = json_payload.get('asOfDate')
+        return ListingDiff(parse_datetime(as_of_date) if as_of_date else None,
+                           new,
+                           changed,
+                           removed)
+
+    def _normalize_into_snapshot(self, loans):
+        normalized = _LOAN_NORMALIZER.normalize_many(
+            loans,
+            self.__loans.datetime_mode)
+        for loan in normalized:
+            self.__snapshot[loan['id']] = loan
+        return normalized
+
+
+def _parse_release_time(release_time):
+    hour, minute = release_time.split(':')
+    return int(hour), int(minute)
@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import threading
+import time
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    def acquire(self):
+        raise NotImplementedError()
+
+    async def acquire_async(self):
+        raise NotImplementedError()
+
+
+class NullRateLimiter(RateLimiter):
+    def acquire(self):
+        return 0.0
+
+    async def acquire_async(self):
+        return 0.0
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    __rate = None
+    __capacity = None
+    __tokens = None
+    __updated = None
+    __clock = None
+    __sleep = None
+    __lock = None
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic,
+                 sleep=time.sleep):
+        if rate is None or rate <= 0:
+            raise ValueError('rate must be a positive number of requests '
+                             'per second')
+        if capacity is None or capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.__rate = float(rate)
+        self.__capacity = float(capacity)
+        self.__tokens = float(capacity)
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__updated = clock()
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.__rate
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            self.__sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self):
+        # Takes a token immediately, letting the bucket go negative, and
+        # returns how long the caller must wait for that token to exist.
+        # Reserving under the lock and sleeping outside it keeps concurrent
+        # callers (threads or coroutines) queued in order without holding
+        # the lock while they wait.
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(
+                self.__capacity,
+                self.__tokens + (now - self.__updated) * self.__rate)
+            self.__updated = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.__rate
+
+
+def rate_limiter_for_delay(request_delay):
+    seconds = request_delay.total_seconds()
+    if seconds <= 0:
+        return NullRateLimiter()
+    return TokenBucketRateLimiter(rate=1.0 / seconds, capacity=1)
+
+
+def shared_rate_limiter(api_key, rate=1.0, capacity=1):
+    # Limiters are keyed on a digest of the API key, so that the keys
+    # themselves are not kept in memory for the life of the process.
+    key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(rate=rate, capacity=capacity)
+            _shared_limiters[key] = limiter
+        elif limiter.rate != rate or limiter.capacity != capacity:
+            raise ValueError('The shared rate limiter for this API key has '
+                             'rate {0} and capacity {1}; got rate {2} and '
+                             'capacity {3}'.format(limiter.rate,
+                                                   limiter.capacity,
+                                                   rate,
+                                                   capacity))
+        return limiter
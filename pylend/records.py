@@ -0,0 +1,366 @@
+import json
+import threading
+from collections.abc import MutableMapping
+from json.encoder import encode_basestring_ascii
+from .account import NOTE_DATETIME_FIELDS, TRANSFER_DATETIME_FIELDS
+from .datetimes import convert_datetime, parse_datetime
+from .loans import LOAN_DATETIME_FIELDS
+
+LOAN_FIELDS = \
+    (
+        'id',
+        'memberId',
+        'loanAmount',
+        'fundedAmount',
+        'term',
+        'intRate',
+        'expDefaultRate',
+        'serviceFeeRate',
+        'installment',
+        'grade',
+        'subGrade',
+        'empLength',
+        'homeOwnership',
+        'annualInc',
+        'isIncV',
+        'acceptD',
+        'expD',
+        'listD',
+        'creditPullD',
+        'reviewStatusD',
+        'reviewStatus',
+        'desc',
+        'purpose',
+        'addrZip',
+        'addrState',
+        'investorCount',
+        'ilsExpD',
+        'initialListStatus',
+        'empTitle',
+        'accNowDelinq',
+        'accOpenPast24Mths',
+        'bcOpenToBuy',
+        'percentBcGt75',
+        'bcUtil',
+        'dti',
+        'delinq2Yrs',
+        'delinqAmnt',
+        'earliestCrLine',
+        'ficoRangeLow',
+        'ficoRangeHigh',
+        'inqLast6Mths',
+        'mthsSinceLastDelinq',
+        'mthsSinceLastRecord',
+        'mthsSinceRecentInq',
+        'mthsSinceRecentRevolDelinq',
+        'mthsSinceRecentBc',
+        'mortAcc',
+        'openAcc',
+        'pubRec',
+        'totalBalExMort',
+        'revolBal',
+        'revolUtil',
+        'totalBcLimit',
+        'totalAcc',
+        'totalIlHighCreditLimit',
+        'numRevAccts',
+        'mthsSinceRecentBcDlq',
+        'pubRecBankruptcies',
+        'numAcctsEver120Ppd',
+        'chargeoffWithin12Mths',
+        'collections12MthsExMed',
+        'taxLiens',
+        'mthsSinceLastMajorDerog',
+        'numSats',
+        'numTlOpPast12m',
+        'moSinRcntTl',
+        'totHiCredLim',
+        'totCurBal',
+        'avgCurBal',
+        'numBcTl',
+        'numActvBcTl',
+        'numBcSats',
+        'pctTlNvrDlq',
+        'numTl90gDpd24m',
+        'numTl30dpd',
+        'numTl120dpd2m',
+        'numIlTl',
+        'moSinOldIlAcct',
+        'numActvRevTl',
+        'moSinOldRevTlOp',
+        'moSinRcntRevTlOp',
+        'totalRevHiLim',
+        'numRevTlBalGt0',
+        'numOpRevTl',
+        'totCollAmt',
+        'applicationType',
+        'annualIncJoint',
+        'dtiJoint',
+        'isIncVJoint',
+        'openAcc6m',
+        'openIl6m',
+        'openIl12m',
+        'openIl24m',
+        'mthsSinceRcntIl',
+        'totalBalIl',
+        'iLUtil',
+        'openRv12m',
+        'openRv24m',
+        'maxBalBc',
+        'allUtil',
+        'totalCreditRv',
+        'inqFi',
+        'totalFiTl',
+        'inqLast12m'
+    )
+
+
+NOTE_FIELDS = \
+    (
+        'loanId',
+        'noteId',
+        'orderId',
+        'portfolioId',
+        'portfolioName',
+        'loanStatus',
+        'grade',
+        'loanAmount',
+        'noteAmount',
+        'interestRate',
+        'loanLength',
+        'paymentsReceived',
+        'issueDate',
+        'orderDate',
+        'loanStatusDate',
+        'nextPaymentDate',
+        'purpose',
+        'currentPaymentStatus',
+        'canBeTraded',
+        'creditTrend',
+        'accruedInterest',
+        'principalPending',
+        'interestPending',
+        'principalReceived',
+        'interestReceived',
+        'applicationType'
+    )
+
+TRANSFER_FIELDS = \
+    (
+        'transferId',
+        'transferDate',
+        'amount',
+        'sourceAccount',
+        'status',
+        'frequency',
+        'endDate',
+        'operation',
+        'cancellable'
+    )
+
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: float.__repr__,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null'
+}
+
+# Taken only while a pending datetime field is parsed, or a record is
+# written to, so that readers in other threads never see a field that is no
+# longer pending but still holds the raw string.
+_PARSE_LOCK = threading.Lock()
+
+
+class LazyRecord(MutableMapping):
+    # A mapping whose datetime fields hold the raw API strings until first
+    # read, at which point they are parsed and the result is cached. It is
+    # not a dict subclass, so that copies made with dict(record) or
+    # {**record} go through __getitem__ and see parsed values too.
+    __slots__ = ('_data', '_pending')
+
+    def __init__(self, data, datetime_fields):
+        self._data = dict(data)
+        self._pending = set(field for field in datetime_fields
+                            if field in data)
+
+    def __getitem__(self, key):
+        # A field leaves _pending only after its parsed value is stored.
+        if key in self._pending:
+            with _PARSE_LOCK:
+                if key in self._pending:
+                    self._data[key] = parse_datetime(self._data[key])
+                    self._pending.discard(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        with _PARSE_LOCK:
+            self._data[key] = value
+            self._pending.discard(key)
+
+    def __delitem__(self, key):
+        with _PARSE_LOCK:
+            del self._data[key]
+            self._pending.discard(key)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyRecord):
+            other = other.resolve()
+        return self.resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.resolve())
+
+    def __reduce__(self):
+        return (dict, (self.resolve(),))
+
+    def copy(self):
+        return self.resolve()
+
+    def resolve(self):
+        for field in list(self._pending):
+            self[field]
+        return dict(self._data)
+
+
+def _encode_value(value):
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if hasattr(value, 'isoformat'):
+        return '"' + value.isoformat() + '"'
+    return json.dumps(value)
+
+
+_get_slot = object.__getattribute__
+
+
+class _Record:
+    # Typed records keep one slot per known API field instead of a per-record
+    # dict. Fields the API adds later are kept in _extra. A known field that
+    # was absent from the API data leaves its slot empty: it reads as None as
+    # an attribute, but is left out of to_dict and to_json.
+    __slots__ = ('_extra',)
+    _fields = ()
+    _datetime_fields = ()
+    _json_keys = ()
+
+    def __init__(self, **values):
+        extra = None
+        for field in self._fields:
+            if field in values:
+                setattr(self, field, values.pop(field))
+        if values:
+            extra = values
+        self._extra = extra
+
+    @classmethod
+    def from_dict(cls, data, datetime_mode=None):
+        record = cls(**data)
+        if datetime_mode is not None:
+            for field in cls._datetime_fields:
+                if field in data:
+                    setattr(record,
+                            field,
+                            convert_datetime(data[field], datetime_mode))
+        return record
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set.
+        if name in self._fields:
+            return None
+        raise AttributeError(name)
+
+    def _items(self):
+        for field in self._fields:
+            try:
+                yield field, _get_slot(self, field)
+            except AttributeError:
+                pass
+
+    def __getitem__(self, field):
+        if field in self._fields:
+            try:
+                return _get_slot(self, field)
+            except AttributeError:
+                raise KeyError(field)
+        if self._extra is not None and field in self._extra:
+            return self._extra[field]
+        raise KeyError(field)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self.to_dict())
+
+    def to_dict(self):
+        result = dict(self._items())
+        if self._extra is not None:
+            result.update(self._extra)
+        return result
+
+    def to_json(self):
+        parts = []
+        for key, field in zip(self._json_keys, self._fields):
+            try:
+                parts.append(key + _encode_value(_get_slot(self, field)))
+            except AttributeError:
+                pass
+        if self._extra is not None:
+            parts.extend(json.dumps(field) + ':' + _encode_value(value)
+                         for field, value in self._extra.items())
+        return '{' + ','.join(parts) + '}'
+
+
+def _json_keys(fields):
+    return tuple(json.dumps(field) + ':' for field in fields)
+
+
+class LoanRecord(_Record):
+    __slots__ = LOAN_FIELDS
+    _fields = LOAN_FIELDS
+    _datetime_fields = tuple(LOAN_DATETIME_FIELDS)
+    _json_keys = _json_keys(LOAN_FIELDS)
+
+
+class NoteRecord(_Record):
+    __slots__ = NOTE_FIELDS
+    _fields = NOTE_FIELDS
+    _datetime_fields = tuple(NOTE_DATETIME_FIELDS)
+    _json_keys = _json_keys(NOTE_FIELDS)
+
+
+class TransferRecord(_Record):
+    __slots__ = TRANSFER_FIELDS
+    _fields = TRANSFER_FIELDS
+    _datetime_fields = tuple(TRANSFER_DATETIME_FIELDS)
+    _json_keys = _json_keys(TRANSFER_FIELDS)
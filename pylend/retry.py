@@ -0,0 +1,114 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import requests
+
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# Failures after which the server cannot have acted on the request: it was
+# refused before being read, or the connection was never established.
+SAFE_STATUS_CODES = [429]
+SAFE_EXCEPTIONS = (requests.exceptions.ConnectTimeout,)
+
+RETRYABLE_EXCEPTIONS = (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout)
+
+
+def _seconds(value):
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+def parse_retry_after(value, now=None):
+    # Retry-After is either a number of seconds or an HTTP date.
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class RetryPolicy:
+    def __init__(self,
+                 max_retries=3,
+                 backoff=timedelta(seconds=0.5),
+                 max_backoff=timedelta(seconds=30),
+                 status_codes=RETRYABLE_STATUS_CODES,
+                 exceptions=RETRYABLE_EXCEPTIONS,
+                 jitter=True,
+                 sleep=time.sleep,
+                 rng=random.random):
+        if max_retries is None or max_retries < 0:
+            raise ValueError('max_retries must be a non-negative integer')
+        self.max_retries = max_retries
+        self.backoff = _seconds(backoff)
+        self.max_backoff = _seconds(max_backoff)
+        self.status_codes = frozenset(status_codes)
+        self.exceptions = tuple(exceptions)
+        self.jitter = jitter
+        self.sleep = sleep
+        self.rng = rng
+
+    def safe(self):
+        # The same schedule, limited to failures that are known not to have
+        # reached the server; used for requests that must not be repeated.
+        return RetryPolicy(self.max_retries,
+                           self.backoff,
+                           self.max_backoff,
+                           self.status_codes.intersection(SAFE_STATUS_CODES),
+                           [exception for exception in SAFE_EXCEPTIONS
+                            if issubclass(exception, self.exceptions)],
+                           self.jitter,
+                           self.sleep,
+                           self.rng)
+
+    def retries_status(self, status_code):
+        return status_code in self.status_codes
+
+    def retries_exception(self, exception):
+        return isinstance(exception, self.exceptions)
+
+    def delay(self, attempt, retry_after=None):
+        # Returns None when the server asks for a longer wait than the policy
+        # allows, in which case the failure is reported instead.
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            delay *= self.rng()
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+DEFAULT_RETRY_POLICIES = \
+    {
+        'GET': RetryPolicy(),
+        'POST': RetryPolicy(status_codes=SAFE_STATUS_CODES,
+                            exceptions=SAFE_EXCEPTIONS)
+    }
+
+
+class HedgePolicy:
+    def __init__(self,
+                 delay=timedelta(seconds=1.0),
+                 resources=('loans/listing',)):
+        if delay is None or _seconds(delay) < 0:
+            raise ValueError('delay must be a non-negative duration')
+        self.delay = _seconds(delay)
+        self.resources = frozenset(resources)
+
+    def applies_to(self, method, resource):
+        return method == 'GET' and resource in self.resources
@@ -0,0 +1,257 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .orders import create_orders
+from .table import LoanTable, _require_numpy, np
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = None
+    shared_memory = None
+
+# Shards smaller than this are not worth a round trip to a worker.
+DEFAULT_MIN_SHARD_SIZE = 256
+
+# Free-text fields are not passed to scoring functions unless asked for:
+# string columns are shared as fixed-width arrays, sized by their longest
+# value, so a single long description would multiply the shared memory.
+FREE_TEXT_FIELDS = \
+    [
+        'desc',
+        'empTitle'
+    ]
+
+
+def _require_shared_memory():
+    if shared_memory is None:
+        raise ImportError('LoanScorer requires multiprocessing.shared_memory '
+                          '(Python 3.8 or later)')
+
+
+def _shareable_column(column):
+    # Numeric columns are shared as they are. String columns become
+    # fixed-width unicode arrays (a missing string reads as ''), and columns
+    # holding anything else stay in the parent process.
+    if column.dtype != object:
+        return column
+    values = column.tolist()
+    if all(value is None or type(value) is str for value in values):
+        return np.array(['' if value is None else value for value in values],
+                        dtype=str)
+    if all(type(value) is bool for value in values):
+        return np.array(values, dtype=bool)
+    return None
+
+
+def _check_scores(scores, count):
+    scores = np.array(scores, dtype=np.float64)
+    if scores.shape != (count,):
+        raise ValueError('score must return one score per loan; got {0} '
+                         'scores for {1} loans'.format(scores.size, count))
+    return scores
+
+
+def _attach(name, dtype, length, start, stop):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray((length,), dtype, block.buf)[start:stop]
+
+
+def _score_shard(score, columns, start, stop, as_of_date):
+    blocks = []
+    table = None
+    try:
+        arrays = {}
+        for field, name, dtype, length in columns:
+            block, arrays[field] = _attach(name, dtype, length, start, stop)
+            blocks.append(block)
+        table = LoanTable(arrays, as_of_date)
+        arrays = None
+        return _check_scores(score(table), stop - start)
+    finally:
+        table = None
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # The scoring function kept a view of the shard; the
+                # mapping is released when that view is collected.
+                pass
+
+
+def _ready():
+    return os.getpid()
+
+
+class ScoredLoans:
+    def __init__(self, loans, scores):
+        self.loans = loans
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __iter__(self):
+        return iter(zip(self.loans, self.scores.tolist()))
+
+    def __repr__(self):
+        fmt = "ScoredLoans: {0} loans, best score {1}"
+        return fmt.format(len(self),
+                          self.scores[0] if len(self) > 0 else None)
+
+    def top(self, count):
+        return ScoredLoans(self.loans.select(slice(0, count)),
+                           self.scores[:count])
+
+    def above(self, min_score):
+        # Scores are in descending order, so this is a prefix.
+        keep = int(np.count_nonzero(self.scores >= min_score))
+        return self.top(keep)
+
+    def create_orders(self,
+                      amount,
+                      budget=None,
+                      available_cash=None,
+                      portfolio_id=None):
+        # Loans are funded best score first until the budget runs out.
+        return create_orders(self.loans,
+                             amount,
+                             budget,
+                             available_cash,
+                             portfolio_id)
+
+
+class LoanScorer:
+    __score = None
+    __processes = None
+    __min_shard_size = None
+    __fields = None
+    __executor = None
+    __logger = None
+
+    def __init__(self,
+                 score,
+                 processes=None,
+                 min_shard_size=DEFAULT_MIN_SHARD_SIZE,
+                 fields=None):
+        # score is called with a LoanTable holding a shard of the listing
+        # and returns one number per loan, higher being better. It runs in
+        # worker processes, so it must be picklable (a module-level function
+        # or an instance of a module-level class). fields limits the columns
+        # it sees; by default every column but FREE_TEXT_FIELDS is passed.
+        _require_numpy()
+        _require_shared_memory()
+        if score is None:
+            raise ValueError('score must be a callable scoring function')
+        if processes is not None and processes < 1:
+            raise ValueError('processes must be a positive integer')
+        if min_shard_size is None or min_shard_size < 1:
+            raise ValueError('min_shard_size must be a positive integer')
+        self.__score = score
+        self.__processes = processes or os.cpu_count() or 1
+        self.__min_shard_size = min_shard_size
+        self.__fields = None if fields is None else list(fields)
+        self.__logger = logging.getLogger('pylend')
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def prewarm(self):
+        # Starts the worker processes ahead of the first listing, so that
+        # scoring at drop time does not pay for process startup.
+        executor = self._get_executor()
+        futures = [executor.submit(_ready) for _ in range(self.__processes)]
+        for future in futures:
+            future.result()
+
+    def score(self, loans):
+        table = loans if isinstance(loans, LoanTable) \
+            else LoanTable.from_loans(list(loans))
+        count = len(table)
+        if count == 0:
+            return ScoredLoans(table, np.empty(0, dtype=np.float64))
+        columns = self._shareable_columns(table)
+        shards = min(self.__processes,
+                     max(1, count // self.__min_shard_size))
+        if shards <= 1:
+            # The scoring function sees the same columns it would in a
+            # worker.
+            scores = _check_scores(
+                self.__score(LoanTable(columns, table.as_of_date)),
+                count)
+        else:
+            scores = self._score_in_pool(columns, count, table.as_of_date,
+                                         shards)
+
+        # Highest score first; equal scores keep their listing order and
+        # NaN scores go last.
+        order = np.argsort(-scores, kind='stable')
+        return ScoredLoans(table.select(order), scores[order])
+
+    def _shareable_columns(self, table):
+        if self.__fields is None:
+            fields = [field for field in table.fields
+                      if field not in FREE_TEXT_FIELDS]
+        else:
+            fields = [field for field in self.__fields if field in table]
+        columns = {}
+        for field in fields:
+            column = _shareable_column(table[field])
+            if column is None:
+                self.__logger.debug('Column {0} is not passed to the scoring '
+                                    'function'.format(field))
+            else:
+                columns[field] = column
+        return columns
+
+    def _score_in_pool(self, columns, count, as_of_date, shards):
+        # Each column is copied once into shared memory; workers map it and
+        # read their shard's rows in place.
+        blocks = []
+        try:
+            shared = []
+            for field, column in columns.items():
+                block = shared_memory.SharedMemory(
+                    create=True,
+                    size=max(1, column.nbytes))
+                blocks.append(block)
+                np.ndarray(column.shape, column.dtype, block.buf)[:] = column
+                shared.append((field, block.name, column.dtype.str, count))
+
+            bounds = [count * shard // shards for shard in range(shards + 1)]
+            executor = self._get_executor()
+            futures = [executor.submit(_score_shard,
+                                       self.__score,
+                                       shared,
+                                       start,
+                                       stop,
+                                       as_of_date)
+                       for start, stop in zip(bounds, bounds[1:])]
+            return np.concatenate([future.result() for future in futures])
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _get_executor(self):
+        if self.__executor is None:
+            # On POSIX, workers must share this process's resource tracker;
+            # one they started themselves would unlink the shared columns
+            # when they exit.
+            if os.name == 'posix':
+                resource_tracker.ensure_running()
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.__processes)
+        return self.__executor
@@ -0,0 +1,97 @@
+import codecs
+import json
+
+_DECODER = json.JSONDecoder()
+# Values that end with their own closing character.
+_DELIMITED = '{["'
+_WHITESPACE = ' \t\n\r'
+_TERMINATORS = frozenset(',]}:' + _WHITESPACE)
+
+
+class _ChunkReader:
+    # Holds only the unconsumed tail of the body; everything before the
+    # value currently being read is dropped as soon as it has been decoded.
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+
+    def fill(self):
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                chunk = self.decoder.decode(chunk)
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and \
+                    self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError('Expected {0!r} in JSON stream, found {1!r}'
+                             .format(char, found))
+        self.pos += 1
+
+    def read_value(self):
+        # Values are decoded by the C scanner straight out of the buffer; a
+        # decode that runs off the end of the buffer is retried once more of
+        # the body has arrived.
+        while True:
+            if self.peek() is None:
+                raise ValueError('Unexpected end of JSON stream')
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            if self.buffer[self.pos] not in _DELIMITED and \
+                    self.buffer[end:end + 1] not in _TERMINATORS and \
+                    self.fill():
+                # A number or literal may continue in the next chunk.
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks, key, fields=None):
+    # Yields the elements of the array stored under key in a top-level JSON
+    # object, decoding each one as soon as its closing bracket arrives. Other
+    # top-level members are decoded whole and, if fields is given, stored in
+    # it.
+    reader = _ChunkReader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.read_value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() != ']':
+                while True:
+                    yield reader.read_value()
+                    if reader.peek() != ',':
+                        break
+                    reader.expect(',')
+            reader.expect(']')
+        else:
+            value = reader.read_value()
+            if fields is not None:
+                fields[name] = value
+        if reader.peek() != ',':
+            break
+        reader.expect(',')
+    reader.expect('}')
@@ -0,0 +1,118 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .exceptions import RequestRejectedException
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+
+class FailedChunk:
+    def __init__(self, orders, exception):
+        self.orders = orders
+        self.exception = exception
+
+    def __repr__(self):
+        return 'FailedChunk of {0} orders: {1!r}'.format(len(self.orders),
+                                                         self.exception)
+
+
+class OrderSubmissionReport:
+    def __init__(self):
+        self.order_instruct_ids = []
+        self.confirmations = []
+        self.failed_chunks = []
+        self.attempts = 0
+
+    @property
+    def failed_orders(self):
+        return [order for chunk in self.failed_chunks
+                for order in chunk.orders]
+
+    @property
+    def succeeded(self):
+        return len(self.failed_chunks) == 0
+
+    def _add_response(self, response):
+        if 'orderInstructId' in response:
+            self.order_instruct_ids.append(response['orderInstructId'])
+        self.confirmations.extend(response.get('orderConfirmations', []))
+
+    def __repr__(self):
+        fmt = "OrderSubmissionReport: {0} confirmations, {1} failed orders"
+        return fmt.format(len(self.confirmations), len(self.failed_orders))
+
+
+def _chunk(orders, chunk_size):
+    return [orders[i:i + chunk_size]
+            for i in range(0, len(orders), chunk_size)]
+
+
+def _is_retryable(exception):
+    # Only a chunk that the API rejected, or that never reached the server,
+    # may be resent: after a server error, a reset or a read timeout the
+    # orders may already have been placed.
+    from .retry import SAFE_EXCEPTIONS
+    return isinstance(exception, (RequestRejectedException,) +
+                      SAFE_EXCEPTIONS)
+
+
+def _retry_chunks(failed_chunks):
+    # A rejected request may be caused by a single bad order, so rejected
+    # chunks are halved to let the good orders through on the next attempt.
+    chunks = []
+    for failed in failed_chunks:
+        orders = failed.orders
+        if isinstance(failed.exception, RequestRejectedException) and \
+                len(orders) > 1:
+            middle = len(orders) // 2
+            chunks.extend([orders[:middle], orders[middle:]])
+        else:
+            chunks.append(orders)
+    return chunks
+
+
+def submit_in_chunks(submit,
+                     orders,
+                     chunk_size=DEFAULT_CHUNK_SIZE,
+                     max_workers=DEFAULT_MAX_WORKERS,
+                     retries=1):
+    if orders is None or len(orders) == 0:
+        raise ValueError(
+            'orders must be non-None and contain at least one LoanOrder')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+    if max_workers < 1:
+        raise ValueError('max_workers must be a positive integer')
+
+    logger = logging.getLogger('pylend')
+    report = OrderSubmissionReport()
+    chunks = _chunk(list(orders), chunk_size)
+
+    def submit_chunk(chunk):
+        try:
+            return chunk, submit(chunk), None
+        except Exception as e:
+            return chunk, None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for attempt in range(retries + 1):
+            report.attempts += 1
+            retryable = []
+            for chunk, response, exception in executor.map(submit_chunk,
+                                                          chunks):
+                if exception is None:
+                    report._add_response(response)
+                    continue
+                logger.warning('Order chunk of {0} failed: {1!r}'
+                               .format(len(chunk), exception))
+                failed = FailedChunk(chunk, exception)
+                if _is_retryable(exception):
+                    retryable.append(failed)
+                else:
+                    report.failed_chunks.append(failed)
+            if not retryable or attempt == retries:
+                break
+            chunks = _retry_chunks(retryable)
+
+    report.failed_chunks.extend(retryable)
+    return report
@@ -0,0 +1,159 @@
+from .datetimes import (DATETIME_ARROW,
+                        DATETIME_EPOCH,
+                        parse_datetime,
+                        to_epoch)
+from .loans import LOAN_DATETIME_FIELDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOAN_INTEGER_FIELDS = \
+    [
+        'id',
+        'memberId',
+        'term'
+    ]
+
+# Marks a missing date in an int64 epoch column.
+MISSING_EPOCH = -2 ** 63
+
+_NUMBER_TYPES = (int, float)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('LoanTable requires numpy; '
+                          'install it with "pip install pylend[numpy]"')
+
+
+def _is_numeric(values):
+    for value in values:
+        if value is not None and type(value) not in _NUMBER_TYPES:
+            return False
+    return True
+
+
+def _build_column(field, values):
+    if field in LOAN_DATETIME_FIELDS:
+        return np.array([MISSING_EPOCH if value is None else to_epoch(value)
+                         for value in values], dtype=np.int64)
+    if not _is_numeric(values):
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    # Integer columns stay integers unless a null forces them to NaN.
+    if None not in values and (field in LOAN_INTEGER_FIELDS or
+                               all(type(value) is int for value in values)):
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    return np.array(values, dtype=np.float64)
+
+
+def _to_python(field, column, datetime_mode):
+    values = column.tolist()
+    if column.dtype == np.float64:
+        return [None if value != value else value for value in values]
+    if field in LOAN_DATETIME_FIELDS:
+        if datetime_mode == DATETIME_EPOCH:
+            return [None if value == MISSING_EPOCH else value
+                    for value in values]
+        return [None if value == MISSING_EPOCH else parse_datetime(value)
+                for value in values]
+    return values
+
+
+class LoanTable:
+    __columns = None
+    __rows = None
+    __as_of_date = None
+
+    def __init__(self, columns, as_of_date=None, rows=None):
+        _require_numpy()
+        self.__columns = columns
+        self.__as_of_date = as_of_date
+        self.__rows = rows
+
+    @classmethod
+    def from_loans(cls, loans, as_of_date=None):
+        _require_numpy()
+        fields = []
+        seen = set()
+        for loan in loans:
+            for field in loan:
+                if field not in seen:
+                    seen.add(field)
+                    fields.append(field)
+
+        columns = {}
+        for field in fields:
+            columns[field] = _build_column(
+                field,
+                [loan.get(field) for loan in loans])
+        return cls(columns, as_of_date)
+
+    @classmethod
+    def from_payload(cls, json_payload):
+        as_of_date = json_payload.get('asOfDate')
+        return cls.from_loans(json_payload.get('loans', []),
+                              to_epoch(as_of_date))
+
+    @property
+    def as_of_date(self):
+        return self.__as_of_date
+
+    @property
+    def fields(self):
+        return list(self.__columns)
+
+    @property
+    def nbytes(self):
+        # The size of the column buffers. An object column counts one
+        # pointer per row; the strings and other objects it refers to are
+        # not included.
+        return sum(self[field].nbytes for field in self.__columns)
+
+    def __len__(self):
+        if self.__rows is not None:
+            return len(self.__rows)
+        for column in self.__columns.values():
+            return len(column)
+        return 0
+
+    def __contains__(self, field):
+        return field in self.__columns
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        return self.select(key)
+
+    def column(self, field):
+        column = self.__columns[field]
+        if self.__rows is None:
+            return column
+        return column[self.__rows]
+
+    def select(self, selector):
+        # The selection is stored as row indices over the shared columns;
+        # no column data is copied until a column is read.
+        rows = np.arange(len(self))[selector]
+        if self.__rows is not None:
+            rows = self.__rows[rows]
+        return LoanTable(self.__columns, self.__as_of_date, rows)
+
+    def to_dicts(self, datetime_mode=DATETIME_ARROW):
+        fields = self.fields
+        columns = [_to_python(field, self[field], datetime_mode)
+                   for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def __repr__(self):
+        return 'LoanTable with {0} loans and {1} fields'.format(
+            len(self), len(self.__columns))
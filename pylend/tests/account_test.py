@@ -2,7 +2,11 @@ import arrow
 import json
 from .mock_connection import MockConnection
 from unittest import TestCase
-from pylend import Account, ExecutionFailureException
+from pylend import (Account,
+                    ExecutionFailureException,
+                    NoteRecord,
+                    TransferRecord)
+from pylend.loans import LoanOrder
 
 
 class AccountSetupTest(TestCase):
@@ -110,6 +114,30 @@ class PendingTransfersTest(TestCase):
         self.assertEquals("LOAD_ON_DAY_1_AND_16",
                           result[3]['frequency'])
 
+    def lazy_mode_still_converts_frequencies_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1, datetime_mode='lazy')
+
+        result = a.pending_transfers()
+
+        self.assertEquals("LOAD_WEEKLY", result[2]['frequency'])
+        self.assertEquals(arrow.get("2015-12-23T00:00:00.000-08:00"),
+                          result[0]['transferDate'])
+
+    def pending_transfer_records_are_normalized_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1)
+
+        result = a.pending_transfer_records()
+
+        self.assertIsInstance(result[0], TransferRecord)
+        self.assertEquals("LOAD_ONCE", result[0].frequency)
+        self.assertIsNone(result[0].endDate)
+
     def no_transfers_returns_empty_list_test(self):
         def callback(resource, api_version, query_params):
             return json.loads('{}')
@@ -179,6 +207,41 @@ class OwnedNotesTest(TestCase):
             arrow.get("2009-11-12T06:34:02.000-08:00"),
             result[0]['issueDate'])
 
+    def epoch_mode_converts_dates_to_integers_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1, datetime_mode='epoch')
+
+        result = a.owned_notes()
+        self.assertEquals(1258036442, result[0]['issueDate'])
+
+    def owned_note_records_are_typed_records_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1)
+
+        result = a.owned_note_records()
+
+        self.assertIsInstance(result[0], NoteRecord)
+        self.assertEquals(22222, result[0].noteId)
+        self.assertEquals(
+            arrow.get("2009-11-12T06:34:02.000-08:00"),
+            result[0].issueDate)
+
+    def owned_notes_payload_is_returned_as_received_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEquals('accounts/1/detailednotes', resource)
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1)
+
+        result = a.owned_notes_payload(detailed_info=True)
+
+        self.assertEquals("2009-11-12T06:34:02.000-08:00",
+                          result['myNotes'][0]['issueDate'])
+
     def detailed_info_requests_data_from_detailednotes_test(self):
         def callback(resource, api_version, query_params):
             self.assertEquals('accounts/1/detailednotes', resource)
@@ -199,6 +262,27 @@ class OwnedNotesTest(TestCase):
         self.assertEquals(list, type(result))
         self.assertEquals(0, len(result))
 
+    def stream_yields_normalized_notes_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEquals('accounts/1/detailednotes', resource)
+            return json.loads(self.__VALID_RESULT)
+        connection = MockConnection(callback)
+        a = Account(connection, 1, datetime_mode='epoch')
+
+        result = list(a.owned_notes(detailed_info=True, stream=True))
+
+        self.assertEquals([22222, 55555], [n['noteId'] for n in result])
+        self.assertEquals(1258036442, result[0]['issueDate'])
+
+    def stream_with_error_block_raises_exception_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads('{"errors": [{"message": "foo"}]}')
+        connection = MockConnection(callback)
+        a = Account(connection, 1)
+
+        with self.assertRaises(ExecutionFailureException):
+            list(a.owned_notes(stream=True))
+
 
 class PortfoliosTest(TestCase):
     __VALID_RESULT = """
@@ -241,3 +325,25 @@ class PortfoliosTest(TestCase):
 
         self.assertEquals(list, type(result))
         self.assertEquals(0, len(result))
+
+
+class SubmitOrdersTest(TestCase):
+    def orders_are_posted_in_wire_form_test(self):
+        def callback(resource, body, api_version, query_params):
+            self.assertEquals('accounts/1/orders', resource)
+            self.assertEquals(
+                {'aid': 1,
+                 'orders': [{'loanId': 5, 'requestedAmount': 25},
+                            {'loanId': 6, 'requestedAmount': 50,
+                             'portfolioId': 7}]},
+                body)
+            return {'orderInstructId': 1}
+        a = Account(MockConnection(post_callback=callback), 1)
+
+        a.submit_orders([LoanOrder(5, 25), LoanOrder(6, 50, 7)])
+
+    def no_orders_raises_exception_test(self):
+        a = Account(MockConnection(), 1)
+
+        with self.assertRaises(ValueError):
+            a.submit_orders([])
@@ -0,0 +1,62 @@
+import arrow
+import json
+from .mock_connection import MockAsyncConnection, run_async
+from unittest import TestCase
+from pylend import AsyncAccount, ExecutionFailureException
+from pylend.loans import LoanOrder
+
+
+class AsyncAccountTest(TestCase):
+    def init_raises_exception_with_bad_params_test(self):
+        with self.assertRaises(ValueError):
+            AsyncAccount(None, 1)
+        with self.assertRaises(ValueError):
+            AsyncAccount(MockAsyncConnection(), None)
+
+    def json_with_error_block_raises_exception_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads('{"errors": "foo"}')
+        a = AsyncAccount(MockAsyncConnection(callback), 1)
+
+        with self.assertRaises(ExecutionFailureException):
+            run_async(a.available_cash())
+
+    def pending_transfers_are_normalized_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEqual('accounts/1/funds/pending', resource)
+            return json.loads("""{"transfers": [
+                {"transferDate": "2015-12-23T00:00:00.000-08:00",
+                 "frequency": "Weekly", "endDate": null}]}""")
+        a = AsyncAccount(MockAsyncConnection(callback), 1)
+
+        result = run_async(a.pending_transfers())
+
+        self.assertEqual('LOAD_WEEKLY', result[0]['frequency'])
+        self.assertEqual(arrow.get("2015-12-23T00:00:00.000-08:00"),
+                         result[0]['transferDate'])
+
+    def detailed_info_requests_data_from_detailednotes_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEqual('accounts/1/detailednotes', resource)
+            return json.loads('{}')
+        a = AsyncAccount(MockAsyncConnection(callback), 1)
+
+        self.assertEqual([], run_async(a.owned_notes(detailed_info=True)))
+
+    def submit_orders_posts_order_body_test(self):
+        def callback(resource, body, api_version, query_params):
+            self.assertEqual('accounts/1/orders', resource)
+            self.assertEqual(
+                {'aid': 1,
+                 'orders': [{'loanId': 5, 'requestedAmount': 25}]},
+                body)
+            return {'orderInstructId': 1}
+        a = AsyncAccount(MockAsyncConnection(post_callback=callback), 1)
+
+        run_async(a.submit_orders([LoanOrder(5, 25)]))
+
+    def submit_orders_requires_orders_test(self):
+        a = AsyncAccount(MockAsyncConnection(), 1)
+
+        with self.assertRaises(ValueError):
+            run_async(a.submit_orders([]))
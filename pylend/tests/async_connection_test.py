@@ -0,0 +1,95 @@
+import asyncio
+from datetime import timedelta
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+from .mock_connection import run_async
+from pylend import (AsyncConnection,
+                    AuthorizationException,
+                    ResourceNotFoundException)
+from pylend.async_connection import aiohttp
+
+
+class MockAsyncResponse:
+
+    def __init__(self, url, status, text):
+        self.url = url
+        self.status = status
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def text(self):
+        return self._text
+
+
+@skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncConnectionTest(TestCase):
+    def passing_None_for_api_key_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            AsyncConnection(api_key=None)
+
+    @patch('aiohttp.ClientSession.request')
+    def ok_returns_decoded_json_test(self, request_patch):
+        request_patch.return_value = MockAsyncResponse(
+            'foo', 200, '{"availableCash": 1.5}')
+
+        async def run():
+            async with AsyncConnection(api_key="testkey") as c:
+                return await c.get("foo", query_params={'showAll': True})
+
+        self.assertEqual({'availableCash': 1.5}, run_async(run()))
+        self.assertEqual({'showAll': 'True'},
+                         request_patch.call_args[1]['params'])
+
+    @patch('aiohttp.ClientSession.request')
+    def post_sends_json_body_test(self, request_patch):
+        request_patch.return_value = MockAsyncResponse('foo', 200, '{}')
+
+        async def run():
+            async with AsyncConnection(api_key="testkey", codec='json') as c:
+                await c.post("foo", {'aid': 1})
+
+        run_async(run())
+        self.assertEqual('POST', request_patch.call_args[0][0])
+        self.assertEqual('{"aid": 1}', request_patch.call_args[1]['data'])
+
+    @patch('aiohttp.ClientSession.request')
+    def error_status_codes_raise_exceptions_test(self, request_patch):
+        async def run():
+            async with AsyncConnection(api_key="testkey") as c:
+                await c.get("foo")
+
+        request_patch.return_value = MockAsyncResponse('foo', 401, '')
+        with self.assertRaises(AuthorizationException):
+            run_async(run())
+
+        request_patch.return_value = MockAsyncResponse('foo', 404, '')
+        with self.assertRaises(ResourceNotFoundException):
+            run_async(run())
+
+    @patch('aiohttp.ClientSession.request')
+    def concurrent_requests_are_spaced_by_request_delay_test(
+            self,
+            request_patch):
+        request_patch.side_effect = \
+            lambda *args, **kwargs: MockAsyncResponse('foo', 200, '{}')
+        loop_times = []
+
+        async def run():
+            loop = asyncio.get_event_loop()
+            async with AsyncConnection(
+                    api_key="testkey",
+                    request_delay=timedelta(seconds=0.05)) as c:
+
+                async def timed_get():
+                    await c.get("foo")
+                    loop_times.append(loop.time())
+                await asyncio.gather(timed_get(), timed_get(), timed_get())
+
+        run_async(run())
+        loop_times.sort()
+        self.assertGreaterEqual(loop_times[2] - loop_times[0], 0.09)
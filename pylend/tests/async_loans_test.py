@@ -0,0 +1,41 @@
+import arrow
+import json
+from .loans_test import VALID_RESPONSE_TEXT
+from .mock_connection import MockAsyncConnection, run_async
+from unittest import TestCase
+from pylend import AsyncLoans, ExecutionFailureException
+
+
+class AsyncLoanTest(TestCase):
+    def init_raises_exception_with_bad_params_test(self):
+        with self.assertRaises(ValueError):
+            AsyncLoans(None)
+
+    def correctly_passes_showAll_param_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEqual('loans/listing', resource)
+            self.assertEqual({'showAll': True}, query_params)
+            return json.loads(VALID_RESPONSE_TEXT)
+        l = AsyncLoans(MockAsyncConnection(callback))
+
+        run_async(l.listed_loans(get_all_loans=True))
+
+    def json_with_error_block_raises_exception_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads('{"errors": "foo"}')
+        l = AsyncLoans(MockAsyncConnection(callback))
+
+        with self.assertRaises(ExecutionFailureException):
+            run_async(l.listed_loans())
+
+    def verify_loan_datetimes_converted_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+        l = AsyncLoans(MockAsyncConnection(callback))
+
+        result = run_async(l.listed_loans())
+
+        self.assertEqual(arrow.get("2014-09-03T14:41:53.959-07:00"),
+                         result['asOfDate'])
+        self.assertEqual(arrow.get("2014-08-25T10:50:20.000-07:00"),
+                         result['loans'][0]['listD'])
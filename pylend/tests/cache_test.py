@@ -0,0 +1,215 @@
+import threading
+import time
+from .mock_connection import MockConnection
+from unittest import TestCase
+from pylend import Account, ResponseCache
+from pylend.loans import LoanOrder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingConnection(MockConnection):
+    def __init__(self):
+        MockConnection.__init__(self,
+                                self.handle_get,
+                                lambda *args: {'orderInstructId': 1})
+        self.calls = []
+
+    def handle_get(self, resource, api_version, query_params):
+        self.calls.append(resource)
+        return {'availableCash': float(len(self.calls)),
+                'myPortfolios': []}
+
+
+class ResponseCacheTest(TestCase):
+    def invalid_max_entries_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            ResponseCache(max_entries=0)
+
+    def values_are_cached_until_their_ttl_expires_test(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttls={'availablecash': 1.0}, clock=clock)
+        connection = CountingConnection()
+        a = Account(connection, 1, cache=cache)
+
+        first = a.available_cash()
+        clock.now = 0.5
+        second = a.available_cash()
+        clock.now = 1.5
+        third = a.available_cash()
+
+        self.assertIs(first, second)
+        self.assertEqual(2.0, third['availableCash'])
+        self.assertEqual(2, len(connection.calls))
+        self.assertEqual(1, cache.hits)
+
+    def resources_without_ttl_are_not_cached_test(self):
+        cache = ResponseCache(ttls={'availablecash': None})
+        connection = CountingConnection()
+        a = Account(connection, 1, cache=cache)
+
+        a.available_cash()
+        a.available_cash()
+
+        self.assertEqual(2, len(connection.calls))
+
+    def least_recently_used_entries_are_evicted_test(self):
+        cache = ResponseCache(max_entries=2)
+        connection = CountingConnection()
+        a = Account(connection, 1, cache=cache)
+
+        a.available_cash()
+        a.portfolios()
+        a.available_cash()
+        a.account_summary()
+        a.available_cash()
+        a.portfolios()
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(
+            ['accounts/1/availablecash', 'accounts/1/portfolios',
+             'accounts/1/summary', 'accounts/1/portfolios'],
+            connection.calls)
+
+    def accounts_sharing_a_cache_do_not_collide_test(self):
+        cache = ResponseCache()
+        connection = CountingConnection()
+
+        Account(connection, 1, cache=cache).available_cash()
+        Account(connection, 2, cache=cache).available_cash()
+
+        self.assertEqual(['accounts/1/availablecash',
+                          'accounts/2/availablecash'], connection.calls)
+
+    def submitting_orders_invalidates_available_cash_test(self):
+        cache = ResponseCache()
+        connection = CountingConnection()
+        a = Account(connection, 1, cache=cache)
+
+        a.available_cash()
+        a.portfolios()
+        a.submit_orders([LoanOrder(1, 25)])
+        a.available_cash()
+        a.portfolios()
+
+        self.assertEqual(['accounts/1/availablecash',
+                          'accounts/1/portfolios',
+                          'accounts/1/availablecash'], connection.calls)
+
+    def creating_a_portfolio_invalidates_portfolios_test(self):
+        cache = ResponseCache()
+        connection = CountingConnection()
+        a = Account(connection, 1, cache=cache)
+
+        a.portfolios()
+        a.create_portfolio('Portfolio1')
+        a.portfolios()
+
+        self.assertEqual(2, connection.calls.count('accounts/1/portfolios'))
+
+    def reads_after_a_write_do_not_join_earlier_loads_test(self):
+        cache = ResponseCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def callback(resource, api_version, query_params):
+            calls.append(resource)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+                return {'availableCash': 100.0}
+            return {'availableCash': 75.0}
+        a = Account(MockConnection(callback,
+                                   lambda *args: {'orderInstructId': 1}),
+                    1,
+                    cache=cache)
+        stale = []
+        reader = threading.Thread(
+            target=lambda: stale.append(a.available_cash()))
+        reader.start()
+        started.wait(5)
+
+        a.submit_orders([LoanOrder(1, 25)])
+        fresh = a.available_cash()
+        release.set()
+        reader.join()
+
+        self.assertEqual(100.0, stale[0]['availableCash'])
+        self.assertEqual(75.0, fresh['availableCash'])
+        self.assertEqual(75.0, a.available_cash()['availableCash'])
+        self.assertEqual(2, len(calls))
+
+    def writes_do_not_discard_loads_of_other_resources_test(self):
+        cache = ResponseCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def callback(resource, api_version, query_params):
+            calls.append(resource)
+            started.set()
+            release.wait(5)
+            return {'myPortfolios': []}
+        a = Account(MockConnection(callback), 1, cache=cache)
+        b = Account(MockConnection(post_callback=lambda *args: {}),
+                    2,
+                    cache=cache)
+        reader = threading.Thread(target=a.portfolios)
+        reader.start()
+        started.wait(5)
+
+        b.create_portfolio('Portfolio1')
+        release.set()
+        reader.join()
+        a.portfolios()
+
+        self.assertEqual(1, len(calls))
+
+    def concurrent_identical_requests_are_coalesced_test(self):
+        cache = ResponseCache()
+        release = threading.Event()
+        calls = []
+
+        def callback(resource, api_version, query_params):
+            calls.append(resource)
+            release.wait(5)
+            return {'availableCash': 1.0}
+        a = Account(MockConnection(callback), 1, cache=cache)
+        results = []
+
+        threads = [threading.Thread(
+            target=lambda: results.append(a.available_cash()))
+            for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while cache.misses + cache.coalesced < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(4, cache.coalesced)
+        self.assertEqual(5, len(results))
+
+    def failures_are_shared_and_not_cached_test(self):
+        cache = ResponseCache()
+        calls = []
+
+        def callback(resource, api_version, query_params):
+            calls.append(resource)
+            return {'errors': 'foo'}
+        a = Account(MockConnection(callback), 1, cache=cache)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                a.available_cash()
+
+        self.assertEqual(2, len(calls))
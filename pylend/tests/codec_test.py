@@ -0,0 +1,41 @@
+from unittest import TestCase, skipIf
+from pylend.codec import (CODEC_JSON,
+                          JsonCodec,
+                          OrjsonCodec,
+                          available_codecs,
+                          get_codec,
+                          orjson)
+
+
+class CodecTest(TestCase):
+    def default_codec_is_the_first_available_test(self):
+        self.assertEqual(available_codecs()[0], get_codec().name)
+        self.assertEqual(CODEC_JSON, available_codecs()[-1])
+
+    def codecs_can_be_chosen_by_name_or_object_test(self):
+        codec = JsonCodec()
+
+        self.assertIsInstance(get_codec('json'), JsonCodec)
+        self.assertIs(codec, get_codec(codec))
+
+    def unknown_codec_name_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+
+    def codecs_round_trip_payloads_test(self):
+        payload = {'aid': 1,
+                   'orders': [{'loanId': 2, 'requestedAmount': 25.0}],
+                   'name': 'café'}
+        for name in available_codecs():
+            codec = get_codec(name)
+            encoded = codec.dumps(payload)
+            if isinstance(encoded, str):
+                encoded = encoded.encode('utf-8')
+
+            self.assertEqual(payload, codec.loads(encoded))
+            self.assertEqual(payload, codec.loads(encoded.decode('utf-8')))
+
+    @skipIf(orjson is not None, 'orjson is installed')
+    def missing_orjson_raises_ImportError_test(self):
+        with self.assertRaises(ImportError):
+            OrjsonCodec()
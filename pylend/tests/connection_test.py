@@ -1,6 +1,14 @@
+import json
+import logging
+import threading
+import time
 from unittest import TestCase
+from datetime import timedelta
 from unittest.mock import patch
-from pylend import Connection
+from pylend import Connection, NullRateLimiter
+from pylend.account import _orders_body
+from pylend.loans import LoanOrder
+from pylend.transport import Transport
 from requests import Response
 from pylend import (AuthorizationException,
                     ResourceNotFoundException,
@@ -13,13 +21,14 @@ class MockResponse:
         self.url = url
         self.status_code = status_code
         self.json_text = json_text
+        self.content = json.dumps(json_text).encode('utf-8')
 
     def json(self):
         return self.json_text
 
 
 class ConnectionTest(TestCase):
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def bad_authentication_raises_AuthorizationException_test(
             self,
             requests_get_patch):
@@ -39,7 +48,7 @@ class ConnectionTest(TestCase):
         with self.assertRaises(AuthorizationException):
             c.get("foo")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def server_error_raises_ExecutionFailureException_test(
             self,
             requests_get_patch):
@@ -52,7 +61,7 @@ class ConnectionTest(TestCase):
         with self.assertRaises(ExecutionFailureException):
             c.get("foo")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def not_found_raises_ExecutionFailureException_test(
             self,
             requests_get_patch):
@@ -65,7 +74,7 @@ class ConnectionTest(TestCase):
         with self.assertRaises(ResourceNotFoundException):
             c.get("foo")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def ok_raises_no_exception_test(
             self,
             requests_get_patch):
@@ -76,7 +85,7 @@ class ConnectionTest(TestCase):
 
         c.get("foo")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def bad_request_raises_no_exception_test(
             self,
             requests_get_patch):
@@ -91,7 +100,7 @@ class ConnectionTest(TestCase):
         with self.assertRaises(ValueError):
             Connection(api_key=None)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def ok_post_raises_no_exception_test(
             self,
             requests_post_patch):
@@ -100,4 +109,244 @@ class ConnectionTest(TestCase):
         requests_post_patch.return_value = response
         c = Connection(api_key="testkey")
 
-        c.post("foo", "bar")
\ No newline at end of file
+        c.post("foo", "bar")
+
+class PrewarmTransport(Transport):
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def prewarm(self, uri, headers):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+
+
+class CountingRateLimiter(NullRateLimiter):
+
+    def __init__(self):
+        self.acquired = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            self.acquired += 1
+        return 0.0
+
+
+class ConnectionPoolTest(TestCase):
+    @patch('requests.Session.get', autospec=True)
+    def requests_are_issued_on_one_session_test(
+            self,
+            requests_get_patch):
+
+        requests_get_patch.return_value = MockResponse('foo', 200, '')
+        c = Connection(api_key="testkey",
+                       request_delay=timedelta(seconds=0))
+
+        c.get("foo")
+        c.get("bar")
+
+        sessions = set(id(call[0][0]) for call in
+                       requests_get_patch.call_args_list)
+        self.assertEqual(1, len(sessions))
+
+    @patch('requests.Session.get')
+    def disabling_keep_alive_sends_connection_close_test(
+            self,
+            requests_get_patch):
+
+        requests_get_patch.return_value = MockResponse('foo', 200, '')
+        c = Connection(api_key="testkey", keep_alive=False)
+
+        c.get("foo")
+
+        headers = requests_get_patch.call_args[1]['headers']
+        self.assertEqual('close', headers['Connection'])
+
+    @patch('requests.Session.head')
+    def prewarm_opens_connections_at_startup_test(
+            self,
+            requests_head_patch):
+
+        Connection(api_key="testkey", prewarm=True)
+
+        self.assertEqual(1, requests_head_patch.call_count)
+
+    def prewarm_sends_requests_concurrently_test(self):
+        transport = PrewarmTransport()
+        limiter = CountingRateLimiter()
+        c = Connection(api_key="testkey",
+                       pool_size=3,
+                       rate_limiter=limiter,
+                       transport=transport)
+
+        c.prewarm(connections=5)
+
+        self.assertEqual(3, transport.calls)
+        self.assertEqual(3, transport.max_in_flight)
+        self.assertEqual(3, limiter.acquired)
+
+    def prewarm_raises_rate_limiter_errors_without_hanging_test(self):
+        class FailingRateLimiter(CountingRateLimiter):
+            def acquire(self):
+                with self.lock:
+                    self.acquired += 1
+                    if self.acquired == 2:
+                        raise NotImplementedError()
+                return 0.0
+        transport = PrewarmTransport()
+        c = Connection(api_key="testkey",
+                       pool_size=3,
+                       rate_limiter=FailingRateLimiter(),
+                       transport=transport)
+        errors = []
+
+        def prewarm():
+            try:
+                c.prewarm(connections=3)
+            except NotImplementedError as e:
+                errors.append(e)
+        thread = threading.Thread(target=prewarm, daemon=True)
+        thread.start()
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, len(errors))
+        self.assertEqual(0, transport.calls)
+
+    def invalid_pool_size_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            Connection(api_key="testkey", pool_size=0)
+
+
+class ConnectionPostBodyTest(TestCase):
+    @patch('requests.Session.post')
+    def dict_bodies_are_json_encoded_test(self, requests_post_patch):
+        requests_post_patch.return_value = MockResponse('foo', 200, '')
+        c = Connection(api_key="testkey", codec='json')
+
+        c.post("foo", {'aid': 1})
+
+        self.assertEqual('{"aid": 1}', requests_post_patch.call_args[1]['data'])
+
+    @patch('requests.Session.post')
+    def string_bodies_are_sent_unchanged_test(self, requests_post_patch):
+        requests_post_patch.return_value = MockResponse('foo', 200, '')
+        c = Connection(api_key="testkey")
+
+        c.post("foo", '{"aid":1}')
+
+        self.assertEqual('{"aid":1}', requests_post_patch.call_args[1]['data'])
+
+    @patch('requests.Session.post')
+    def order_bodies_skip_the_codec_test(self, requests_post_patch):
+        requests_post_patch.return_value = MockResponse('foo', 200, '')
+        codec = CountingCodec()
+        c = Connection(api_key="testkey", codec=codec)
+
+        c.post("accounts/1/orders",
+               _orders_body(1, [LoanOrder(5, 25), LoanOrder(6, 50.0, 7)]))
+
+        self.assertEqual('{"aid":1,"orders":[{"loanId":5,"requestedAmount":25},'
+                         '{"loanId":6,"requestedAmount":50.0,"portfolioId":7}]}',
+                         requests_post_patch.call_args[1]['data'])
+        self.assertEqual(0, codec.dumps_calls)
+
+
+class CountingCodec:
+
+    def __init__(self):
+        self.dumps_calls = 0
+
+    def dumps(self, obj):
+        self.dumps_calls += 1
+        return json.dumps(obj)
+
+    def loads(self, data):
+        return json.loads(data.decode('utf-8'))
+
+
+class ConnectionCodecTest(TestCase):
+    @patch('requests.Session.get')
+    def responses_are_decoded_with_the_codec_test(self, requests_get_patch):
+        requests_get_patch.return_value = MockResponse('foo', 200, {'a': 1})
+        for codec in ['json', 'orjson', CountingCodec()]:
+            try:
+                c = Connection(api_key="testkey", codec=codec)
+            except ImportError:
+                continue
+
+            self.assertEqual({'a': 1}, c.get("foo"))
+
+    def unknown_codec_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            Connection(api_key="testkey", codec='yaml')
+
+    @patch('requests.Session.post')
+    def bodies_are_encoded_once_whatever_the_log_level_test(
+            self,
+            requests_post_patch):
+        requests_post_patch.return_value = MockResponse('foo', 200, '')
+        logger = logging.getLogger('pylend')
+        level = logger.level
+        try:
+            for log_level in [logging.INFO, logging.DEBUG]:
+                logger.setLevel(log_level)
+                codec = CountingCodec()
+                c = Connection(api_key="testkey", codec=codec)
+
+                c.post("foo", {'aid': 1})
+
+                self.assertEqual(1, codec.dumps_calls)
+                self.assertEqual(
+                    '{"aid": 1}',
+                    requests_post_patch.call_args[1]['data'])
+        finally:
+            logger.setLevel(level)
+
+
+class MockStreamResponse(MockResponse):
+
+    def __init__(self, url, status_code, chunks):
+        MockResponse.__init__(self, url, status_code, None)
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionStreamTest(TestCase):
+    @patch('requests.Session.get')
+    def get_stream_yields_body_chunks_test(self, requests_get_patch):
+        response = MockStreamResponse('foo', 200, [b'{"a"', b':1}'])
+        requests_get_patch.return_value = response
+        c = Connection(api_key="testkey")
+
+        chunks = list(c.get_stream("foo"))
+
+        self.assertEqual([b'{"a"', b':1}'], chunks)
+        self.assertTrue(requests_get_patch.call_args[1]['stream'])
+        self.assertTrue(response.closed)
+
+    @patch('requests.Session.get')
+    def get_stream_checks_status_before_reading_test(self,
+                                                     requests_get_patch):
+        response = Response()
+        response.status_code = 404
+        requests_get_patch.return_value = response
+        c = Connection(api_key="testkey")
+
+        with self.assertRaises(ResourceNotFoundException):
+            c.get_stream("foo")
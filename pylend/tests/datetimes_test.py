@@ -0,0 +1,102 @@
+from unittest import TestCase
+import arrow
+from pylend import DatetimeCache, datetime_cache
+from pylend.datetimes import to_epoch
+from pylend.loans import _normalize_loan
+
+TIMESTAMP = '2016-01-04T10:00:01.123-08:00'
+
+
+class DatetimeCacheTest(TestCase):
+    def repeated_values_are_parsed_once_test(self):
+        cache = DatetimeCache()
+        first = cache.parse(TIMESTAMP)
+        second = cache.parse(TIMESTAMP)
+
+        self.assertIs(first, second)
+        self.assertEqual(arrow.get(TIMESTAMP), first)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def least_recently_used_value_is_evicted_test(self):
+        cache = DatetimeCache(max_entries=2)
+        cache.parse('2016-01-01T00:00:00.000-08:00')
+        cache.parse('2016-01-02T00:00:00.000-08:00')
+        cache.parse('2016-01-01T00:00:00.000-08:00')
+        cache.parse('2016-01-03T00:00:00.000-08:00')
+
+        self.assertEqual(2, len(cache))
+        cache.parse('2016-01-01T00:00:00.000-08:00')
+        self.assertEqual(2, cache.hits)
+        cache.parse('2016-01-02T00:00:00.000-08:00')
+        self.assertEqual(4, cache.misses)
+
+    def zero_size_cache_does_not_store_test(self):
+        cache = DatetimeCache(max_entries=0)
+        cache.parse(TIMESTAMP)
+        cache.parse(TIMESTAMP)
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(2, cache.misses)
+
+    def resize_evicts_oldest_entries_test(self):
+        cache = DatetimeCache()
+        for day in range(1, 6):
+            cache.parse('2016-01-0{0}T00:00:00.000-08:00'.format(day))
+        cache.resize(2)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2, cache.max_entries)
+
+    def negative_size_raises_ValueError_test(self):
+        with self.assertRaises(ValueError):
+            DatetimeCache(max_entries=-1)
+
+    def normalizers_share_the_cache_test(self):
+        cache = datetime_cache()
+        cache.clear()
+        for loan_id in range(3):
+            _normalize_loan({'id': loan_id, 'listD': TIMESTAMP}, 'epoch')
+
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(2, cache.hits)
+
+    def clear_resets_counters_test(self):
+        cache = DatetimeCache()
+        cache.parse(TIMESTAMP)
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(0, cache.misses)
+
+
+class ApiTimestampTest(TestCase):
+    def colon_offsets_match_arrow_test(self):
+        value = '2014-08-25T10:56:29.000-07:00'
+        parsed = DatetimeCache().parse(value)
+
+        self.assertEqual(arrow.get(value), parsed)
+        self.assertEqual(arrow.get(value).utcoffset(), parsed.utcoffset())
+
+    def offsets_without_colon_match_arrow_test(self):
+        value = '2009-11-12T06:34:02.123-0800'
+        parsed = DatetimeCache().parse(value)
+
+        self.assertEqual(arrow.get(value), parsed)
+        self.assertEqual(arrow.get(value).utcoffset(), parsed.utcoffset())
+
+    def epochs_match_arrow_test(self):
+        for value in ('2014-08-25T10:56:29.000-07:00',
+                      '1965-03-01T00:00:00.500-0800',
+                      '2016-01-04T10:00:01.123+05:30'):
+            self.assertEqual(int(arrow.get(value).datetime.timestamp()),
+                             to_epoch(value))
+
+    def other_formats_fall_back_to_arrow_test(self):
+        for value in ('2014-08-25', '2014-08-25T10:56:29Z'):
+            self.assertEqual(arrow.get(value), DatetimeCache().parse(value))
+
+    def invalid_dates_raise_from_arrow_test(self):
+        with self.assertRaises(ValueError):
+            DatetimeCache().parse('2014-02-30T10:56:29.000-08:00')
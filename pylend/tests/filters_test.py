@@ -0,0 +1,146 @@
+import arrow
+from unittest import TestCase, skipIf
+from .table_test import listing
+from pylend import Field, LoanTable, evaluate_many, filter_many
+from pylend.filters import Comparison, _Columns
+from pylend.table import np
+
+
+@skipIf(np is None, 'numpy is not installed')
+class FieldExpressionTest(TestCase):
+    def create_loans(self):
+        return listing()['loans']
+
+    def comparisons_build_masks_test(self):
+        loans = self.create_loans()
+
+        self.assertEqual([False, True, True],
+                         (Field('intRate') > 10).mask(loans).tolist())
+        self.assertEqual([True, True, False],
+                         (Field('intRate') <= 10.99).mask(loans).tolist())
+        self.assertEqual([False, True, False],
+                         (Field('grade') == 'B').mask(loans).tolist())
+        self.assertEqual([True, False, True],
+                         (Field('grade') != 'B').mask(loans).tolist())
+
+    def membership_and_ranges_test(self):
+        loans = self.create_loans()
+
+        self.assertEqual([True, False, True],
+                         Field('grade').isin(['A', 'C']).mask(loans).tolist())
+        self.assertEqual([False, True, False],
+                         Field('id').isin([2, 5]).mask(loans).tolist())
+        self.assertEqual([False, True, True],
+                         Field('intRate').between(10.99, 14).mask(loans)
+                         .tolist())
+
+    def boolean_combinators_test(self):
+        loans = self.create_loans()
+        low_rate = Field('intRate') < 12
+
+        self.assertEqual([False, True, False],
+                         (low_rate & (Field('grade') == 'B')).mask(loans)
+                         .tolist())
+        self.assertEqual([True, True, True],
+                         (low_rate | (Field('grade') == 'C')).mask(loans)
+                         .tolist())
+        self.assertEqual([False, False, True],
+                         (~low_rate).mask(loans).tolist())
+
+    def null_values_never_match_test(self):
+        loans = self.create_loans()
+        loans[0]['grade'] = None
+
+        self.assertEqual([False, False, False],
+                         (Field('openAcc6m') > 0).mask(loans).tolist())
+        self.assertEqual([False, True, True],
+                         (Field('grade') > 'A').mask(loans).tolist())
+
+    def null_numbers_and_dates_match_no_operator_test(self):
+        loans = [{'listD': None, 'dti': None},
+                 {'listD': '2014-08-25T10:50:20.000-07:00', 'dti': 5.0}]
+        cutoff = '2015-01-01T00:00:00Z'
+
+        for loans_or_table in (loans, LoanTable.from_loans(loans)):
+            for op in ('<', '<=', '>', '>=', '==', '!='):
+                date_mask = Comparison('listD', op, cutoff) \
+                    .mask(loans_or_table).tolist()
+                number_mask = Comparison('dti', op, 10.0) \
+                    .mask(loans_or_table).tolist()
+                self.assertFalse(date_mask[0])
+                self.assertFalse(number_mask[0])
+            self.assertEqual([False, True],
+                             (Field('listD') < cutoff).mask(loans_or_table)
+                             .tolist())
+            self.assertEqual([False, True],
+                             (Field('dti') != 10.0).mask(loans_or_table)
+                             .tolist())
+
+    def dates_compare_as_epochs_test(self):
+        loans = self.create_loans()
+        cutoff = arrow.get('2014-08-25T10:00:00.000-07:00')
+
+        self.assertEqual([True, True, True],
+                         (Field('listD') > cutoff).mask(loans).tolist())
+
+    def filter_returns_matching_dicts_test(self):
+        loans = self.create_loans()
+
+        result = (Field('grade').isin(['A', 'B'])).filter(loans)
+
+        self.assertEqual([1, 2], [loan['id'] for loan in result])
+
+    def filter_returns_table_selection_for_tables_test(self):
+        table = LoanTable.from_payload(listing())
+
+        result = (Field('intRate') > 10).filter(table)
+
+        self.assertIsInstance(result, LoanTable)
+        self.assertEqual([2, 3], result['id'].tolist())
+
+    def invalid_field_name_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            Field('')
+
+
+@skipIf(np is None, 'numpy is not installed')
+class EvaluateManyTest(TestCase):
+    def strategies_are_evaluated_together_test(self):
+        table = LoanTable.from_payload(listing())
+        strategies = {
+            'safe': Field('grade') == 'A',
+            'yield': (Field('intRate') > 10) & (Field('dti') < 5)
+        }
+
+        masks = evaluate_many(strategies, table)
+        selections = filter_many(strategies, table)
+
+        self.assertEqual([True, False, False], masks['safe'].tolist())
+        self.assertEqual([False, True, True], masks['yield'].tolist())
+        self.assertEqual([2, 3], selections['yield']['id'].tolist())
+
+    def shared_subexpressions_are_evaluated_once_test(self):
+        evaluated = []
+
+        class CountingColumns(_Columns):
+            def column(self, field):
+                evaluated.append(field)
+                return _Columns.column(self, field)
+
+        grade = Field('grade').isin(['A', 'B'])
+        strategies = [grade & (Field('intRate') > rate)
+                      for rate in range(50)]
+        columns = CountingColumns(listing()['loans'])
+
+        for strategy in strategies:
+            columns.evaluate(strategy)
+
+        self.assertEqual(1, evaluated.count('grade'))
+        self.assertEqual(50, evaluated.count('intRate'))
+
+    def list_of_expressions_returns_list_of_masks_test(self):
+        masks = evaluate_many([Field('id') == 1, Field('id') == 3],
+                              listing()['loans'])
+
+        self.assertEqual([[True, False, False], [False, False, True]],
+                         [mask.tolist() for mask in masks])
@@ -0,0 +1,120 @@
+import json
+from unittest import TestCase
+from .mock_connection import MockConnection
+from pylend import ListingDiff, ListingPoller, LoanIndex, Loans
+
+
+def loan(loan_id, grade='B', sub_grade='B3', state='CA', purpose='other',
+         term=36, funded_amount=0.0):
+    return {'id': loan_id,
+            'grade': grade,
+            'subGrade': sub_grade,
+            'addrState': state,
+            'purpose': purpose,
+            'term': term,
+            'fundedAmount': funded_amount}
+
+
+def ids(loans):
+    return [loan['id'] for loan in loans]
+
+
+class LoanIndexTest(TestCase):
+    def setUp(self):
+        self.index = LoanIndex([loan(1),
+                                loan(2, 'A', 'A1', 'NY'),
+                                loan(3, state='NY', term=60),
+                                loan(4, 'C', 'C2', purpose='credit_card')])
+
+    def lookup_by_id_test(self):
+        self.assertEqual(4, len(self.index))
+        self.assertIn(2, self.index)
+        self.assertEqual('A1', self.index[2]['subGrade'])
+        self.assertIsNone(self.index.get(99))
+        with self.assertRaises(KeyError):
+            self.index[99]
+
+    def find_by_one_field_test(self):
+        self.assertEqual([1, 3], ids(self.index.find(subGrade='B3')))
+        self.assertEqual([3], ids(self.index.find(term=60)))
+        self.assertEqual([], self.index.find(addrState='TX'))
+
+    def find_by_several_fields_test(self):
+        self.assertEqual([3], ids(self.index.find(grade='B', addrState='NY')))
+
+    def find_with_value_collections_test(self):
+        found = self.index.find(grade=['A', 'C'])
+
+        self.assertEqual([2, 4], sorted(ids(found)))
+
+    def find_without_criteria_returns_every_loan_test(self):
+        self.assertEqual(4, len(self.index.find()))
+
+    def unindexed_field_raises_ValueError_test(self):
+        with self.assertRaises(ValueError):
+            self.index.find(intRate=10.0)
+
+    def count_and_values_test(self):
+        self.assertEqual(2, self.index.count(addrState='NY'))
+        self.assertEqual(1, self.index.count(addrState='NY', grade='A'))
+        self.assertEqual({'B': 2, 'A': 1, 'C': 1}, self.index.values('grade'))
+
+    def update_moves_loan_between_buckets_test(self):
+        self.index.update(loan(1, 'D', 'D4', funded_amount=50.0))
+
+        self.assertEqual([3], ids(self.index.find(grade='B')))
+        self.assertEqual([1], ids(self.index.find(grade='D')))
+        self.assertEqual(50.0, self.index.find(addrState='CA')[0]
+                         ['fundedAmount'])
+
+    def update_of_unknown_loan_raises_KeyError_test(self):
+        with self.assertRaises(KeyError):
+            self.index.update(loan(99))
+
+    def insert_existing_loan_updates_it_test(self):
+        self.index.insert(loan(2, 'A', 'A1', 'TX'))
+
+        self.assertEqual(4, len(self.index))
+        self.assertEqual([2], ids(self.index.find(addrState='TX')))
+        self.assertEqual([3], ids(self.index.find(addrState='NY')))
+
+    def remove_drops_loan_from_every_index_test(self):
+        removed = self.index.remove(4)
+
+        self.assertEqual(4, removed['id'])
+        self.assertNotIn(4, self.index)
+        self.assertNotIn('C', self.index.values('grade'))
+        self.assertEqual([], self.index.find(purpose='credit_card'))
+        with self.assertRaises(KeyError):
+            self.index.remove(4)
+
+    def apply_diff_test(self):
+        self.index.apply_diff(ListingDiff(None,
+                                          [loan(5, state='TX')],
+                                          [loan(1, funded_amount=25.0)],
+                                          [loan(2, 'A', 'A1', 'NY')]))
+
+        self.assertEqual([1, 3, 4, 5], sorted(ids(self.index)))
+        self.assertEqual(25.0, self.index[1]['fundedAmount'])
+        self.assertEqual([5], ids(self.index.find(addrState='TX')))
+
+    def attached_index_follows_poller_test(self):
+        listings = [{'asOfDate': None, 'loans': [loan(1), loan(2)]},
+                    {'asOfDate': None,
+                     'loans': [loan(2, funded_amount=25.0), loan(3, 'E')]}]
+
+        def get(resource, api_version, query_params):
+            return json.loads(json.dumps(listings.pop(0)))
+
+        poller = ListingPoller(Loans(MockConnection(get), 'epoch'))
+        poller.poll()
+        index = LoanIndex()
+        index.attach(poller)
+        self.assertEqual([1, 2], sorted(ids(index)))
+
+        poller.poll()
+        self.assertEqual([2, 3], sorted(ids(index)))
+        self.assertEqual([3], ids(index.find(grade='E')))
+
+        index.detach()
+        self.assertEqual(2, len(index))
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+import pylend
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+
+def _loaded_modules(statement, modules):
+    script = '{0}; import sys; print(",".join(m for m in {1!r} ' \
+             'if m in sys.modules))'.format(statement, modules)
+    output = subprocess.check_output([sys.executable, '-c', script],
+                                     cwd=ROOT,
+                                     universal_newlines=True).strip()
+    return output.split(',') if output else []
+
+
+class LazyImportTest(TestCase):
+    def import_does_not_load_heavy_dependencies_test(self):
+        self.assertEqual([],
+                         _loaded_modules('import pylend',
+                                         ['arrow',
+                                          'requests',
+                                          'numpy',
+                                          'aiohttp',
+                                          'pylend.connection']))
+
+    def loans_does_not_load_arrow_or_requests_test(self):
+        self.assertEqual([],
+                         _loaded_modules('from pylend import Loans',
+                                         ['arrow', 'requests']))
+
+    def parsing_a_datetime_loads_arrow_test(self):
+        self.assertEqual(['arrow'],
+                         _loaded_modules(
+                             'import pylend; pylend.convert_datetime('
+                             '"2016-01-04T10:00:01.123-08:00", "epoch")',
+                             ['arrow']))
+
+    def lazy_exports_resolve_test(self):
+        from pylend.connection import Connection
+        self.assertIs(Connection, pylend.Connection)
+        self.assertIn('Connection', dir(pylend))
+
+    def unknown_attribute_raises_AttributeError_test(self):
+        with self.assertRaises(AttributeError):
+            pylend.NotAThing
+
+    def star_import_exports_every_public_name_test(self):
+        namespace = {}
+        exec('from pylend import *', namespace)
+
+        for name in ['Connection', 'Loans', 'Account', 'DATETIME_EPOCH']:
+            self.assertIn(name, namespace)
+        self.assertEqual(sorted(pylend.__all__),
+                         sorted(name for name in namespace
+                                if name != '__builtins__'))
@@ -0,0 +1,143 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import arrow
+from .mock_connection import MockConnection
+from .poller_test import ScriptedListings, listing
+from unittest import TestCase, skipIf
+from pylend import (ListingPoller,
+                    ListingPublisher,
+                    ListingReader,
+                    Loans)
+
+
+class ListingFeedTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'listing.feed')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def nothing_published_reads_None_test(self):
+        with ListingPublisher(self.path), ListingReader(self.path) as reader:
+            self.assertIsNone(reader.read())
+            self.assertEqual(0, reader.version)
+
+    def reader_sees_latest_published_snapshot_test(self):
+        with ListingPublisher(self.path) as publisher, \
+                ListingReader(self.path) as reader:
+            publisher.publish([{'id': 1}], 'first')
+            first = reader.read()
+            publisher.publish([{'id': 1}, {'id': 2}], 'second')
+            second = reader.read()
+
+        self.assertEqual(1, first.version)
+        self.assertEqual([{'id': 1}], first.loans)
+        self.assertEqual(2, second.version)
+        self.assertEqual('second', second.as_of_date)
+        self.assertEqual(2, len(second))
+
+    def unchanged_version_is_served_from_the_last_read_test(self):
+        with ListingPublisher(self.path) as publisher, \
+                ListingReader(self.path) as reader:
+            publisher.publish([{'id': 1}])
+
+            self.assertIs(reader.read(), reader.read())
+
+    def feed_grows_for_large_snapshots_test(self):
+        loans = [{'id': i, 'desc': 'x' * 100} for i in range(100)]
+        with ListingPublisher(self.path, capacity=64) as publisher, \
+                ListingReader(self.path) as reader:
+            publisher.publish(loans[:1])
+            reader.read()
+            publisher.publish(loans)
+
+            self.assertEqual(loans, reader.read().loans)
+
+    def restarted_publisher_is_not_mistaken_for_the_old_one_test(self):
+        with ListingPublisher(self.path) as publisher:
+            publisher.publish([{'id': 1}], 'old')
+        with ListingReader(self.path) as reader:
+            self.assertEqual('old', reader.read().as_of_date)
+            with ListingPublisher(self.path, capacity=64) as publisher:
+                self.assertIsNone(reader.read())
+                version = publisher.publish([{'id': 2}], 'new')
+                snapshot = reader.read()
+                self.assertEqual(1, version)
+                self.assertEqual('new', snapshot.as_of_date)
+                self.assertEqual([{'id': 2}], snapshot.loans)
+
+    def restarted_publisher_does_not_shrink_the_file_test(self):
+        with ListingPublisher(self.path, capacity=4096):
+            pass
+        with ListingPublisher(self.path, capacity=64):
+            self.assertEqual(4096, os.path.getsize(self.path))
+
+    def wait_for_update_sees_a_restarted_publisher_test(self):
+        with ListingPublisher(self.path) as publisher:
+            publisher.publish([])
+            publisher.publish([])
+        with ListingReader(self.path) as reader:
+            version = reader.read().version
+            with ListingPublisher(self.path) as publisher:
+                publisher.publish([{'id': 1}])
+
+                snapshot = reader.wait_for_update(version, timeout=1.0)
+
+        self.assertEqual([{'id': 1}], snapshot.loans)
+
+    @skipIf(not hasattr(os, 'getuid'), 'file ownership is POSIX only')
+    def feed_files_are_private_test(self):
+        with ListingPublisher(self.path):
+            self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+            os.chmod(self.path, 0o622)
+
+            with self.assertRaises(ValueError):
+                ListingReader(self.path)
+
+    def non_feed_files_raise_exception_test(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        with self.assertRaises(ValueError):
+            ListingReader(self.path)
+
+    def wait_for_update_times_out_without_new_versions_test(self):
+        with ListingPublisher(self.path) as publisher, \
+                ListingReader(self.path) as reader:
+            version = publisher.publish([])
+
+            self.assertIsNone(reader.wait_for_update(version, timeout=0.02))
+
+    def poller_diffs_are_published_test(self):
+        connection = MockConnection(ScriptedListings(
+            listing((1, 0.0), (2, 25.0)),
+            listing((2, 50.0), (3, 0.0))))
+        poller = ListingPoller(Loans(connection))
+
+        with ListingPublisher(self.path, poller), \
+                ListingReader(self.path) as reader:
+            poller.poll()
+            poller.poll()
+            snapshot = reader.read()
+
+        self.assertEqual(2, snapshot.version)
+        self.assertEqual([2, 3], sorted(loan['id'] for loan in snapshot.loans))
+        self.assertEqual(arrow.get('2014-08-25T10:50:20.000-07:00'),
+                         snapshot.loans[0]['listD'])
+
+    def snapshot_is_readable_from_another_process_test(self):
+        script = ('import sys; from pylend import ListingReader; '
+                  'print(len(ListingReader(sys.argv[1]).read()))')
+        root = os.path.join(os.path.dirname(__file__), '..', '..')
+        with ListingPublisher(self.path) as publisher:
+            publisher.publish([{'id': i} for i in range(3)])
+
+            output = subprocess.check_output(
+                [sys.executable, '-c', script, self.path],
+                cwd=root)
+
+        self.assertEqual(b'3', output.strip())
@@ -1,10 +1,12 @@
 import json
 import arrow
 from .mock_connection import MockConnection
-from unittest import TestCase
-from pylend import Loans, ExecutionFailureException
+from unittest import TestCase, skipIf
+from pylend import Loans, LazyRecord, LoanRecord, ExecutionFailureException
+from pylend.loans import LoanOrder
+from pylend.table import np
 
-VALID_RESPONSE = json.loads("""{
+VALID_RESPONSE_TEXT = """{
     "asOfDate":"2014-09-03T14:41:53.959-07:00",
     "loans": [
     {
@@ -113,7 +115,9 @@ VALID_RESPONSE = json.loads("""{
         "totalFiTl":null,
         "inqLast12m":185
     }]
-}""")
+}"""
+
+VALID_RESPONSE = json.loads(VALID_RESPONSE_TEXT)
 
 
 class LoanTest(TestCase):
@@ -143,6 +147,20 @@ class LoanTest(TestCase):
         with self.assertRaises(ExecutionFailureException):
             l.listed_loans()
 
+    def listed_loans_payload_is_returned_as_received_test(self):
+        def callback(resource, api_version, query_params):
+            self.assertEqual('loans/listing', resource)
+            self.assertEqual({'showAll': True}, query_params)
+            return json.loads(VALID_RESPONSE_TEXT)
+        connection = MockConnection(callback)
+        l = Loans(connection)
+
+        result = l.listed_loans_payload(get_all_loans=True)
+
+        self.assertEqual("2014-09-03T14:41:53.959-07:00", result['asOfDate'])
+        self.assertEqual("2014-08-25T10:50:20.000-07:00",
+                         result['loans'][0]['listD'])
+
     def verify_asOfDate_datetime_converted_test(self):
 
         def callback(resource, api_version, query_params):
@@ -177,3 +195,95 @@ class LoanTest(TestCase):
 
         for date in dates:
             self.assertEqual(dates[date], loan[date])
+
+    def invalid_datetime_mode_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            Loans(MockConnection(), datetime_mode='eager')
+
+    def lazy_mode_defers_loan_datetime_parsing_test(self):
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        l = Loans(MockConnection(callback), datetime_mode='lazy')
+
+        result = l.listed_loans()
+        loan = result['loans'][0]
+
+        self.assertIsInstance(loan, LazyRecord)
+        self.assertEqual(arrow.get("2014-09-03T14:41:53.959-07:00"),
+                         result['asOfDate'])
+        self.assertEqual(arrow.get("2014-08-25T10:50:20.000-07:00"),
+                         loan['listD'])
+
+    def epoch_mode_converts_loan_datetimes_to_integers_test(self):
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        l = Loans(MockConnection(callback), datetime_mode='epoch')
+
+        result = l.listed_loans()
+
+        self.assertEqual(1409780513, result['asOfDate'])
+        self.assertEqual(1408989020, result['loans'][0]['listD'])
+
+    def listed_loan_records_returns_typed_records_test(self):
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        l = Loans(MockConnection(callback), datetime_mode='lazy')
+
+        records = l.listed_loan_records()
+
+        self.assertIsInstance(records[0], LoanRecord)
+        self.assertEqual(arrow.get("2014-08-25T10:50:20.000-07:00"),
+                         records[0].listD)
+
+    def stream_yields_normalized_loans_test(self):
+
+        def callback(resource, api_version, query_params):
+            self.assertEqual('loans/listing', resource)
+            self.assertTrue(query_params['showAll'])
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        l = Loans(MockConnection(callback))
+
+        loans = l.listed_loans(get_all_loans=True, stream=True)
+        loan = next(loans)
+
+        self.assertEqual(111111, loan['id'])
+        self.assertEqual(arrow.get("2014-08-25T10:50:20.000-07:00"),
+                         loan['listD'])
+        self.assertEqual(
+            [loan['id'] for loan in
+             l.listed_loans(get_all_loans=True)['loans'][1:]],
+            [loan['id'] for loan in loans])
+
+    def stream_with_error_block_raises_exception_test(self):
+
+        def callback(resource, api_version, query_params):
+            return json.loads('{"errors": "foo"}')
+
+        l = Loans(MockConnection(callback))
+
+        with self.assertRaises(ExecutionFailureException):
+            list(l.listed_loans(stream=True))
+
+
+class LoanOrderTest(TestCase):
+    def orders_have_no_instance_dict_test(self):
+        self.assertFalse(hasattr(LoanOrder(1, 25), '__dict__'))
+
+    def to_json_matches_get_dict_test(self):
+        for order in (LoanOrder(1, 25), LoanOrder(2, 50.0, 3)):
+            self.assertEqual(order.get_dict(), json.loads(order.to_json()))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def to_json_writes_numpy_numbers_test(self):
+        order = LoanOrder(np.int64(2), np.float64(50.0), np.int32(3))
+
+        self.assertEqual({'loanId': 2, 'requestedAmount': 50.0,
+                          'portfolioId': 3},
+                         json.loads(order.to_json()))
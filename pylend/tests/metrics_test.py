@@ -0,0 +1,140 @@
+import json
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import patch
+from .connection_test import MockResponse
+from .loans_test import VALID_RESPONSE_TEXT
+from .mock_connection import MockConnection
+from pylend import Account, Connection, Loans, MetricsRegistry
+from pylend.metrics import Histogram, endpoint_name
+
+
+class HistogramTest(TestCase):
+    def observations_are_bucketed_cumulatively_test(self):
+        histogram = Histogram([0.1, 1.0])
+
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+
+        self.assertEqual([2, 3, 4], histogram.cumulative_counts())
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(2.65, histogram.sum)
+        self.assertEqual({'0.1': 2, '1.0': 3, '+Inf': 4},
+                         histogram.to_dict()['buckets'])
+
+
+class MetricsRegistryTest(TestCase):
+    def unsorted_buckets_raise_exception_test(self):
+        with self.assertRaises(ValueError):
+            MetricsRegistry([1.0, 0.1])
+
+    def resource_ids_are_collapsed_test(self):
+        self.assertEqual('accounts/{id}/summary',
+                         endpoint_name('accounts/12345/summary'))
+        self.assertEqual('loans/listing', endpoint_name('loans/listing'))
+
+    def to_dict_groups_by_endpoint_test(self):
+        metrics = MetricsRegistry([1.0])
+        metrics.observe('accounts/1/summary', 'response', 0.5)
+        metrics.observe('accounts/2/summary', 'response', 1.5)
+        metrics.add_bytes('accounts/1/summary', 'received', 10)
+        metrics.count_status('accounts/1/summary', 200)
+        metrics.count_retry('accounts/1/summary')
+
+        result = metrics.to_dict()
+
+        self.assertEqual(
+            {'count': 2, 'sum': 2.0, 'buckets': {'1.0': 1, '+Inf': 2}},
+            result['latency']['accounts/{id}/summary']['response'])
+        self.assertEqual({'received': 10},
+                         result['bytes']['accounts/{id}/summary'])
+        self.assertEqual({200: 1}, result['statuses']['accounts/{id}/summary'])
+        self.assertEqual({'accounts/{id}/summary': 1}, result['retries'])
+
+    def to_prometheus_writes_text_exposition_format_test(self):
+        metrics = MetricsRegistry([1.0])
+        metrics.observe('loans/listing', 'decode', 0.25)
+        metrics.count_status('loans/listing', 200)
+
+        lines = metrics.to_prometheus().splitlines()
+
+        self.assertIn('# TYPE pylend_request_phase_seconds histogram', lines)
+        self.assertIn('pylend_request_phase_seconds_bucket{endpoint='
+                      '"loans/listing",phase="decode",le="1.0"} 1', lines)
+        self.assertIn('pylend_request_phase_seconds_bucket{endpoint='
+                      '"loans/listing",phase="decode",le="+Inf"} 1', lines)
+        self.assertIn('pylend_request_phase_seconds_count{endpoint='
+                      '"loans/listing",phase="decode"} 1', lines)
+        self.assertIn('pylend_responses_total{endpoint="loans/listing",'
+                      'status="200"} 1', lines)
+
+    def reset_clears_everything_test(self):
+        metrics = MetricsRegistry()
+        metrics.count_retry('loans/listing')
+
+        metrics.reset()
+
+        self.assertEqual({}, metrics.to_dict()['retries'])
+
+
+class ConnectionMetricsTest(TestCase):
+    @patch('requests.Session.get')
+    def get_records_phases_status_and_bytes_test(self, requests_get_patch):
+        response = MockResponse('foo', 200, {'a': 1})
+        response.elapsed = timedelta(seconds=0)
+        requests_get_patch.return_value = response
+        metrics = MetricsRegistry()
+        c = Connection(api_key="testkey", metrics=metrics, codec='json')
+
+        c.get('accounts/1/summary')
+
+        result = metrics.to_dict()
+        phases = result['latency']['accounts/{id}/summary']
+        self.assertEqual(['decode', 'download', 'rate_limit', 'response'],
+                         sorted(phases))
+        self.assertEqual({200: 1}, result['statuses']['accounts/{id}/summary'])
+        self.assertEqual({'received': len(b'{"a": 1}')},
+                         result['bytes']['accounts/{id}/summary'])
+
+    @patch('requests.Session.post')
+    def post_records_bytes_sent_test(self, requests_post_patch):
+        requests_post_patch.return_value = MockResponse('foo', 200, '')
+        metrics = MetricsRegistry()
+        c = Connection(api_key="testkey", metrics=metrics, codec='json')
+
+        c.post('accounts/1/orders', {'aid': 1})
+
+        self.assertEqual(len('{"aid": 1}'),
+                         metrics.to_dict()['bytes']
+                         ['accounts/{id}/orders']['sent'])
+
+    def metrics_are_off_by_default_test(self):
+        self.assertIsNone(Connection(api_key="testkey").metrics)
+
+
+class NormalizationMetricsTest(TestCase):
+    def listing_normalization_is_timed_test(self):
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+        connection = MockConnection(callback)
+        connection.metrics = MetricsRegistry()
+
+        Loans(connection).listed_loans()
+        Loans(connection).listed_loan_records()
+
+        self.assertEqual(
+            2,
+            connection.metrics.histogram('loans/listing', 'normalize').count)
+
+    def account_normalization_is_timed_test(self):
+        def callback(resource, api_version, query_params):
+            return {'myNotes': []}
+        connection = MockConnection(callback)
+        connection.metrics = MetricsRegistry()
+
+        Account(connection, 7).owned_notes()
+
+        self.assertEqual(
+            1,
+            connection.metrics.histogram('accounts/7/notes',
+                                         'normalize').count)
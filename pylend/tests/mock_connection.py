@@ -1,11 +1,43 @@
+import asyncio
+import json
+
+
 class MockConnection:
     def __init__(self, get_callback=None, post_callback=None):
         self.get_callback = get_callback
+        self.post_callback = post_callback
 
     def get(self, resource, api_version='v1', query_params=None):
         method = self.get_callback
         return method(resource, api_version, query_params)
 
+    def get_stream(self,
+                   resource,
+                   api_version='v1',
+                   query_params=None,
+                   chunk_size=7):
+        # Small chunks split keys, strings and numbers across reads.
+        text = json.dumps(self.get(resource, api_version, query_params))
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size].encode('utf-8')
+
     def post(self, resource, body, api_version='v1', query_params=None):
         method = self.post_callback
         return method(resource, body, api_version, query_params)
+
+
+class MockAsyncConnection(MockConnection):
+    async def get(self, resource, api_version='v1', query_params=None):
+        return MockConnection.get(self, resource, api_version, query_params)
+
+    async def post(self, resource, body, api_version='v1', query_params=None):
+        return MockConnection.post(
+            self, resource, body, api_version, query_params)
+
+
+def run_async(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
@@ -0,0 +1,140 @@
+import threading
+import time
+from .mock_connection import MockConnection
+from unittest import TestCase
+from pylend import ExecutionFailureException, MultiAccount
+from pylend.loans import LoanOrder
+
+
+class KeyedConnections:
+    def __init__(self, get_callback=None, post_callback=None):
+        self.get_callback = get_callback
+        self.post_callback = post_callback
+        self.api_keys = []
+
+    def __call__(self, api_key):
+        self.api_keys.append(api_key)
+
+        def get(resource, api_version, query_params):
+            return self.get_callback(api_key, resource)
+
+        def post(resource, body, api_version, query_params):
+            return self.post_callback(api_key, resource, body)
+
+        return MockConnection(get, post)
+
+
+class MultiAccountTest(TestCase):
+    def init_raises_exception_with_bad_params_test(self):
+        with self.assertRaises(ValueError):
+            MultiAccount([])
+        with self.assertRaises(ValueError):
+            MultiAccount([('key', 1), ('key', 1)],
+                         connection_factory=KeyedConnections())
+        with self.assertRaises(ValueError):
+            MultiAccount([('key', 1)],
+                         max_workers=0,
+                         connection_factory=KeyedConnections())
+
+    def accounts_share_one_connection_per_api_key_test(self):
+        connections = KeyedConnections()
+
+        m = MultiAccount([('a', 1), ('a', 2), ('b', 3)],
+                         connection_factory=connections)
+
+        self.assertEqual(['a', 'b'], connections.api_keys)
+        self.assertEqual([1, 2, 3], sorted(m.accounts))
+
+    def every_account_runs_at_once_by_default_test(self):
+        accounts = 100
+        all_started = threading.Barrier(accounts)
+
+        def get(api_key, resource):
+            all_started.wait(5)
+            return {'availableCash': 1.0}
+
+        m = MultiAccount([(str(account_id), account_id)
+                          for account_id in range(accounts)],
+                         connection_factory=KeyedConnections(get))
+
+        result = m.available_cash()
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(accounts, len(result))
+
+    def available_cash_is_keyed_by_account_test(self):
+        def get(api_key, resource):
+            account_id = int(resource.split('/')[1])
+            return {'investorId': account_id, 'availableCash': account_id * 10}
+
+        m = MultiAccount([('a', 1), ('b', 2)],
+                         connection_factory=KeyedConnections(get))
+
+        result = m.available_cash()
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(10, result[1]['availableCash'])
+        self.assertEqual(20, result[2]['availableCash'])
+
+    def failures_are_reported_per_account_test(self):
+        def get(api_key, resource):
+            if api_key == 'bad':
+                return {'errors': ['denied']}
+            return {'myNotes': [{'noteId': 1}]}
+
+        m = MultiAccount([('good', 1), ('bad', 2)],
+                         connection_factory=KeyedConnections(get))
+
+        result = m.owned_notes()
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual([{'noteId': 1}], result.results[1])
+        self.assertIsInstance(result.errors[2], ExecutionFailureException)
+        with self.assertRaises(ExecutionFailureException):
+            result[2]
+
+    def accounts_are_fetched_concurrently_test(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def get(api_key, resource):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return {}
+
+        credentials = [('key{0}'.format(i), i) for i in range(20)]
+        m = MultiAccount(credentials,
+                         connection_factory=KeyedConnections(get))
+
+        start = time.perf_counter()
+        result = m.account_summary()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(20, len(result))
+        self.assertGreater(active[1], 1)
+        self.assertLess(elapsed, 0.05 * 20 / 2)
+
+    def orders_are_submitted_to_their_accounts_test(self):
+        bodies = {}
+
+        def post(api_key, resource, body):
+            bodies[resource] = body
+            return {'orderInstructId': api_key}
+
+        connections = KeyedConnections(post_callback=post)
+        m = MultiAccount([('a', 1), ('b', 2)], connection_factory=connections)
+
+        result = m.submit_orders({2: [LoanOrder(5, 25.0)]})
+
+        self.assertEqual({2: {'orderInstructId': 'b'}}, result.results)
+        self.assertEqual(['accounts/2/orders'], list(bodies))
+
+    def unknown_accounts_raise_exception_test(self):
+        m = MultiAccount([('a', 1)], connection_factory=KeyedConnections())
+
+        with self.assertRaises(ValueError):
+            m.submit_orders({9: [LoanOrder(5, 25.0)]})
@@ -0,0 +1,63 @@
+from unittest import TestCase
+import arrow
+from pylend import LazyRecord
+from pylend.account import TRANSFER_FREQUENCY_MAPPING
+from pylend.normalizers import RecordNormalizer
+
+TIMESTAMP = '2014-08-25T10:56:29.000-07:00'
+
+
+class RecordNormalizerTest(TestCase):
+    def setUp(self):
+        self.normalizer = RecordNormalizer(
+            ['transferDate', 'endDate'],
+            {'frequency': TRANSFER_FREQUENCY_MAPPING})
+
+    def datetimes_and_mappings_are_applied_test(self):
+        transfer = self.normalizer({'transferDate': TIMESTAMP,
+                                    'endDate': None,
+                                    'frequency': 'Monthly'})
+
+        self.assertEqual(arrow.get(TIMESTAMP), transfer['transferDate'])
+        self.assertIsNone(transfer['endDate'])
+        self.assertEqual('LOAD_MONTHLY', transfer['frequency'])
+
+    def missing_fields_are_not_added_test(self):
+        transfer = self.normalizer({'frequency': 'Weekly'}, 'epoch')
+
+        self.assertEqual({'frequency': 'LOAD_WEEKLY'}, transfer)
+
+    def epoch_mode_converts_to_seconds_test(self):
+        transfer = self.normalizer({'transferDate': TIMESTAMP,
+                                    'frequency': 'One Time'},
+                                   'epoch')
+
+        self.assertEqual(1408989389, transfer['transferDate'])
+
+    def lazy_mode_defers_datetimes_test(self):
+        transfer = self.normalizer({'transferDate': TIMESTAMP,
+                                    'frequency': 'One Time'},
+                                   'lazy')
+
+        self.assertIsInstance(transfer, LazyRecord)
+        self.assertEqual('LOAD_ONCE', transfer['frequency'])
+        self.assertEqual(arrow.get(TIMESTAMP), transfer['transferDate'])
+
+    def unknown_mapping_value_raises_KeyError_test(self):
+        with self.assertRaises(KeyError):
+            self.normalizer({'frequency': 'Yearly'})
+
+    def normalizers_are_compiled_once_per_mode_test(self):
+        self.assertIs(self.normalizer.compile('epoch'),
+                      self.normalizer.compile('epoch'))
+        self.assertIsNot(self.normalizer.compile('epoch'),
+                         self.normalizer.compile('arrow'))
+
+    def normalize_many_normalizes_each_record_test(self):
+        transfers = self.normalizer.normalize_many(
+            [{'transferDate': TIMESTAMP, 'frequency': 'Monthly'},
+             {'transferDate': TIMESTAMP, 'frequency': 'Weekly'}],
+            'epoch')
+
+        self.assertEqual([1408989389, 1408989389],
+                         [transfer['transferDate'] for transfer in transfers])
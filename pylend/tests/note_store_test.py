@@ -0,0 +1,118 @@
+import arrow
+import copy
+import os
+import tempfile
+from .mock_connection import MockConnection
+from unittest import TestCase
+from pylend import Account, NoteStore, NoteSync
+
+
+def note(note_id, loan_status='Current', payments_received=0.0,
+         next_payment_date='2016-02-01T00:00:00.000-08:00',
+         portfolio_id=1):
+    return {'noteId': note_id,
+            'loanId': note_id + 1000,
+            'portfolioId': portfolio_id,
+            'loanStatus': loan_status,
+            'paymentsReceived': payments_received,
+            'issueDate': '2015-11-12T06:34:02.000-08:00',
+            'loanStatusDate': '2015-12-20T13:13:53.000-08:00',
+            'nextPaymentDate': next_payment_date}
+
+
+class ScriptedNotes:
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+        self.resources = []
+
+    def __call__(self, resource, api_version, query_params):
+        self.resources.append(resource)
+        return {'myNotes': copy.deepcopy(self.payloads.pop(0))}
+
+
+class NoteSyncTest(TestCase):
+    def create_sync(self, *payloads):
+        notes = ScriptedNotes(*payloads)
+        account = Account(MockConnection(notes), 1)
+        return NoteSync(account, NoteStore()), notes
+
+    def init_raises_exception_with_bad_params_test(self):
+        with self.assertRaises(ValueError):
+            NoteSync(None, NoteStore())
+        with self.assertRaises(ValueError):
+            NoteSync(Account(MockConnection(), 1), None)
+
+    def first_sync_inserts_every_note_test(self):
+        sync, notes = self.create_sync([note(1), note(2)])
+
+        result = sync.sync()
+
+        self.assertEqual(['accounts/1/detailednotes'], notes.resources)
+        self.assertEqual(2, result.inserted)
+        self.assertEqual(2, len(sync.store))
+
+    def only_changed_notes_are_updated_test(self):
+        sync, notes = self.create_sync(
+            [note(1), note(2), note(3)],
+            [note(1), note(2, payments_received=1.5), note(4)])
+
+        sync.sync()
+        result = sync.sync()
+
+        self.assertEqual(1, result.inserted)
+        self.assertEqual(1, result.updated)
+        self.assertEqual(1, result.removed)
+        self.assertEqual(1, result.unchanged)
+        self.assertEqual([1, 2, 4],
+                         [n['noteId'] for n in sync.store.all()])
+        self.assertEqual(1.5, sync.store.get(2)['paymentsReceived'])
+
+    def repeated_notes_are_counted_once_test(self):
+        sync, notes = self.create_sync(
+            [note(1), note(2)],
+            [note(1), note(1), note(2), note(2, payments_received=1.5)])
+
+        sync.sync()
+        result = sync.sync()
+
+        self.assertEqual(0, result.inserted)
+        self.assertEqual(1, result.updated)
+        self.assertEqual(1, result.unchanged)
+        self.assertEqual(1.5, sync.store.get(2)['paymentsReceived'])
+
+    def queries_return_normalized_notes_test(self):
+        sync, notes = self.create_sync(
+            [note(1, loan_status='Late (31-120 days)', portfolio_id=7),
+             note(2, next_payment_date='2016-03-01T00:00:00.000-08:00'),
+             note(3)])
+        sync.sync()
+        store = sync.store
+
+        self.assertEqual([1], [n['noteId'] for n in
+                               store.by_status('Late (31-120 days)')])
+        self.assertEqual([1], [n['noteId'] for n in store.by_portfolio(7)])
+        self.assertEqual([1001], [n['loanId'] for n in store.by_loan(1001)])
+        self.assertEqual(
+            [2],
+            [n['noteId'] for n in store.due_between(
+                arrow.get('2016-02-15T00:00:00.000-08:00'),
+                arrow.get('2016-03-15T00:00:00.000-08:00'))])
+        self.assertEqual(arrow.get('2015-11-12T06:34:02.000-08:00'),
+                         store.get(3)['issueDate'])
+        self.assertIsNone(store.get(99))
+
+    def store_persists_between_sessions_test(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'notes.db')
+        try:
+            with NoteStore(path) as store:
+                store.apply([note(1)])
+            with NoteStore(path, datetime_mode='epoch') as store:
+                result = store.apply([note(1)])
+                loaded = store.get(1)
+
+            self.assertEqual(1, result.unchanged)
+            self.assertEqual(1447338842, loaded['issueDate'])
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
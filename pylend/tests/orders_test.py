@@ -0,0 +1,54 @@
+from unittest import TestCase, skipIf
+from pylend import Field, LoanTable, allocate_amounts, create_orders
+from pylend.table import np
+
+
+def loans(*amounts):
+    return [{'id': loan_id, 'loanAmount': loan_amount,
+             'fundedAmount': funded_amount}
+            for loan_id, (loan_amount, funded_amount)
+            in enumerate(amounts, 1)]
+
+
+@skipIf(np is None, 'numpy is not installed')
+class CreateOrdersTest(TestCase):
+    def bad_parameters_raise_exception_test(self):
+        with self.assertRaises(ValueError):
+            create_orders(None, 25)
+        with self.assertRaises(ValueError):
+            create_orders(loans((1000, 0)), 10)
+
+    def orders_are_capped_by_remaining_funding_test(self):
+        orders = create_orders(loans((1000, 0), (1000, 960), (1000, 1000)),
+                               50, portfolio_id=7)
+
+        self.assertEqual([(1, 50), (2, 25)],
+                         [(order.loan_id, order.amount) for order in orders])
+        self.assertEqual(7, orders[0].portfolio_id)
+
+    def amounts_round_down_to_note_increments_test(self):
+        loan_ids, amounts = allocate_amounts(loans((1000, 0)), 60)
+
+        self.assertEqual([50], amounts.tolist())
+
+    def total_is_capped_by_budget_and_cash_test(self):
+        candidates = loans((1000, 0), (1000, 0), (1000, 0), (1000, 0))
+
+        loan_ids, amounts = allocate_amounts(candidates, 50, budget=125)
+        self.assertEqual([1, 2, 3], loan_ids.tolist())
+        self.assertEqual([50, 50, 25], amounts.tolist())
+
+        loan_ids, amounts = allocate_amounts(candidates, 50, budget=1000,
+                                             available_cash=110.5)
+        self.assertEqual([50, 50], amounts.tolist())
+
+    def accepts_filtered_tables_test(self):
+        table = LoanTable.from_loans(loans((1000, 0), (500, 0), (2000, 0)))
+
+        orders = create_orders((Field('loanAmount') >= 1000).filter(table),
+                               25)
+
+        self.assertEqual([1, 3], [order.loan_id for order in orders])
+
+    def empty_candidates_create_no_orders_test(self):
+        self.assertEqual([], create_orders([], 25))
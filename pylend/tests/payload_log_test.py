@@ -0,0 +1,118 @@
+import json
+import logging
+from .loans_test import VALID_RESPONSE_TEXT
+from .mock_connection import MockConnection
+from unittest import TestCase
+from pylend import Account, Loans, set_payload_logging
+from pylend.payload_log import summarize_payload
+
+
+class RenderCounter:
+    renders = 0
+
+    def __str__(self):
+        RenderCounter.renders += 1
+        return 'rendered'
+
+    __repr__ = __str__
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class PayloadLogTest(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger('pylend')
+        self.level = self.logger.level
+        self.handler = CapturingHandler()
+        self.logger.addHandler(self.handler)
+        RenderCounter.renders = 0
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self.level)
+        set_payload_logging()
+
+    def listing(self):
+        payload = json.loads(VALID_RESPONSE_TEXT)
+        payload['marker'] = RenderCounter()
+        return payload
+
+    def payload_messages(self):
+        return [record for record in self.handler.records
+                if getattr(record, 'pylend_payload', None) is not None]
+
+    def payloads_are_not_rendered_when_debug_is_off_test(self):
+        self.logger.setLevel(logging.INFO)
+
+        def callback(resource, api_version, query_params):
+            return self.listing()
+
+        Loans(MockConnection(callback)).listed_loans()
+        Account(MockConnection(callback), 1).account_summary()
+
+        self.assertEqual(0, RenderCounter.renders)
+        self.assertEqual([], self.payload_messages())
+
+    def listing_is_summarized_by_default_test(self):
+        self.logger.setLevel(logging.DEBUG)
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        Loans(MockConnection(callback)).listed_loans()
+
+        record = self.payload_messages()[0]
+        self.assertEqual('loans/listing', record.pylend_resource)
+        self.assertEqual({'count': 1, 'ids': [111111]},
+                         record.pylend_summary['loans'])
+        self.assertIn("'count': 1", record.getMessage())
+        self.assertNotIn('memberId', record.getMessage())
+
+    def truncated_mode_limits_message_length_test(self):
+        self.logger.setLevel(logging.DEBUG)
+        set_payload_logging('truncated', limit=50)
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        Account(MockConnection(callback), 1).account_summary()
+
+        message = self.payload_messages()[0].getMessage()
+        self.assertTrue(message.startswith('Response: {"asOfDate"'))
+        self.assertTrue(message.endswith('characters)'))
+        self.assertLess(len(message), 100)
+
+    def full_mode_logs_the_whole_payload_test(self):
+        self.logger.setLevel(logging.DEBUG)
+        set_payload_logging('full')
+
+        def callback(resource, api_version, query_params):
+            return json.loads(VALID_RESPONSE_TEXT)
+
+        Account(MockConnection(callback), 1).account_summary()
+
+        message = self.payload_messages()[0].getMessage()
+        self.assertEqual(json.loads(VALID_RESPONSE_TEXT),
+                         json.loads(message[len('Response: '):]))
+
+    def invalid_settings_raise_exception_test(self):
+        with self.assertRaises(ValueError):
+            set_payload_logging('verbose')
+        with self.assertRaises(ValueError):
+            set_payload_logging('truncated', limit=0)
+
+    def summaries_keep_ids_of_listed_collections_test(self):
+        summary = summarize_payload(
+            {'myNotes': [{'noteId': n} for n in range(10)],
+             'availableCash': 25.0})
+
+        self.assertEqual({'myNotes': {'count': 10, 'ids': [0, 1, 2, 3, 4]},
+                          'availableCash': 25.0},
+                         summary)
@@ -0,0 +1,150 @@
+import arrow
+import json
+from datetime import timedelta
+from .mock_connection import MockConnection
+from unittest import TestCase
+from pylend import Loans, ListingPoller
+
+
+def listing(*loans):
+    return {
+        'asOfDate': '2014-09-03T14:41:53.959-07:00',
+        'loans': [{'id': loan_id,
+                   'fundedAmount': funded_amount,
+                   'listD': '2014-08-25T10:50:20.000-07:00'}
+                  for loan_id, funded_amount in loans]}
+
+
+class ScriptedListings:
+    def __init__(self, *listings):
+        self.listings = list(listings)
+
+    def __call__(self, resource, api_version, query_params):
+        return json.loads(json.dumps(self.listings.pop(0)))
+
+
+class ListingPollerTest(TestCase):
+    def create_poller(self, *listings, **kwargs):
+        connection = MockConnection(ScriptedListings(*listings))
+        return ListingPoller(Loans(connection), **kwargs)
+
+    def init_raises_exception_with_bad_params_test(self):
+        with self.assertRaises(ValueError):
+            ListingPoller(None)
+        with self.assertRaises(ValueError):
+            ListingPoller(Loans(MockConnection()),
+                          interval=timedelta(seconds=1),
+                          fast_interval=timedelta(seconds=2))
+
+    def first_poll_reports_every_loan_as_new_test(self):
+        poller = self.create_poller(listing((1, 0.0), (2, 25.0)))
+
+        diff = poller.poll()
+
+        self.assertEqual([1, 2], [loan['id'] for loan in diff.new])
+        self.assertEqual([], diff.changed)
+        self.assertEqual([], diff.removed)
+        self.assertEqual(arrow.get('2014-08-25T10:50:20.000-07:00'),
+                         diff.new[0]['listD'])
+
+    def subsequent_polls_report_only_differences_test(self):
+        poller = self.create_poller(
+            listing((1, 0.0), (2, 25.0), (3, 50.0)),
+            listing((1, 0.0), (2, 75.0), (4, 0.0)))
+
+        poller.poll()
+        diff = poller.poll()
+
+        self.assertEqual([4], [loan['id'] for loan in diff.new])
+        self.assertEqual([2], [loan['id'] for loan in diff.changed])
+        self.assertEqual([3], [loan['id'] for loan in diff.removed])
+        self.assertEqual([1, 2, 4], sorted(poller.snapshot))
+        self.assertEqual(75.0, poller.snapshot[2]['fundedAmount'])
+
+    def unchanged_listing_is_not_published_test(self):
+        poller = self.create_poller(listing((1, 0.0)), listing((1, 0.0)))
+        published = []
+        poller.subscribe(published.append)
+
+        poller.poll()
+        diff = poller.poll()
+
+        self.assertFalse(diff)
+        self.assertEqual(1, len(published))
+
+    def unsubscribed_callbacks_are_not_called_test(self):
+        poller = self.create_poller(listing((1, 0.0)))
+        published = []
+        poller.subscribe(published.append)
+        poller.unsubscribe(published.append)
+
+        poller.poll()
+
+        self.assertEqual([], published)
+
+    def iterator_yields_only_non_empty_diffs_test(self):
+        poller = self.create_poller(
+            listing((1, 0.0)),
+            listing((1, 0.0)),
+            listing((1, 25.0)),
+            interval=timedelta(0),
+            fast_interval=timedelta(0))
+
+        diffs = iter(poller)
+        first = next(diffs)
+        second = next(diffs)
+        poller.stop()
+
+        self.assertEqual(1, len(first.new))
+        self.assertEqual(1, len(second.changed))
+
+    def run_keeps_polling_after_a_failed_poll_test(self):
+        poller = self.create_poller(
+            {'errors': 'foo'},
+            listing((1, 0.0)),
+            interval=timedelta(0),
+            fast_interval=timedelta(0))
+
+        poller.run(max_polls=2)
+
+        self.assertEqual([1], list(poller.snapshot))
+
+    def polls_faster_around_release_times_test(self):
+        poller = ListingPoller(Loans(MockConnection()),
+                               interval=timedelta(seconds=60),
+                               fast_interval=timedelta(seconds=1),
+                               release_window=timedelta(minutes=2))
+        release = arrow.get('2016-01-04T10:00:00-08:00')
+
+        self.assertEqual(timedelta(seconds=1), poller.next_interval(
+            release.shift(minutes=-1)))
+        self.assertEqual(timedelta(seconds=1), poller.next_interval(
+            release.shift(minutes=2)))
+        self.assertEqual(timedelta(seconds=60), poller.next_interval(
+            release.shift(minutes=30)))
+
+    def release_times_are_in_the_poller_timezone_test(self):
+        poller = ListingPoller(Loans(MockConnection()),
+                               interval=timedelta(seconds=60),
+                               fast_interval=timedelta(seconds=1),
+                               release_window=timedelta(minutes=2))
+        # 14:00 in Tokyo is not a release; 03:00 in Tokyo is 10:00 Pacific.
+        self.assertEqual(timedelta(seconds=60), poller.next_interval(
+            arrow.get('2016-01-04T14:00:00+09:00')))
+        self.assertEqual(timedelta(seconds=1), poller.next_interval(
+            arrow.get('2016-01-05T03:00:00+09:00')))
+
+    def release_windows_cross_midnight_test(self):
+        poller = ListingPoller(Loans(MockConnection()),
+                               interval=timedelta(seconds=60),
+                               fast_interval=timedelta(seconds=1),
+                               release_times=['00:00'],
+                               release_window=timedelta(minutes=2))
+        midnight = arrow.get('2016-01-05T00:00:00-08:00')
+
+        self.assertEqual(timedelta(seconds=1), poller.next_interval(
+            midnight.shift(minutes=-1)))
+        self.assertEqual(timedelta(seconds=1), poller.next_interval(
+            midnight.shift(minutes=1, seconds=30)))
+        self.assertEqual(timedelta(seconds=60), poller.next_interval(
+            midnight.shift(hours=12)))
@@ -0,0 +1,140 @@
+import threading
+from datetime import timedelta
+from unittest import TestCase
+from .mock_connection import run_async
+from pylend import (Connection,
+                    NullRateLimiter,
+                    TokenBucketRateLimiter,
+                    shared_rate_limiter)
+from pylend.rate_limiter import _shared_limiters, rate_limiter_for_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketRateLimiterTest(TestCase):
+    def invalid_parameters_raise_exception_test(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=1, capacity=0)
+
+    def first_request_does_not_wait_test(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(1.0, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual(0, limiter.acquire())
+        self.assertEqual([], clock.sleeps)
+
+    def waits_only_for_the_time_left_test(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(1.0, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        clock.now += 0.9
+        self.assertAlmostEqual(0.1, limiter.acquire())
+        clock.now += 0.1
+        self.assertAlmostEqual(0.9, limiter.acquire())
+
+    def idle_time_beyond_a_full_bucket_is_not_banked_test(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(1.0, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+        clock.now += 60
+        self.assertEqual(0, limiter.acquire())
+        self.assertAlmostEqual(1.0, limiter.acquire())
+
+    def burst_is_served_immediately_then_sustained_rate_test(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(2.0, capacity=3, clock=clock,
+                                         sleep=clock.sleep)
+
+        waits = [limiter.acquire() for _ in range(5)]
+
+        self.assertEqual([0, 0, 0], waits[:3])
+        self.assertAlmostEqual(0.5, waits[3])
+        self.assertAlmostEqual(0.5, waits[4])
+
+    def concurrent_threads_are_queued_test(self):
+        clock = FakeClock()
+        lock = threading.Lock()
+        limiter = TokenBucketRateLimiter(1.0, clock=clock,
+                                         sleep=lambda seconds: None)
+        waits = []
+
+        def worker():
+            wait = limiter.acquire()
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([0, 1, 2, 3], sorted(round(w) for w in waits))
+
+    def acquire_async_reserves_in_order_test(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(100.0, clock=clock)
+
+        async def run():
+            return [await limiter.acquire_async() for _ in range(3)]
+
+        waits = run_async(run())
+        self.assertEqual(0, waits[0])
+        self.assertAlmostEqual(0.01, waits[1])
+        self.assertAlmostEqual(0.02, waits[2])
+
+
+class RateLimiterFactoryTest(TestCase):
+    def zero_delay_disables_rate_limiting_test(self):
+        limiter = rate_limiter_for_delay(timedelta(seconds=0))
+
+        self.assertIsInstance(limiter, NullRateLimiter)
+
+    def delay_converts_to_rate_test(self):
+        limiter = rate_limiter_for_delay(timedelta(seconds=0.5))
+
+        self.assertEqual(2.0, limiter.rate)
+        self.assertEqual(1.0, limiter.capacity)
+
+    def shared_rate_limiter_is_shared_per_api_key_test(self):
+        self.assertIs(shared_rate_limiter('key-a'),
+                      shared_rate_limiter('key-a'))
+        self.assertIsNot(shared_rate_limiter('key-a'),
+                         shared_rate_limiter('key-b'))
+
+    def shared_rate_limiter_with_other_parameters_raises_test(self):
+        limiter = shared_rate_limiter('key-d', rate=2.0, capacity=3)
+
+        self.assertIs(limiter,
+                      shared_rate_limiter('key-d', rate=2.0, capacity=3))
+        with self.assertRaises(ValueError):
+            shared_rate_limiter('key-d', rate=1.0, capacity=3)
+        with self.assertRaises(ValueError):
+            shared_rate_limiter('key-d', rate=2.0, capacity=1)
+
+    def shared_rate_limiters_do_not_keep_api_keys_test(self):
+        shared_rate_limiter('key-e')
+
+        self.assertNotIn('key-e', _shared_limiters)
+
+    def connections_share_the_given_rate_limiter_test(self):
+        limiter = shared_rate_limiter('key-c')
+        first = Connection('key-c', rate_limiter=limiter)
+        second = Connection('key-c', rate_limiter=limiter)
+
+        self.assertIs(first.rate_limiter, second.rate_limiter)
@@ -0,0 +1,175 @@
+import arrow
+import json
+import pickle
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+from .loans_test import VALID_RESPONSE_TEXT
+from pylend import LazyRecord, LoanRecord, NoteRecord, TransferRecord
+from pylend.datetimes import parse_datetime
+
+
+class LazyRecordTest(TestCase):
+    def create_record(self):
+        return LazyRecord({'id': 1,
+                           'listD': '2014-08-25T10:50:20.000-07:00',
+                           'expD': None},
+                          ['listD', 'expD', 'acceptD'])
+
+    def datetime_fields_are_parsed_on_access_test(self):
+        record = self.create_record()
+
+        self.assertEqual('2014-08-25T10:50:20.000-07:00',
+                         record._data['listD'])
+        self.assertEqual(arrow.get('2014-08-25T10:50:20.000-07:00'),
+                         record['listD'])
+        self.assertIsNone(record['expD'])
+
+    def parsed_values_are_cached_test(self):
+        record = self.create_record()
+
+        self.assertIs(record['listD'], record['listD'])
+
+    def other_fields_are_returned_unchanged_test(self):
+        record = self.create_record()
+
+        self.assertEqual(1, record['id'])
+        self.assertEqual(1, record.get('id'))
+        self.assertEqual('missing', record.get('acceptD', 'missing'))
+
+    def assigned_values_are_not_parsed_test(self):
+        record = self.create_record()
+
+        record['listD'] = 'not a date'
+        record.update(expD='also not a date')
+
+        self.assertEqual('not a date', record['listD'])
+        self.assertEqual('also not a date', record['expD'])
+
+    def items_and_equality_see_parsed_values_test(self):
+        record = self.create_record()
+        expected = {'id': 1,
+                    'listD': arrow.get('2014-08-25T10:50:20.000-07:00'),
+                    'expD': None}
+
+        self.assertEqual(expected, dict(record.items()))
+        self.assertEqual(expected, record)
+        self.assertEqual(expected, record.resolve())
+
+    def copies_see_parsed_values_test(self):
+        record = self.create_record()
+        listed = arrow.get('2014-08-25T10:50:20.000-07:00')
+
+        self.assertEqual(listed, dict(record)['listD'])
+        self.assertEqual(listed, {**record}['listD'])
+        self.assertEqual(listed, record.copy()['listD'])
+
+    def items_and_values_are_views_test(self):
+        record = self.create_record()
+        items = record.items()
+        values = record.values()
+
+        record['grade'] = 'B'
+
+        self.assertIn(('grade', 'B'), items)
+        self.assertIn('B', values)
+        self.assertEqual(4, len(record.keys()))
+
+    def pickles_as_a_resolved_dict_test(self):
+        record = self.create_record()
+
+        restored = pickle.loads(pickle.dumps(record))
+
+        self.assertEqual(dict, type(restored))
+        self.assertEqual(record, restored)
+
+    def concurrent_first_reads_see_parsed_values_test(self):
+        record = self.create_record()
+        results = []
+        def slow_parse(value):
+            time.sleep(0.05)
+            return parse_datetime(value)
+
+        def read():
+            results.append(record['listD'])
+        with patch('pylend.records.parse_datetime', slow_parse):
+            threads = [threading.Thread(target=read) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(4, len(results))
+        for value in results:
+            self.assertIsInstance(value, arrow.Arrow)
+
+
+class TypedRecordTest(TestCase):
+    def create_loan(self):
+        return json.loads(VALID_RESPONSE_TEXT)['loans'][0]
+
+    def records_have_no_instance_dict_test(self):
+        record = LoanRecord.from_dict(self.create_loan())
+
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(111111, record.id)
+        self.assertEqual('B3', record['subGrade'])
+
+    def datetime_mode_converts_date_fields_test(self):
+        record = LoanRecord.from_dict(self.create_loan(), 'arrow')
+        epoch_record = LoanRecord.from_dict(self.create_loan(), 'epoch')
+
+        self.assertEqual(arrow.get('2014-08-25T10:50:20.000-07:00'),
+                         record.listD)
+        self.assertEqual(1408989020, epoch_record.listD)
+
+    def unknown_fields_are_kept_test(self):
+        record = NoteRecord.from_dict({'noteId': 1, 'newField': 'x'})
+
+        self.assertEqual('x', record['newField'])
+        self.assertIsNone(record.loanId)
+        with self.assertRaises(KeyError):
+            record['missing']
+        self.assertEqual('default', record.get('missing', 'default'))
+
+    def to_json_round_trips_through_the_wire_form_test(self):
+        loan = self.create_loan()
+        loan['desc'] = 'Quote " and \\ backslash'
+        record = LoanRecord.from_dict(loan)
+
+        self.assertEqual(loan, json.loads(record.to_json()))
+        self.assertEqual(loan, record.to_dict())
+
+    def absent_fields_are_not_written_test(self):
+        record = TransferRecord.from_dict({'transferId': 1, 'endDate': None},
+                                          'arrow')
+
+        self.assertIsNone(record.amount)
+        self.assertIsNone(record.endDate)
+        self.assertEqual({'transferId': 1, 'endDate': None},
+                         record.to_dict())
+        self.assertEqual({'transferId': 1, 'endDate': None},
+                         json.loads(record.to_json()))
+        with self.assertRaises(KeyError):
+            record['amount']
+        self.assertEqual('default', record.get('amount', 'default'))
+
+    def to_json_writes_dates_as_iso8601_test(self):
+        record = TransferRecord.from_dict(
+            {'transferId': 1,
+             'transferDate': '2015-12-23T00:00:00.000-08:00',
+             'extraField': True},
+            'arrow')
+
+        wire = json.loads(record.to_json())
+
+        self.assertEqual(arrow.get('2015-12-23T00:00:00.000-08:00'),
+                         arrow.get(wire['transferDate']))
+        self.assertTrue(wire['extraField'])
+
+    def records_compare_by_value_test(self):
+        self.assertEqual(NoteRecord.from_dict({'noteId': 1}),
+                         NoteRecord.from_dict({'noteId': 1}))
+        self.assertNotEqual(NoteRecord.from_dict({'noteId': 1}),
+                            NoteRecord.from_dict({'noteId': 2}))
@@ -0,0 +1,254 @@
+import io
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import TestCase
+from unittest.mock import patch
+import requests
+from requests import Response
+from pylend import (Connection,
+                    ExecutionFailureException,
+                    HedgePolicy,
+                    NullRateLimiter,
+                    RetryPolicy,
+                    UnexpectedStatusCodeException)
+from pylend.retry import parse_retry_after
+
+
+def response(status_code, content=b'{}', headers=None):
+    result = Response()
+    result.status_code = status_code
+    result.url = 'foo'
+    result._content = content
+    result.raw = io.BytesIO(content)
+    result.headers.update(headers or {})
+    return result
+
+
+class CountingRateLimiter(NullRateLimiter):
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return 0.0
+
+
+def policy(sleeps, **kwargs):
+    return RetryPolicy(sleep=sleeps.append, rng=lambda: 1.0, **kwargs)
+
+
+class RetryPolicyTest(TestCase):
+    def negative_max_retries_raises_exception_test(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+
+    def delays_back_off_exponentially_up_to_the_cap_test(self):
+        retry = RetryPolicy(backoff=timedelta(seconds=1),
+                            max_backoff=timedelta(seconds=5),
+                            rng=lambda: 0.5)
+
+        self.assertEqual([0.5, 1.0, 2.0, 2.5],
+                         [retry.delay(attempt) for attempt in range(4)])
+
+    def retry_after_overrides_backoff_within_the_cap_test(self):
+        retry = RetryPolicy(max_backoff=timedelta(seconds=30))
+
+        self.assertEqual(7.0, retry.delay(0, retry_after=7.0))
+        self.assertIsNone(retry.delay(0, retry_after=60.0))
+
+    def retry_after_accepts_seconds_and_dates_test(self):
+        now = datetime(2016, 1, 4, 10, 0, 0, tzinfo=timezone.utc)
+        later = format_datetime(now + timedelta(seconds=20), usegmt=True)
+
+        self.assertEqual(5.0, parse_retry_after('5'))
+        self.assertEqual(20.0, parse_retry_after(later, now))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    def safe_policy_only_retries_unsent_requests_test(self):
+        safe = RetryPolicy().safe()
+
+        self.assertTrue(safe.retries_status(429))
+        self.assertFalse(safe.retries_status(500))
+        self.assertTrue(safe.retries_exception(
+            requests.exceptions.ConnectTimeout()))
+        self.assertFalse(safe.retries_exception(
+            requests.exceptions.ReadTimeout()))
+
+
+class ConnectionRetryTest(TestCase):
+    @patch('requests.Session.get')
+    def get_is_retried_through_the_rate_limiter_test(self, get_patch):
+        get_patch.side_effect = [response(503), response(200, b'{"a": 1}')]
+        sleeps = []
+        limiter = CountingRateLimiter()
+        c = Connection(api_key="testkey",
+                       rate_limiter=limiter,
+                       retry_policies={'GET': policy(sleeps)})
+
+        self.assertEqual({'a': 1}, c.get("foo"))
+        self.assertEqual(2, limiter.acquired)
+        self.assertEqual([0.5], sleeps)
+
+    @patch('requests.Session.get')
+    def exhausted_retries_raise_the_last_error_test(self, get_patch):
+        get_patch.side_effect = lambda *args, **kwargs: response(500)
+        sleeps = []
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       retry_policies={'GET': policy(sleeps, max_retries=2)})
+
+        with self.assertRaises(ExecutionFailureException):
+            c.get("foo")
+        self.assertEqual(3, get_patch.call_count)
+        self.assertEqual([0.5, 1.0], sleeps)
+
+    @patch('requests.Session.get')
+    def retry_after_header_is_honored_test(self, get_patch):
+        get_patch.side_effect = [response(429, headers={'Retry-After': '7'}),
+                                 response(200)]
+        sleeps = []
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       retry_policies={'GET': policy(sleeps)})
+
+        c.get("foo")
+
+        self.assertEqual([7.0], sleeps)
+
+    @patch('requests.Session.get')
+    def network_errors_are_retried_test(self, get_patch):
+        get_patch.side_effect = [requests.exceptions.ConnectionError(),
+                                 response(200)]
+        sleeps = []
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       retry_policies={'GET': policy(sleeps)})
+
+        self.assertEqual({}, c.get("foo"))
+        self.assertEqual(1, len(sleeps))
+
+    @patch('requests.Session.post')
+    def orders_are_not_resent_after_server_errors_test(self, post_patch):
+        post_patch.side_effect = [response(500), response(200)]
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       retry_policies={'POST': policy([])})
+
+        with self.assertRaises(ExecutionFailureException):
+            c.post("accounts/1/orders", '{}')
+        self.assertEqual(1, post_patch.call_count)
+
+    @patch('requests.Session.post')
+    def orders_are_resent_after_throttling_test(self, post_patch):
+        post_patch.side_effect = [response(429), response(200)]
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       retry_policies={'POST': policy([])})
+
+        c.post("accounts/1/orders", '{}')
+
+        self.assertEqual(2, post_patch.call_count)
+
+    @patch('requests.Session.get')
+    def requests_are_not_retried_by_default_test(self, get_patch):
+        get_patch.side_effect = [response(429), response(200)]
+        c = Connection(api_key="testkey", rate_limiter=NullRateLimiter())
+
+        with self.assertRaises(UnexpectedStatusCodeException):
+            c.get("foo")
+
+
+class ConnectionHedgeTest(TestCase):
+    @patch('requests.Session.get')
+    def slow_listing_requests_are_hedged_test(self, get_patch):
+        release = threading.Event()
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                release.wait(5)
+                return response(200, b'{"attempt": 1}')
+            return response(200, b'{"attempt": 2}')
+
+        get_patch.side_effect = get
+        limiter = CountingRateLimiter()
+        c = Connection(api_key="testkey",
+                       rate_limiter=limiter,
+                       hedge=HedgePolicy(delay=timedelta(milliseconds=10)))
+        try:
+            self.assertEqual({'attempt': 2}, c.get('loans/listing'))
+            self.assertEqual(2, limiter.acquired)
+        finally:
+            release.set()
+            c.close()
+
+    @patch('requests.Session.get')
+    def error_responses_do_not_win_the_hedge_test(self, get_patch):
+        release = threading.Event()
+        calls = []
+        first = response(200, b'{"attempt": 1}')
+        failed = response(503)
+
+        def get(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                release.wait(5)
+                return first
+            return failed
+
+        get_patch.side_effect = get
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       hedge=HedgePolicy(delay=timedelta(milliseconds=10)))
+        try:
+            threading.Timer(0.05, release.set).start()
+            self.assertEqual({'attempt': 1}, c.get('loans/listing'))
+            self.assertTrue(failed.raw.closed)
+            self.assertFalse(first.raw.closed)
+        finally:
+            release.set()
+            c.close()
+
+    @patch('requests.Session.get')
+    def losing_responses_are_closed_test(self, get_patch):
+        release = threading.Event()
+        calls = []
+        slow = response(200, b'{"attempt": 1}')
+
+        def get(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                release.wait(5)
+                return slow
+            return response(200, b'{"attempt": 2}')
+
+        get_patch.side_effect = get
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       hedge=HedgePolicy(delay=timedelta(milliseconds=10)))
+        try:
+            self.assertEqual({'attempt': 2}, c.get('loans/listing'))
+            release.set()
+            for _ in range(500):
+                if slow.raw.closed:
+                    break
+                time.sleep(0.01)
+            self.assertTrue(slow.raw.closed)
+        finally:
+            release.set()
+            c.close()
+
+    @patch('requests.Session.get')
+    def other_resources_are_not_hedged_test(self, get_patch):
+        get_patch.return_value = response(200)
+        c = Connection(api_key="testkey",
+                       rate_limiter=NullRateLimiter(),
+                       hedge=HedgePolicy(delay=timedelta(0)))
+
+        c.get('accounts/1/summary')
+
+        self.assertEqual(1, get_patch.call_count)
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase, skipIf
+from pylend import LoanScorer, LoanTable
+from pylend.loans import create_order
+from pylend.scoring import shared_memory
+from pylend.table import np
+
+
+def loans(count):
+    return [{'id': loan_id,
+             'loanAmount': 1000.0,
+             'fundedAmount': float(loan_id % 4 * 25),
+             'intRate': float(loan_id % 17),
+             'grade': 'ABCDEFG'[loan_id % 7],
+             'desc': 'x' * 1000 if loan_id == 1 else '',
+             'mixed': loan_id if loan_id % 2 else 'x'}
+            for loan_id in range(1, count + 1)]
+
+
+# Scoring functions run in worker processes, so they are module-level.
+def score_by_rate(table):
+    return table['intRate']
+
+
+def score_grade_a(table):
+    return (table['grade'] == 'A').astype(float)
+
+
+def score_with_pid(table):
+    return np.full(len(table), float(os.getpid()))
+
+
+def score_too_few(table):
+    return [1.0]
+
+
+def columns_seen(table):
+    return np.full(len(table), float(len(table.fields)))
+
+
+@skipIf(np is None or shared_memory is None,
+        'numpy or multiprocessing.shared_memory is not available')
+class LoanScorerTest(TestCase):
+    def setUp(self):
+        self.scorer = LoanScorer(score_by_rate,
+                                 processes=2,
+                                 min_shard_size=10)
+
+    def tearDown(self):
+        self.scorer.close()
+
+    def bad_parameters_raise_ValueError_test(self):
+        with self.assertRaises(ValueError):
+            LoanScorer(None)
+        with self.assertRaises(ValueError):
+            LoanScorer(score_by_rate, processes=0)
+        with self.assertRaises(ValueError):
+            LoanScorer(score_by_rate, min_shard_size=0)
+
+    def loans_are_sorted_by_descending_score_test(self):
+        scored = self.scorer.score(loans(100))
+
+        self.assertEqual(100, len(scored))
+        self.assertEqual(sorted(scored.scores.tolist(), reverse=True),
+                         scored.scores.tolist())
+        # Equal scores keep their listing order.
+        self.assertEqual([16, 33, 50, 67, 84],
+                         scored.loans['id'][:5].tolist())
+
+    def shards_are_scored_in_worker_processes_test(self):
+        with LoanScorer(score_with_pid, processes=2,
+                        min_shard_size=10) as scorer:
+            scored = scorer.score(loans(100))
+
+        self.assertNotIn(float(os.getpid()), scored.scores.tolist())
+
+    def small_listings_are_scored_in_process_test(self):
+        with LoanScorer(score_with_pid, processes=2,
+                        min_shard_size=1000) as scorer:
+            scored = scorer.score(loans(100))
+
+        self.assertEqual({float(os.getpid())}, set(scored.scores.tolist()))
+
+    def string_columns_are_shared_test(self):
+        with LoanScorer(score_grade_a, processes=2,
+                        min_shard_size=10) as scorer:
+            scored = scorer.score(LoanTable.from_loans(loans(70)))
+
+        self.assertEqual(10, int(scored.scores.sum()))
+        self.assertEqual(['A'] * 10, scored.loans['grade'][:10].tolist())
+
+    def unshareable_columns_are_left_out_everywhere_test(self):
+        for min_shard_size in (10, 1000):
+            with LoanScorer(columns_seen, processes=2,
+                            min_shard_size=min_shard_size) as scorer:
+                scored = scorer.score(loans(100))
+            self.assertEqual([5.0], list(set(scored.scores.tolist())))
+
+    def free_text_is_left_out_unless_asked_for_test(self):
+        for fields, expected in ((None, 5.0),
+                                 (['intRate', 'desc', 'missing'], 2.0)):
+            for min_shard_size in (10, 1000):
+                with LoanScorer(columns_seen, processes=2,
+                                min_shard_size=min_shard_size,
+                                fields=fields) as scorer:
+                    scored = scorer.score(loans(100))
+                self.assertEqual([expected],
+                                 list(set(scored.scores.tolist())))
+
+    def wrong_number_of_scores_raises_ValueError_test(self):
+        with LoanScorer(score_too_few, processes=2,
+                        min_shard_size=10) as scorer:
+            with self.assertRaises(ValueError):
+                scorer.score(loans(100))
+
+    def empty_listing_test(self):
+        self.assertEqual(0, len(self.scorer.score([])))
+
+    def scored_loans_feed_order_creation_test(self):
+        scored = self.scorer.score(loans(100))
+
+        orders = scored.above(15.0).create_orders(25, budget=100)
+        self.assertEqual([16, 33, 50, 67],
+                         [order.loan_id for order in orders])
+
+        best, score = next(iter(scored.top(1)))
+        self.assertEqual(16.0, score)
+        self.assertEqual(16, create_order(best, 25).loan_id)
+
+
+class MissingSharedMemoryTest(TestCase):
+    def module_imports_without_shared_memory_test(self):
+        # As on Python 3.7, where neither module exists.
+        script = ('import sys; '
+                  'sys.modules["multiprocessing.resource_tracker"] = None; '
+                  'sys.modules["multiprocessing.shared_memory"] = None; '
+                  'import pylend.scoring as scoring; '
+                  'print(scoring.shared_memory is None)')
+        root = os.path.join(os.path.dirname(__file__), '..', '..')
+
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         cwd=root)
+
+        self.assertEqual(b'True', output.strip())
@@ -0,0 +1,146 @@
+import io
+import json
+import threading
+from .mock_connection import MockConnection
+from unittest import TestCase
+from unittest.mock import patch
+from requests import Response
+from requests.exceptions import ConnectTimeout
+from pylend import (Account,
+                    Connection,
+                    ExecutionFailureException,
+                    NullRateLimiter)
+from pylend.loans import LoanOrder
+
+
+def confirm(body):
+    return {'orderInstructId': body['orders'][0]['loanId'],
+            'orderConfirmations': [
+                {'loanId': order['loanId'],
+                 'requestedAmount': order['requestedAmount'],
+                 'investedAmount': order['requestedAmount'],
+                 'executionStatus': ['ORDER_FULFILLED']}
+                for order in body['orders']]}
+
+
+class SubmitOrdersInChunksTest(TestCase):
+    def create_orders(self, count):
+        return [LoanOrder(loan_id, 25) for loan_id in range(1, count + 1)]
+
+    def bad_parameters_raise_exception_test(self):
+        a = Account(MockConnection(), 1)
+
+        with self.assertRaises(ValueError):
+            a.submit_orders_in_chunks([])
+        with self.assertRaises(ValueError):
+            a.submit_orders_in_chunks(self.create_orders(1), chunk_size=0)
+
+    def orders_are_split_into_chunks_test(self):
+        bodies = []
+        lock = threading.Lock()
+
+        def callback(resource, body, api_version, query_params):
+            with lock:
+                bodies.append(body)
+            return confirm(body)
+        a = Account(MockConnection(post_callback=callback), 1)
+
+        report = a.submit_orders_in_chunks(self.create_orders(10),
+                                           chunk_size=3)
+
+        self.assertTrue(report.succeeded)
+        self.assertEqual([1, 3, 3, 3],
+                         sorted(len(body['orders']) for body in bodies))
+        self.assertEqual(list(range(1, 11)),
+                         [c['loanId'] for c in report.confirmations])
+        self.assertEqual([1, 4, 7, 10], report.order_instruct_ids)
+
+    def only_failed_chunks_are_retried_test(self):
+        calls = []
+        lock = threading.Lock()
+
+        def callback(resource, body, api_version, query_params):
+            loan_ids = [order['loanId'] for order in body['orders']]
+            with lock:
+                calls.append(loan_ids)
+                first_attempt = calls.count(loan_ids) == 1
+            if loan_ids == [3, 4] and first_attempt:
+                raise ConnectTimeout('connect timed out')
+            return confirm(body)
+        a = Account(MockConnection(post_callback=callback), 1)
+
+        report = a.submit_orders_in_chunks(self.create_orders(4),
+                                           chunk_size=2)
+
+        self.assertTrue(report.succeeded)
+        self.assertEqual(2, report.attempts)
+        self.assertEqual(3, len(calls))
+        self.assertEqual([1, 2, 3, 4],
+                         sorted(c['loanId'] for c in report.confirmations))
+
+    def chunks_that_may_have_been_placed_are_not_resent_test(self):
+        calls = []
+        lock = threading.Lock()
+
+        def callback(resource, body, api_version, query_params):
+            loan_ids = [order['loanId'] for order in body['orders']]
+            with lock:
+                calls.append(loan_ids)
+            if loan_ids == [3, 4]:
+                raise ConnectionError('reset by peer')
+            return confirm(body)
+        a = Account(MockConnection(post_callback=callback), 1)
+
+        report = a.submit_orders_in_chunks(self.create_orders(4),
+                                           chunk_size=2,
+                                           retries=2)
+
+        self.assertFalse(report.succeeded)
+        self.assertEqual(1, report.attempts)
+        self.assertEqual([[1, 2], [3, 4]], sorted(calls))
+        self.assertEqual([3, 4], [order.loan_id
+                                  for order in report.failed_orders])
+        self.assertIsInstance(report.failed_chunks[0].exception,
+                              ConnectionError)
+
+    @patch('requests.Session.post')
+    def chunks_that_hit_server_errors_are_not_resent_test(self, post_patch):
+        def post(*args, **kwargs):
+            result = Response()
+            result.status_code = 500
+            result.url = 'foo'
+            result._content = b'{}'
+            result.raw = io.BytesIO(b'{}')
+            return result
+        post_patch.side_effect = post
+        c = Connection(api_key="testkey", rate_limiter=NullRateLimiter())
+        a = Account(c, 1)
+
+        report = a.submit_orders_in_chunks(self.create_orders(4),
+                                           chunk_size=4,
+                                           retries=1)
+
+        self.assertFalse(report.succeeded)
+        self.assertEqual(1, post_patch.call_count)
+        self.assertEqual(1, report.attempts)
+        self.assertEqual([1, 2, 3, 4], [order.loan_id
+                                        for order in report.failed_orders])
+        self.assertIsInstance(report.failed_chunks[0].exception,
+                              ExecutionFailureException)
+
+    def rejected_chunks_are_split_to_isolate_bad_orders_test(self):
+        def callback(resource, body, api_version, query_params):
+            if 2 in [order['loanId'] for order in body['orders']]:
+                return json.loads('{"errors": [{"field": "loanId"}]}')
+            return confirm(body)
+        a = Account(MockConnection(post_callback=callback), 1)
+
+        report = a.submit_orders_in_chunks(self.create_orders(4),
+                                           chunk_size=4,
+                                           retries=2)
+
+        self.assertFalse(report.succeeded)
+        self.assertEqual([2], [order.loan_id
+                               for order in report.failed_orders])
+        self.assertEqual([1, 3, 4],
+                         sorted(c['loanId'] for c in report.confirmations))
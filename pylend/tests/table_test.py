@@ -0,0 +1,106 @@
+import arrow
+import json
+from unittest import TestCase, skipIf
+from .loans_test import VALID_RESPONSE_TEXT
+from .mock_connection import MockConnection
+from pylend import Loans, LoanTable
+from pylend.table import np
+
+
+def listing():
+    json_payload = json.loads(VALID_RESPONSE_TEXT)
+    template = json_payload['loans'][0]
+    loans = []
+    for loan_id, grade, int_rate in ((1, 'A', 6.5),
+                                     (2, 'B', 10.99),
+                                     (3, 'C', 14.0)):
+        loan = dict(template)
+        loan['id'] = loan_id
+        loan['grade'] = grade
+        loan['intRate'] = int_rate
+        loans.append(loan)
+    json_payload['loans'] = loans
+    return json_payload
+
+
+@skipIf(np is None, 'numpy is not installed')
+class LoanTableTest(TestCase):
+    def numeric_fields_are_typed_arrays_test(self):
+        table = LoanTable.from_payload(listing())
+
+        self.assertEqual(3, len(table))
+        self.assertEqual(np.int64, table['id'].dtype)
+        self.assertEqual(np.float64, table['intRate'].dtype)
+        self.assertEqual(np.int64, table['ficoRangeLow'].dtype)
+        self.assertEqual(object, table['grade'].dtype)
+        self.assertEqual([6.5, 10.99, 14.0], table['intRate'].tolist())
+
+    def integer_fields_round_trip_as_integers_test(self):
+        loans = [{'id': 1, 'openAcc': 3, 'mortAcc': 1, 'bcUtil': 50},
+                 {'id': 2, 'openAcc': 4, 'mortAcc': None, 'bcUtil': 60.5}]
+        table = LoanTable.from_loans(loans)
+
+        self.assertEqual(np.int64, table['openAcc'].dtype)
+        self.assertEqual(np.float64, table['mortAcc'].dtype)
+        self.assertEqual(np.float64, table['bcUtil'].dtype)
+        open_accounts = [loan['openAcc'] for loan in table.to_dicts()]
+        self.assertEqual([3, 4], open_accounts)
+        self.assertEqual([int, int], [type(value) for value in open_accounts])
+
+    def null_numbers_are_nan_test(self):
+        table = LoanTable.from_payload(listing())
+
+        self.assertTrue(np.isnan(table['openAcc6m']).all())
+
+    def dates_are_int64_epochs_test(self):
+        table = LoanTable.from_payload(listing())
+
+        self.assertEqual(np.int64, table['listD'].dtype)
+        self.assertEqual(1408989020, table['listD'][0])
+        self.assertEqual(1409780513, table.as_of_date)
+
+    def mask_selection_shares_columns_test(self):
+        table = LoanTable.from_payload(listing())
+
+        selected = table[table['intRate'] > 10]
+
+        self.assertEqual(2, len(selected))
+        self.assertEqual([2, 3], selected['id'].tolist())
+        self.assertEqual([3], selected[selected['grade'] == 'C']['id']
+                         .tolist())
+        self.assertEqual(3, len(table))
+
+    def to_dicts_restores_dict_form_test(self):
+        table = LoanTable.from_payload(listing())
+
+        loans = table[table['id'] == 2].to_dicts()
+
+        self.assertEqual(1, len(loans))
+        self.assertEqual('B', loans[0]['grade'])
+        self.assertEqual(10.99, loans[0]['intRate'])
+        self.assertIsNone(loans[0]['openAcc6m'])
+        self.assertEqual(arrow.get('2014-08-25T10:50:20.000-07:00'),
+                         loans[0]['listD'])
+
+    def to_dicts_in_epoch_mode_keeps_integers_test(self):
+        table = LoanTable.from_payload(listing())
+
+        loans = table.to_dicts(datetime_mode='epoch')
+
+        self.assertEqual(1408989020, loans[0]['listD'])
+
+    def empty_listing_creates_empty_table_test(self):
+        table = LoanTable.from_payload({'asOfDate': None})
+
+        self.assertEqual(0, len(table))
+        self.assertEqual([], table.to_dicts())
+
+    def loans_returns_listing_as_table_test(self):
+        def callback(resource, api_version, query_params):
+            return listing()
+        l = Loans(MockConnection(callback))
+
+        table = l.listed_loan_table()
+
+        self.assertIsInstance(table, LoanTable)
+        self.assertEqual([1, 2, 3], table['id'].tolist())
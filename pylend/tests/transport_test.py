@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from pylend import (Connection,
+                    Loans,
+                    ResourceNotFoundException,
+                    UnexpectedStatusCodeException)
+from pylend.transport import (LATENCY_RECORDED,
+                              RecordingTransport,
+                              ReplayTransport,
+                              SessionTransport,
+                              load_recordings,
+                              lognormal_latency)
+
+BASE_URI = 'https://api.lendingclub.com/api/investor/v1/'
+
+
+def _exchange(resource, payload, status=200, method='GET', elapsed=0.25,
+              params=None):
+    return {'method': method,
+            'uri': BASE_URI + resource,
+            'params': params or {},
+            'status': status,
+            'headers': {'Content-Type': 'application/json'},
+            'elapsed': elapsed,
+            'body': json.dumps(payload)}
+
+
+class TransportTest(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def connection_gets_replayed_payload_test(self):
+        transport = ReplayTransport(
+            [_exchange('loans/listing', {'loans': [{'id': 1}]})])
+        c = Connection(api_key='testkey', transport=transport)
+
+        self.assertEqual({'loans': [{'id': 1}]}, c.get('loans/listing'))
+        self.assertIs(transport, c.transport)
+
+    def replay_cycles_through_recorded_responses_test(self):
+        transport = ReplayTransport([_exchange('foo', {'n': 1}),
+                                     _exchange('foo', {'n': 2})])
+        c = Connection(api_key='testkey', transport=transport)
+
+        self.assertEqual([1, 2, 1],
+                         [c.get('foo')['n'] for _ in range(3)])
+
+    def replay_matches_query_parameters_test(self):
+        transport = ReplayTransport(
+            [_exchange('loans/listing', {'all': True},
+                       params={'showAll': 'True'}),
+             _exchange('loans/listing', {'all': False},
+                       params={'showAll': 'False'})])
+        c = Connection(api_key='testkey', transport=transport)
+
+        for _ in range(2):
+            self.assertEqual({'all': False},
+                             c.get('loans/listing',
+                                   query_params={'showAll': False}))
+            self.assertEqual({'all': True},
+                             c.get('loans/listing',
+                                   query_params={'showAll': True}))
+        with self.assertRaises(ResourceNotFoundException):
+            c.get('loans/listing')
+
+    def unrecorded_request_is_not_found_test(self):
+        c = Connection(api_key='testkey', transport=ReplayTransport([]))
+
+        with self.assertRaises(ResourceNotFoundException):
+            c.get('foo')
+
+    def recording_round_trips_through_replay_test(self):
+        source = ReplayTransport(
+            [_exchange('accounts/1/orders', {'orderInstructId': 5},
+                       method='POST'),
+             _exchange('foo', {'bar': 'baz'}, params={'showAll': 'True'})])
+        recorder = RecordingTransport(source, self.path)
+        c = Connection(api_key='secretkey', transport=recorder)
+        c.post('accounts/1/orders', '{"aid":1}')
+        c.get('foo', query_params={'showAll': True})
+        c.close()
+
+        with open(self.path) as f:
+            self.assertNotIn('secretkey', f.read())
+        recordings = load_recordings(self.path)
+        self.assertEqual(['POST', 'GET'],
+                         [record['method'] for record in recordings])
+        self.assertEqual('{"aid":1}', recordings[0]['request_body'])
+        self.assertEqual({'showAll': 'True'}, recordings[1]['params'])
+
+        c = Connection(api_key='testkey',
+                       transport=ReplayTransport(self.path))
+        self.assertEqual({'bar': 'baz'},
+                         c.get('foo', query_params={'showAll': True}))
+        self.assertEqual({'orderInstructId': 5},
+                         c.post('accounts/1/orders', '{"aid":1}'))
+
+    def injected_status_codes_are_returned_test(self):
+        transport = ReplayTransport([_exchange('foo', {})],
+                                    status_codes={503: 1.0})
+        c = Connection(api_key='testkey', transport=transport)
+
+        with self.assertRaises(UnexpectedStatusCodeException):
+            c.get('foo')
+
+    def injected_status_codes_follow_their_probability_test(self):
+        transport = ReplayTransport([_exchange('foo', {})],
+                                    status_codes={429: 0.2, 500: 0.1},
+                                    seed=1)
+        statuses = [transport.request('GET', BASE_URI + 'foo', {}).status_code
+                    for _ in range(2000)]
+
+        self.assertAlmostEqual(0.2, statuses.count(429) / 2000.0, delta=0.03)
+        self.assertAlmostEqual(0.1, statuses.count(500) / 2000.0, delta=0.03)
+        self.assertAlmostEqual(0.7, statuses.count(200) / 2000.0, delta=0.03)
+
+    def status_code_probabilities_over_one_raise_ValueError_test(self):
+        with self.assertRaises(ValueError):
+            ReplayTransport([], status_codes={429: 0.6, 500: 0.5})
+
+    def recorded_latency_is_replayed_test(self):
+        sleeps = []
+        transport = ReplayTransport([_exchange('foo', {}, elapsed=0.4)],
+                                    latency=LATENCY_RECORDED,
+                                    sleep=sleeps.append)
+        response = transport.request('GET', BASE_URI + 'foo', {})
+
+        self.assertEqual([0.4], sleeps)
+        self.assertEqual(0.4, response.elapsed.total_seconds())
+
+    def sampled_latency_is_deterministic_for_a_seed_test(self):
+        def delays(seed):
+            sleeps = []
+            transport = ReplayTransport([_exchange('foo', {})],
+                                        latency=lognormal_latency(0.1),
+                                        seed=seed,
+                                        sleep=sleeps.append)
+            for _ in range(5):
+                transport.request('GET', BASE_URI + 'foo', {})
+            return sleeps
+
+        self.assertEqual(delays(3), delays(3))
+        self.assertNotEqual(delays(3), delays(4))
+        self.assertTrue(all(delay > 0 for delay in delays(3)))
+
+    def replayed_listing_streams_test(self):
+        transport = ReplayTransport(
+            [_exchange('loans/listing',
+                       {'asOfDate': None,
+                        'loans': [{'id': 1}, {'id': 2}]},
+                       params={'showAll': 'False'})])
+        loans = Loans(Connection(api_key='testkey', transport=transport),
+                      datetime_mode='epoch')
+
+        self.assertEqual([1, 2],
+                         [loan['id']
+                          for loan in loans.listed_loans(stream=True)])
+
+    def session_transport_rejects_bad_pool_size_test(self):
+        with self.assertRaises(ValueError):
+            SessionTransport(0)
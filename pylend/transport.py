@@ -0,0 +1,264 @@
+import json
+import math
+import random
+import threading
+import time
+from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+
+LATENCY_RECORDED = 'recorded'
+
+# Response headers worth keeping in a recording; request headers (and with
+# them the API key) are never written.
+RECORDED_HEADERS = ['Content-Type', 'Retry-After']
+
+
+class Transport:
+    def request(self,
+                method,
+                uri,
+                headers,
+                params=None,
+                data=None,
+                stream=False):
+        raise NotImplementedError()
+
+    def prewarm(self, uri, headers):
+        pass
+
+    def close(self):
+        pass
+
+
+class SessionTransport(Transport):
+    __session = None
+
+    def __init__(self, pool_size):
+        if pool_size is None or pool_size < 1:
+            raise ValueError('pool_size must be a positive integer')
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.__session.mount('https://', adapter)
+        self.__session.mount('http://', adapter)
+
+    def request(self,
+                method,
+                uri,
+                headers,
+                params=None,
+                data=None,
+                stream=False):
+        if method == 'POST':
+            return self.__session.post(uri,
+                                       data=data,
+                                       headers=headers,
+                                       params=params)
+        if stream:
+            return self.__session.get(uri,
+                                      headers=headers,
+                                      params=params,
+                                      stream=True)
+        return self.__session.get(uri, headers=headers, params=params)
+
+    def prewarm(self, uri, headers):
+        self.__session.head(uri, headers=headers, timeout=5)
+
+    def close(self):
+        self.__session.close()
+
+
+class ReplayResponse:
+    def __init__(self, url, status_code, content, headers=None, elapsed=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+        self.elapsed = timedelta(seconds=elapsed)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def _body_text(data):
+    if isinstance(data, bytes):
+        return data.decode('utf-8')
+    return data
+
+
+def _recorded_params(params):
+    # Query parameters as requests sends them: every value as a string.
+    return dict((key, str(value)) for key, value in (params or {}).items())
+
+
+def _exchange_key(method, uri, params):
+    return (method, uri, tuple(sorted(_recorded_params(params).items())))
+
+
+def load_recordings(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTransport(Transport):
+    __transport = None
+    __file = None
+    __lock = None
+
+    def __init__(self, transport, path):
+        if transport is None:
+            raise ValueError('transport must be a non-None Transport object')
+        self.__transport = transport
+        self.__file = open(path, 'a', encoding='utf-8')
+        self.__lock = threading.Lock()
+
+    def request(self,
+                method,
+                uri,
+                headers,
+                params=None,
+                data=None,
+                stream=False):
+        start = time.perf_counter()
+        response = self.__transport.request(method,
+                                            uri,
+                                            headers,
+                                            params,
+                                            data,
+                                            stream)
+        # Reading content here buffers streamed bodies; iter_content still
+        # works afterwards.
+        content = response.content
+        elapsed = time.perf_counter() - start
+        record = {
+            'method': method,
+            'uri': uri,
+            'params': _recorded_params(params),
+            'request_body': _body_text(data),
+            'status': response.status_code,
+            'headers': dict((name, response.headers[name])
+                            for name in RECORDED_HEADERS
+                            if name in response.headers),
+            'elapsed': elapsed,
+            'body': content.decode('utf-8')
+        }
+        with self.__lock:
+            self.__file.write(json.dumps(record) + '\n')
+            self.__file.flush()
+        return response
+
+    def prewarm(self, uri, headers):
+        self.__transport.prewarm(uri, headers)
+
+    def close(self):
+        self.__file.close()
+        self.__transport.close()
+
+
+def lognormal_latency(median, sigma=0.5):
+    median = median.total_seconds() if isinstance(median, timedelta) \
+        else float(median)
+
+    def latency(rng):
+        return rng.lognormvariate(math.log(median), sigma)
+
+    return latency
+
+
+class ReplayTransport(Transport):
+    __exchanges = None
+    __cursors = None
+    __latency = None
+    __status_codes = None
+    __random = None
+    __sleep = None
+    __lock = None
+
+    def __init__(self,
+                 recordings,
+                 latency=None,
+                 status_codes=None,
+                 seed=0,
+                 sleep=time.sleep):
+        # latency is None (respond at once), LATENCY_RECORDED, or a function
+        # of a random.Random returning seconds. status_codes maps injected
+        # status codes to their probability per request.
+        if isinstance(recordings, str):
+            recordings = load_recordings(recordings)
+        self.__exchanges = {}
+        for record in recordings:
+            key = _exchange_key(record['method'],
+                                record['uri'],
+                                record.get('params'))
+            self.__exchanges.setdefault(key, []).append(record)
+        self.__cursors = dict((key, 0) for key in self.__exchanges)
+        self.__latency = latency
+        self.__status_codes = sorted((status_codes or {}).items())
+        if sum(probability for _, probability in self.__status_codes) > 1:
+            raise ValueError('status_codes probabilities must not exceed 1')
+        self.__random = random.Random(seed)
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+
+    def request(self,
+                method,
+                uri,
+                headers,
+                params=None,
+                data=None,
+                stream=False):
+        with self.__lock:
+            record = self._next(method, uri, params)
+            injected = self._injected_status()
+            latency = self._latency(record)
+
+        if latency > 0:
+            self.__sleep(latency)
+        if record is None:
+            return ReplayResponse(uri, 404, b'', elapsed=latency)
+        if injected is not None:
+            return ReplayResponse(uri, injected, b'', elapsed=latency)
+        return ReplayResponse(uri,
+                              record['status'],
+                              record['body'].encode('utf-8'),
+                              record.get('headers'),
+                              latency)
+
+    def _next(self, method, uri, params):
+        # Exchanges for the same request (method, URI and query parameters)
+        # are replayed in recorded order and then repeated from the start.
+        key = _exchange_key(method, uri, params)
+        exchanges = self.__exchanges.get(key)
+        if not exchanges:
+            return None
+        cursor = self.__cursors[key]
+        self.__cursors[key] = (cursor + 1) % len(exchanges)
+        return exchanges[cursor]
+
+    def _injected_status(self):
+        if not self.__status_codes:
+            return None
+        draw = self.__random.random()
+        for status_code, probability in self.__status_codes:
+            if draw < probability:
+                return status_code
+            draw -= probability
+        return None
+
+    def _latency(self, record):
+        if self.__latency is None:
+            return 0.0
+        if self.__latency == LATENCY_RECORDED:
+            return record.get('elapsed', 0.0) if record is not None else 0.0
+        return self.__latency(self.__random)
@@ -16,9 +16,8 @@ setup(name='pylend',
         'Intended Audience :: Financial and Insurance Industry',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.3',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.7',
         'Topic :: Office/Business :: Financial :: Investment'
       ],
       url='https://github.com/Webs961/pylend',
@@ -26,10 +25,16 @@ setup(name='pylend',
       author_email='will.barr@outlook.com',
       license='MIT',
       packages=['pylend'],
+      python_requires='>=3.7',
       install_requires=[
         'requests',
         'arrow'
       ],
+      extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'numpy': ['numpy']
+      },
       zip_safe=False,
       test_suite='nose.collector',
       tests_require=['nose'],)